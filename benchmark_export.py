@@ -0,0 +1,69 @@
+"""
+Benchmark vector_export.py against the previous per-row export path.
+
+The previous exporters built every row with np.insert(vector.astype(str), 0, word)
+and wrote an object-dtype DataFrame with to_csv. This script times that path
+and each vector_export format on a synthetic vocabulary, and reports the
+output file sizes.
+
+Usage:
+  python benchmark_export.py [--words 100000] [--dimensions 25] [--output-dir /tmp]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from vector_export import export_vectors
+
+
+def legacy_export(words, vectors, output_file):
+    """The per-row string export previously used by model_to_csv and word_vec_to_csv."""
+    data_rows = []
+    for word, vector in zip(words, vectors):
+        data_rows.append(np.insert(vector.astype(str), 0, word))
+    column_names = ['word'] + [f'dim_{i}' for i in range(vectors.shape[1])]
+    df = pd.DataFrame(data_rows, columns=column_names)
+    df.to_csv(output_file, index=False, header=True)
+
+
+def timed(label, func, output_file):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    size_mb = os.path.getsize(output_file) / (1024 * 1024)
+    print(f"   {label:<22} {seconds:>8.2f}s {size_mb:>9.1f} MB")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector export paths.")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=25)
+    parser.add_argument("--output-dir", default=None, help="where to write files (default: a temp dir)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    words = [f"word{i}" for i in range(args.words)]
+    vectors = rng.standard_normal((args.words, args.dimensions)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = args.output_dir or tmp
+        print(f"Exporting {args.words} words x {args.dimensions} dimensions\n")
+        print(f"   {'path':<22} {'time':>9} {'size':>12}")
+        legacy = timed("legacy csv", lambda: legacy_export(words, vectors, os.path.join(out, "legacy.csv")),
+                       os.path.join(out, "legacy.csv"))
+        for fmt in ["csv", "npy", "parquet"]:
+            path = os.path.join(out, f"export.{fmt}")
+            try:
+                seconds = timed(f"vector_export {fmt}", lambda: export_vectors(words, vectors, path), path)
+            except ImportError as e:
+                print(f"   {'vector_export ' + fmt:<22} skipped ({e})")
+                continue
+            print(f"   {'':<22} {legacy / seconds:>8.1f}x faster than legacy csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Benchmark the load, search, export and training paths on synthetic data.
+
+Everything runs offline: a synthetic Word2Vec model (random vectors for
+word0, word1, ... with descending counts), its CSV export and a Zipf-distributed
+training corpus are generated in a temporary directory. Each stage then runs
+in a fresh Python process, so its peak RSS is its own:
+
+  startup       time to import or --help each entry point in a fresh interpreter
+  api_startup   import web-app/api.py and create_app() with the synthetic model as MODEL_NAME
+  search        POST /api/search through Flask's test client (cache disabled)
+  model_to_csv  word2vec-training/model_to_csv.py
+  csv_to_json   word2vec-training/csv_to_json.py
+  train         word2vec-training/train_word2vec.py, one epoch on the corpus
+
+Results (wall time, peak RSS and throughput per stage, plus the commit and
+configuration) are written as JSON. --compare checks them against an earlier
+results file and exits with status 1 if any stage got slower, used more
+memory or lost throughput beyond --threshold.
+
+Usage:
+  python benchmarks/run_benchmarks.py [--words 100000] [--dimensions 25] [--stages api_startup search ...]
+                                      [--output FILE] [--compare BASELINE.json] [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_APP = os.path.join(ROOT, "web-app")
+TRAINING = os.path.join(ROOT, "word2vec-training")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+STAGES = ("startup", "api_startup", "search", "model_to_csv", "csv_to_json", "train")
+# Entry points timed by the startup stage: (name, working directory, command arguments)
+STARTUP_COMMANDS = [
+    ("api_import", WEB_APP, ["-c", "import api"]),
+    ("print_word_vectors_help", ROOT, ["print_word_vectors.py", "--help"]),
+    ("word_vec_to_csv_import", ROOT, ["-c", "import word_vec_to_csv"]),
+    ("train_word2vec_help", TRAINING, ["train_word2vec.py", "--help"]),
+    ("preprocess_corpus_help", TRAINING, ["preprocess_corpus.py", "--help"]),
+    ("csv_to_json_help", TRAINING, ["csv_to_json.py", "--help"]),
+    ("model_to_csv_import", TRAINING, ["-c", "import model_to_csv"])
+]
+# Metrics compared by --compare, and whether a higher value is better
+COMPARED_METRICS = {"seconds": False, "peak_rss_mb": False, "throughput": True}
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its largest finished child) in MB, None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_fixtures(directory, words=100000, dimensions=25, train_tokens=1000000, seed=0):
+    """
+    Write the synthetic model, CSV and corpus the stages run on.
+
+    Returns:
+        Dict of fixture paths: 'model', 'csv' and 'corpus'
+    """
+    from gensim.models import KeyedVectors, Word2Vec
+    sys.path.insert(0, ROOT)
+    from vector_export import write_csv
+
+    rng = np.random.default_rng(seed)
+    keys = [f"word{i}" for i in range(words)]
+    vectors = rng.standard_normal((words, dimensions)).astype(np.float32)
+
+    # Word2Vec.load needs a count per word, so give them descending frequencies
+    kv = KeyedVectors(dimensions)
+    kv.add_vectors(keys, vectors)
+    kv.allocate_vecattrs(["count"], [np.int64])
+    kv.expandos["count"][:] = np.arange(words, 0, -1)
+    model = Word2Vec(vector_size=dimensions)
+    model.wv = kv
+
+    paths = {
+        "model": os.path.join(directory, "synthetic.model"),
+        "csv": os.path.join(directory, "synthetic.csv"),
+        "corpus": os.path.join(directory, "corpus.txt")
+    }
+    model.save(paths["model"])
+    write_csv(keys, vectors, paths["csv"])
+
+    # Word frequencies follow Zipf's law, roughly like natural text
+    weights = 1.0 / np.arange(1, words + 1)
+    tokens = rng.choice(words, size=train_tokens, p=weights / weights.sum())
+    with open(paths["corpus"], "w") as f:
+        f.write(" ".join(keys[i] for i in tokens.tolist()))
+    return paths
+
+
+def load_api(fixtures):
+    """Import web-app/api.py serving the synthetic model, timing the import."""
+    os.environ["MODEL_NAME"] = fixtures["model"]
+    os.environ["SEARCH_CACHE_SIZE"] = "0"  # Measure searches, not cache hits
+    sys.path.insert(0, WEB_APP)
+    start = time.perf_counter()
+    import api
+    return api, time.perf_counter() - start
+
+
+def stage_startup(fixtures, args):
+    env = dict(os.environ, MODEL_NAME=fixtures["model"])
+    result = {}
+    for name, cwd, command in STARTUP_COMMANDS:
+        runs = []
+        for _ in range(args.startup_runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + command, cwd=cwd, env=env, check=True,
+                           stdout=subprocess.DEVNULL)
+            runs.append(time.perf_counter() - start)
+        result[f"{name}_seconds"] = min(runs)
+    result["seconds"] = sum(result.values())
+    result["throughput"] = len(STARTUP_COMMANDS) / result["seconds"]
+    result["throughput_unit"] = "starts/s"
+    # The largest of the entry point processes, not this one
+    result["peak_rss_mb"] = peak_rss_mb(children=True)
+    return result
+
+
+def stage_api_startup(fixtures, args):
+    api, import_seconds = load_api(fixtures)
+    start = time.perf_counter()
+    api.create_app(warm=True)
+    seconds = import_seconds + time.perf_counter() - start
+    entry = api.registry.get(api.MODEL_NAME)
+    return {
+        "seconds": seconds,
+        "throughput": len(entry.engine) / seconds,
+        "throughput_unit": "words/s",
+        "import_seconds": import_seconds,
+        "model_load_seconds": entry.load_seconds
+    }
+
+
+def stage_search(fixtures, args):
+    api, _ = load_api(fixtures)
+    client = api.app.test_client()
+    rng = np.random.default_rng(1)
+    queries = [f"word{i}" for i in rng.integers(0, args.words, size=args.queries).tolist()]
+    for word in queries[:10]:
+        client.post("/api/search", json={"word": word})
+
+    latencies = []
+    start = time.perf_counter()
+    for word in queries:
+        query_start = time.perf_counter()
+        response = client.post("/api/search", json={"word": word})
+        latencies.append(time.perf_counter() - query_start)
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/search returned {response.status_code} for {word!r}")
+    seconds = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "seconds": seconds,
+        "throughput": len(queries) / seconds,
+        "throughput_unit": "queries/s",
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99))
+    }
+
+
+def stage_model_to_csv(fixtures, args):
+    sys.path.insert(0, TRAINING)
+    from model_to_csv import model_to_csv
+    output = os.path.join(args.fixtures, "export.csv")
+    start = time.perf_counter()
+    model_to_csv(fixtures["model"], output)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "throughput": args.words / seconds,
+        "throughput_unit": "words/s",
+        "output_mb": os.path.getsize(output) / (1024 * 1024)
+    }
+
+
+def stage_csv_to_json(fixtures, args):
+    sys.path.insert(0, TRAINING)
+    from csv_to_json import csv_to_json
+    output = os.path.join(args.fixtures, "export.json")
+    start = time.perf_counter()
+    csv_to_json(fixtures["csv"], output)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "throughput": args.words / seconds,
+        "throughput_unit": "words/s",
+        "output_mb": os.path.getsize(output) / (1024 * 1024)
+    }
+
+
+def stage_train(fixtures, args):
+    sys.path.insert(0, TRAINING)
+    from train_word2vec import train_word2vec, summary_path
+    output = os.path.join(args.fixtures, "trained.model")
+    start = time.perf_counter()
+    train_word2vec(corpus_path=fixtures["corpus"], output_file=output, vector_size=args.dimensions,
+                   min_count=1, max_final_vocab=None, epochs=1, workers=args.workers)
+    seconds = time.perf_counter() - start
+    with open(summary_path(output)) as f:
+        summary = json.load(f)
+    return {
+        "seconds": seconds,
+        "throughput": summary["words_per_sec"],
+        "throughput_unit": "words/s",
+        "train_seconds": summary["timings"]["train_seconds"],
+        "vocabulary_size": summary["vocabulary_size"]
+    }
+
+
+def run_stage_in_process(args):
+    """Child process entry point: run one stage and write its result JSON."""
+    with open(os.path.join(args.fixtures, "fixtures.json")) as f:
+        fixtures = json.load(f)
+    stage = globals()[f"stage_{args.run_stage}"]
+    # The scripts report progress on stdout; keep only the result
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = stage(fixtures, args)
+    result.setdefault("peak_rss_mb", peak_rss_mb())
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+    if args.verbose:
+        print(log.getvalue())
+
+
+def run_stage(stage, fixtures_dir, args):
+    """Run one stage in a fresh interpreter and return its result dict."""
+    result_path = os.path.join(fixtures_dir, f"{stage}.result.json")
+    command = [sys.executable, os.path.abspath(__file__), "--run-stage", stage, "--fixtures", fixtures_dir,
+               "--result", result_path, "--words", str(args.words), "--dimensions", str(args.dimensions),
+               "--queries", str(args.queries), "--startup-runs", str(args.startup_runs)]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    if args.verbose:
+        command.append("--verbose")
+    subprocess.run(command, check=True)
+    with open(result_path) as f:
+        return json.load(f)
+
+
+def git_commit():
+    """Current commit hash, with '-dirty' if there are uncommitted changes (None outside git)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def environment_info(args):
+    import gensim
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "gensim": gensim.__version__,
+        "config": {
+            "words": args.words,
+            "dimensions": args.dimensions,
+            "train_tokens": args.train_tokens,
+            "queries": args.queries,
+            "startup_runs": args.startup_runs,
+            "repeat": args.repeat,
+            "workers": args.workers
+        }
+    }
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compare two results files stage by stage.
+
+    Args:
+        baseline: Results dict from an earlier run
+        current: Results dict from this run
+        threshold: Relative change beyond which a metric counts as a regression
+
+    Returns:
+        List of (stage, metric, baseline value, current value, relative change, regressed)
+    """
+    rows = []
+    for stage, result in current["stages"].items():
+        before = baseline["stages"].get(stage)
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change < -threshold if higher_is_better else change > threshold
+            rows.append((stage, metric, old, new, change, regressed))
+    return rows
+
+
+def print_results(results):
+    print(f"\n   {'stage':<14} {'time':>9} {'peak RSS':>10} {'throughput':>22}")
+    for stage, result in results["stages"].items():
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+        throughput = f"{result['throughput']:,.0f} {result['throughput_unit']}"
+        print(f"   {stage:<14} {result['seconds']:>8.2f}s {rss:>10} {throughput:>22}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load, search, export and training on synthetic data.")
+    parser.add_argument("--words", type=int, default=100000, help="synthetic vocabulary size")
+    parser.add_argument("--dimensions", type=int, default=25, help="synthetic vector dimensions")
+    parser.add_argument("--train-tokens", type=int, default=1000000, help="words in the training corpus")
+    parser.add_argument("--queries", type=int, default=200, help="searches timed by the search stage")
+    parser.add_argument("--workers", type=int, default=None, help="training threads (default: all cores)")
+    parser.add_argument("--startup-runs", type=int, default=3, help="runs per entry point in the startup stage")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage; the fastest is kept")
+    parser.add_argument("--output", default=None,
+                        help="results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change counted as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="show each stage's own output")
+    # Used internally to run a single stage in a child process
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--fixtures", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        run_stage_in_process(args)
+        return
+
+    results = {"environment": environment_info(args), "stages": {}}
+    with tempfile.TemporaryDirectory() as fixtures_dir:
+        print(f"1. Generating synthetic fixtures: {args.words} words x {args.dimensions} dimensions, "
+              f"{args.train_tokens} corpus words")
+        start = time.perf_counter()
+        fixtures = make_fixtures(fixtures_dir, args.words, args.dimensions, args.train_tokens)
+        with open(os.path.join(fixtures_dir, "fixtures.json"), "w") as f:
+            json.dump(fixtures, f)
+        print(f"   Done in {time.perf_counter() - start:.2f}s")
+
+        print(f"2. Running {len(args.stages)} stages, each in its own process...")
+        for stage in args.stages:
+            runs = [run_stage(stage, fixtures_dir, args) for _ in range(args.repeat)]
+            results["stages"][stage] = min(runs, key=lambda result: result["seconds"])
+            print(f"   {stage}: {results['stages'][stage]['seconds']:.2f}s")
+
+    print_results(results)
+
+    commit = results["environment"]["commit"]
+    output = args.output or os.path.join(RESULTS_DIR, f"{(commit or 'results')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["environment"]["config"] != results["environment"]["config"]:
+            print("⚠️  Warning: the baseline was run with a different configuration; "
+                  "results may not be comparable")
+        rows = compare_results(baseline, results, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline['environment']['commit']}):")
+        print(f"   {'stage':<14} {'metric':<12} {'baseline':>12} {'current':>12} {'change':>8}")
+        for stage, metric, old, new, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"   {stage:<14} {metric:<12} {old:>12.2f} {new:>12.2f} {change:>+8.0%}{flag}")
+        regressions = [row for row in rows if row[-1]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
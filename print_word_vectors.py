@@ -1,23 +1,42 @@
-import gensim.downloader as api
+import argparse
 
-# Load a pre-trained word2vec model
-print("Loading word2vec model...")
-model = api.load("glove-twitter-25")  # Small, fast-loading model
-print(f"Model loaded! Vocabulary size: {len(model.key_to_index)}\n")
+MODEL_NAME = "glove-twitter-25"  # Small, fast-loading model
+WORDS = ["king", "queen", "prince", "fox"]
 
-# Words to print vectors for
-words = ["king", "queen", "prince", "fox"]
 
-print("Word Vectors:")
-print("=" * 80)
+def print_word_vectors(words=WORDS, model_name=MODEL_NAME):
+    """
+    Load a pre-trained model and print the vectors of the given words.
 
-for word in words:
-    if word in model.key_to_index:
-        vector = model[word]
-        print(f"\n{word.upper()}:")
-        print(f"  Vector dimensions: {len(vector)}")
-        print(f"  First 10 values: {vector[:10]}")
-        print(f"  Full vector: {vector}")
-    else:
-        print(f"\n{word.upper()}: Word not found in model vocabulary")
+    Args:
+        words: Words to print vectors for
+        model_name: gensim downloader model name
+    """
+    # Imported here so `--help` does not pay for loading gensim
+    import gensim.downloader as api
 
+    # Load a pre-trained word2vec model
+    print("Loading word2vec model...")
+    model = api.load(model_name)
+    print(f"Model loaded! Vocabulary size: {len(model.key_to_index)}\n")
+
+    print("Word Vectors:")
+    print("=" * 80)
+
+    for word in words:
+        if word in model.key_to_index:
+            vector = model[word]
+            print(f"\n{word.upper()}:")
+            print(f"  Vector dimensions: {len(vector)}")
+            print(f"  First 10 values: {vector[:10]}")
+            print(f"  Full vector: {vector}")
+        else:
+            print(f"\n{word.upper()}: Word not found in model vocabulary")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the vectors of a few words from a pre-trained model.")
+    parser.add_argument("words", nargs="*", default=WORDS, help=f"words to print (default: {' '.join(WORDS)})")
+    parser.add_argument("--model", default=MODEL_NAME, help="gensim downloader model name")
+    args = parser.parse_args()
+    print_word_vectors(args.words, args.model)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from vector_export import export_vectors, vocab_path, write_csv
+
+WORDS = ['king', 'queen', 'a,b', 'say "hi"', 'café']
+
+
+def make_vectors(n=len(WORDS), dimensions=5):
+    vectors = np.random.default_rng(0).standard_normal((n, dimensions)).astype(np.float32)
+    # Values that need all nine significant digits, and extremes
+    vectors[0, :3] = [np.float32(1) / 3, np.nextafter(np.float32(1), np.float32(2)), np.float32(1e-38)]
+    vectors[1, :2] = [np.finfo(np.float32).max, -np.finfo(np.float32).tiny]
+    return vectors
+
+
+def test_csv_round_trip_is_bit_exact(tmp_path):
+    vectors = make_vectors()
+    path = str(tmp_path / 'vectors.csv')
+    export_vectors(WORDS, vectors, path)
+    df = pd.read_csv(path, keep_default_na=False)
+    assert list(df.columns) == ['word'] + [f'dim_{i}' for i in range(5)]
+    assert df['word'].tolist() == WORDS
+    np.testing.assert_array_equal(df.iloc[:, 1:].to_numpy(dtype=np.float32), vectors)
+
+
+def test_csv_is_written_in_chunks(tmp_path):
+    vectors = make_vectors(n=25)
+    words = [f'w{i}' for i in range(25)]
+    path = str(tmp_path / 'vectors.csv')
+    write_csv(words, vectors, path, chunk_size=7)
+    df = pd.read_csv(path)
+    assert df['word'].tolist() == words
+    np.testing.assert_array_equal(df.iloc[:, 1:].to_numpy(dtype=np.float32), vectors)
+
+
+def test_npy_round_trip(tmp_path):
+    vectors = make_vectors()
+    path = str(tmp_path / 'vectors.npy')
+    export_vectors(WORDS, vectors, path)
+    np.testing.assert_array_equal(np.load(path), vectors)
+    with open(vocab_path(path), encoding='utf-8') as f:
+        assert f.read().split('\n') == WORDS
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    vectors = make_vectors()
+    path = str(tmp_path / 'vectors.parquet')
+    export_vectors(WORDS, vectors, path)
+    df = pd.read_parquet(path)
+    assert df['word'].tolist() == WORDS
+    assert (df.dtypes.iloc[1:] == np.float32).all()
+    np.testing.assert_array_equal(df.iloc[:, 1:].to_numpy(), vectors)
+
+
+def test_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        export_vectors(WORDS, make_vectors(), str(tmp_path / 'vectors.txt'))
+    with pytest.raises(ValueError):
+        export_vectors(WORDS[:2], make_vectors(), str(tmp_path / 'vectors.csv'))
+    with pytest.raises(ValueError):
+        export_vectors(['two\nlines'], np.zeros((1, 5)), str(tmp_path / 'vectors.npy'))
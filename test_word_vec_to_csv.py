@@ -0,0 +1,44 @@
+import json
+import word_vec_to_csv
+from word_vec_to_csv import cheap_filter, load_verdict_cache, save_verdict_cache, select_words
+
+
+def test_cheap_filter_keeps_survivors_in_order():
+    words = ['The', 'king', 'café', 'a', '42', '#1', "'tis", 'x1', 'queen', 'of']
+    assert cheap_filter(words, {'the', 'of'}) == ['king', "'tis", 'x1', 'queen']
+
+
+def test_verdict_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'verdicts.json')
+    assert load_verdict_cache(path) == {}
+    save_verdict_cache(path, {'king': True, 'bonjour': False})
+    assert load_verdict_cache(path) == {'king': True, 'bonjour': False}
+
+
+def test_verdict_cache_from_older_filters_is_ignored(tmp_path):
+    path = tmp_path / 'verdicts.json'
+    path.write_text(json.dumps({'version': word_vec_to_csv.FILTER_VERSION - 1, 'verdicts': {'king': True}}))
+    assert load_verdict_cache(str(path)) == {}
+
+
+def test_select_words_uses_cached_verdicts_and_stops_early():
+    verdicts = {'house': True, 'bonjour': False, 'weather': True, 'tomorrow': True}
+    assert select_words(['house', 'bonjour', 'weather', 'tomorrow'], 2, verdicts, workers=1, chunk_size=2) == [
+        'house', 'weather']
+
+
+def test_select_words_checks_new_words_and_caches_them():
+    verdicts = {'house': False}
+    words = ['house', 'weather', 'bonjour', 'shit', 'something', 'tomorrow']
+    assert select_words(words, 10, verdicts, workers=2, chunk_size=2) == ['weather', 'something', 'tomorrow']
+    # The cached verdict wins over the filters, and every new word gets a verdict
+    assert verdicts == {'house': False, 'weather': True, 'bonjour': False, 'shit': False,
+                        'something': True, 'tomorrow': True}
+
+
+def test_fully_cached_run_starts_no_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('process pool started')
+    monkeypatch.setattr(word_vec_to_csv, 'ProcessPoolExecutor', no_pool)
+    verdicts = {'house': True, 'bonjour': False, 'weather': True}
+    assert select_words(['house', 'bonjour', 'weather'], 10, verdicts, workers=1, chunk_size=2) == ['house', 'weather']
@@ -0,0 +1,100 @@
+"""
+Export words and their vectors straight from the vector matrix.
+
+Shared by word_vec_to_csv.py and word2vec-training/model_to_csv.py. Rows are
+written in chunks from the float32 matrix (e.g. wv.vectors) and the key list,
+without building a per-row string array or an object-dtype DataFrame.
+
+Supported formats (picked from the output file extension by default):
+  .csv      word,dim_0,...,dim_N with a fixed float format
+  .npy      float32 matrix, plus the words in <name>.vocab.txt
+  .parquet  word column plus one float32 column per dimension (needs pyarrow)
+"""
+
+import os
+import numpy as np
+
+CSV_FLOAT_FORMAT = "%.9g"  # 9 significant digits round-trip any float32 exactly
+CHUNK_SIZE = 10000
+
+
+def _csv_field(word):
+    """Quote a word for CSV if it contains a delimiter, quote or newline."""
+    if any(c in word for c in ',"\n\r'):
+        return '"' + word.replace('"', '""') + '"'
+    return word
+
+
+def column_names(vector_size):
+    """CSV/Parquet column names: ['word', 'dim_0', 'dim_1', ...]."""
+    return ['word'] + [f'dim_{i}' for i in range(vector_size)]
+
+
+def write_csv(words, vectors, output_file, float_format=CSV_FLOAT_FORMAT, chunk_size=CHUNK_SIZE):
+    """Write word,dim_0,...,dim_N rows, chunk_size rows at a time."""
+    row_format = "%s" + ("," + float_format) * vectors.shape[1] + "\n"
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(column_names(vectors.shape[1])) + "\n")
+        for start in range(0, len(words), chunk_size):
+            rows = vectors[start:start + chunk_size].tolist()
+            chunk_words = words[start:start + chunk_size]
+            f.write("".join(row_format % (_csv_field(word), *row)
+                            for word, row in zip(chunk_words, rows)))
+
+
+def write_npy(words, vectors, output_file):
+    """Write the float32 matrix as .npy and the words, one per line, as <name>.vocab.txt."""
+    if any("\n" in word for word in words):
+        raise ValueError("Words containing newlines cannot be stored in a .vocab.txt file")
+    np.save(output_file, np.asarray(vectors, dtype=np.float32))
+    with open(vocab_path(output_file), "w", encoding="utf-8") as f:
+        f.write("\n".join(words))
+
+
+def vocab_path(npy_file):
+    """Path of the word list written next to an .npy export."""
+    return os.path.splitext(npy_file)[0] + ".vocab.txt"
+
+
+def write_parquet(words, vectors, output_file, chunk_size=CHUNK_SIZE * 10):
+    """Write a Parquet file with one row group per chunk (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+
+    names = column_names(vectors.shape[1])
+    schema = pa.schema([('word', pa.string())] + [(name, pa.float32()) for name in names[1:]])
+    with pq.ParquetWriter(output_file, schema) as writer:
+        for start in range(0, len(words), chunk_size):
+            block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+            columns = [pa.array(words[start:start + chunk_size], type=pa.string())]
+            columns += [pa.array(block[:, i]) for i in range(block.shape[1])]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+
+WRITERS = {
+    'csv': write_csv,
+    'npy': write_npy,
+    'parquet': write_parquet,
+}
+
+
+def export_vectors(words, vectors, output_file, fmt=None):
+    """
+    Export words and their vectors.
+
+    Args:
+        words: List of words, in the same order as the rows of vectors
+        vectors: Array of shape (len(words), dimensions), e.g. wv.vectors
+        output_file: Output path
+        fmt: 'csv', 'npy' or 'parquet' (default: from the output file extension)
+    """
+    if fmt is None:
+        fmt = os.path.splitext(output_file)[1].lstrip('.').lower() or 'csv'
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(WRITERS)})")
+    if len(words) != len(vectors):
+        raise ValueError(f"{len(words)} words but {len(vectors)} vectors")
+    WRITERS[fmt](list(words), vectors, output_file)
@@ -0,0 +1,201 @@
+"""
+Approximate nearest-neighbour search with an inverted file (IVF) index.
+
+The unit-normalized vocabulary is clustered with spherical k-means. Each word
+goes into the inverted list of its closest centroid. A query scores the
+centroids first and then only scans the words in the nprobe best lists.
+Raising nprobe trades speed for recall. nprobe == n_lists is an exact scan.
+"""
+
+import hashlib
+import os
+import numpy as np
+
+
+def _assign(vectors, centroids, block_size=65536):
+    """Return the index of the most similar centroid for every row of vectors."""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start:start + block_size]
+        assignment[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(vectors, n_clusters, n_iter=10, seed=0):
+    """
+    Cluster unit-length vectors by cosine similarity.
+
+    Args:
+        vectors: Unit-normalized float32 array of shape (n, dimensions)
+        n_clusters: Number of centroids
+        n_iter: Number of assignment/update rounds
+        seed: Random seed for the initial centroids
+
+    Returns:
+        Unit-normalized float32 centroids of shape (n_clusters, dimensions)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignment = _assign(vectors, centroids)
+        sums = np.stack([
+            np.bincount(assignment, weights=vectors[:, d], minlength=n_clusters)
+            for d in range(vectors.shape[1])
+        ], axis=1)
+        counts = np.bincount(assignment, minlength=n_clusters)
+
+        # Re-seed empty clusters with random vectors so every list stays useful
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+def fingerprint(vectors):
+    """Hash of a vocabulary matrix, so an index saved for other vectors is not reused."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str((vectors.shape, vectors.dtype.str)).encode())
+    digest.update(np.ascontiguousarray(vectors).data)
+    return digest.hexdigest()
+
+
+class IVFIndex:
+    """Inverted file index over a unit-normalized vocabulary matrix."""
+
+    def __init__(self, centroids, list_offsets, list_indices, fingerprint=None):
+        """
+        Args:
+            centroids: Array of shape (n_lists, dimensions)
+            list_offsets: Array of n_lists + 1 offsets into list_indices
+            list_indices: Vocabulary indices grouped by inverted list
+            fingerprint: fingerprint() of the vectors the index was built from
+        """
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_indices = list_indices
+        self.fingerprint = fingerprint
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @property
+    def n_vectors(self):
+        return len(self.list_indices)
+
+    @staticmethod
+    def default_n_lists(n_vectors):
+        """Rule of thumb: about 4 * sqrt(n) lists."""
+        return max(1, min(n_vectors, int(4 * np.sqrt(n_vectors))))
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, n_iter=10, sample_size=None, seed=0):
+        """
+        Build an index from a unit-normalized vocabulary matrix.
+
+        Args:
+            vectors: Unit-normalized float32 array of shape (n, dimensions)
+            n_lists: Number of inverted lists (default: 4 * sqrt(n))
+            n_iter: k-means iterations
+            sample_size: Rows used to train the centroids (default: 256 per list)
+            seed: Random seed
+        """
+        if n_lists is None:
+            n_lists = cls.default_n_lists(len(vectors))
+        if sample_size is None:
+            sample_size = 256 * n_lists
+
+        rng = np.random.default_rng(seed)
+        if sample_size < len(vectors):
+            sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        else:
+            sample = vectors
+        centroids = spherical_kmeans(sample, n_lists, n_iter=n_iter, seed=seed)
+
+        assignment = _assign(vectors, centroids)
+        list_indices = np.argsort(assignment, kind='stable').astype(np.int32)
+        counts = np.bincount(assignment, minlength=n_lists)
+        list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(centroids, list_offsets, list_indices, fingerprint=fingerprint(vectors))
+
+    def save(self, path):
+        """Save the index as an .npz file."""
+        np.savez(path, centroids=self.centroids, list_offsets=self.list_offsets,
+                 list_indices=self.list_indices, fingerprint=np.array(self.fingerprint or ''))
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save()."""
+        with np.load(path) as data:
+            # Indexes saved before fingerprints were stored have none, and are rebuilt
+            saved = str(data['fingerprint']) if 'fingerprint' in data.files else ''
+            return cls(data['centroids'], data['list_offsets'], data['list_indices'],
+                       fingerprint=saved or None)
+
+    @classmethod
+    def load_or_build(cls, path, vectors, n_lists=None, **build_kwargs):
+        """
+        Load the index at path, or build and save it if it is missing or stale.
+
+        An index is stale when it was built with a different number of lists or
+        from different vectors, e.g. a model retrained with the same vocabulary size.
+        """
+        if n_lists is None:
+            n_lists = cls.default_n_lists(len(vectors))
+        if os.path.exists(path):
+            index = cls.load(path)
+            if (index.n_vectors == len(vectors) and index.n_lists == n_lists
+                    and index.fingerprint == fingerprint(vectors)):
+                return index
+        index = cls.build(vectors, n_lists=n_lists, **build_kwargs)
+        index.save(path)
+        return index
+
+    def candidates(self, query, nprobe):
+        """Return the vocabulary indices in the nprobe lists closest to query."""
+        nprobe = min(nprobe, self.n_lists)
+        centroid_scores = self.centroids @ query
+        if nprobe < self.n_lists:
+            probes = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+        else:
+            probes = np.arange(self.n_lists)
+        return np.concatenate([
+            self.list_indices[self.list_offsets[p]:self.list_offsets[p + 1]]
+            for p in probes
+        ])
+
+    def search(self, vectors, query, topn, nprobe, exclude=None):
+        """
+        Approximate top-k search.
+
+        Args:
+            vectors: The unit-normalized matrix the index was built from
+            query: Unit-normalized query vector
+            topn: Number of results
+            nprobe: Number of inverted lists to scan
+            exclude: Optional vocabulary index to leave out of the results
+
+        Returns:
+            (indices, scores) of the best matches, most similar first
+        """
+        candidates = self.candidates(query, nprobe)
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        scores = vectors[candidates] @ query
+
+        topn = min(topn, len(candidates))
+        if topn <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if topn < len(candidates):
+            best = np.argpartition(scores, -topn)[-topn:]
+        else:
+            best = np.arange(len(candidates))
+        # Order by vocabulary index first so ties keep frequency order, like the exact scan
+        best = best[np.argsort(candidates[best], kind='stable')]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return candidates[best].astype(np.int64), scores[best]
@@ -0,0 +1,77 @@
+"""
+Compare the approximate IVF search against the exact scan.
+
+For a sample of query words this reports recall@10 (the fraction of the exact
+top 10 that the index also returns) and the mean latency per query for a
+range of nprobe values. Use it to pick IVF_NLIST / IVF_NPROBE for api.py.
+
+Usage:
+  python ann_recall.py [model_name_or_path] [--nlist N] [--nprobe 1 4 16 64] [--queries 1000]
+"""
+
+import argparse
+import time
+import numpy as np
+from similarity import SimilarityEngine
+from ann_index import IVFIndex
+from vector_store import load_keyed_vectors
+
+
+def recall_at_k(engine, index, queries, nprobe, k=10):
+    """Return (mean recall@k, mean seconds per approximate query, mean seconds per exact query)."""
+    hits = 0
+    approx_time = 0.0
+    exact_time = 0.0
+    for query_index in queries:
+        query = engine.vectors[query_index]
+
+        start = time.perf_counter()
+        exact, _ = engine.top_k(engine.vectors @ query, k, exclude=query_index)
+        exact_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx, _ = index.search(engine.vectors, query, k, nprobe, exclude=query_index)
+        approx_time += time.perf_counter() - start
+
+        hits += len(np.intersect1d(exact, approx))
+    return hits / (k * len(queries)), approx_time / len(queries), exact_time / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure IVF recall@10 against exact search.")
+    parser.add_argument("model", nargs="?", default="glove-twitter-25",
+                        help="gensim downloader name or path to a saved Word2Vec model")
+    parser.add_argument("--nlist", type=int, default=None,
+                        help="number of IVF lists (default: about 4 * sqrt(vocabulary size))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--queries", type=int, default=1000, help="number of sampled query words")
+    parser.add_argument("--index", default=None, help="path to load/save the index (.npz)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"1. Loading model: {args.model}")
+    model = load_keyed_vectors(args.model)
+    engine = SimilarityEngine.from_keyed_vectors(model)
+    print(f"   Vocabulary size: {len(engine)}")
+
+    print("2. Building IVF index...")
+    start = time.perf_counter()
+    if args.index:
+        index = IVFIndex.load_or_build(args.index, engine.vectors, n_lists=args.nlist, seed=args.seed)
+    else:
+        index = IVFIndex.build(engine.vectors, n_lists=args.nlist, seed=args.seed)
+    print(f"   {index.n_lists} lists ready in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.choice(len(engine), min(args.queries, len(engine)), replace=False)
+
+    print(f"3. Comparing against exact search over {len(queries)} queries\n")
+    print(f"{'nprobe':>8} {'recall@10':>10} {'ivf ms':>10} {'exact ms':>10} {'speedup':>8}")
+    for nprobe in args.nprobe:
+        recall, approx_time, exact_time = recall_at_k(engine, index, queries, nprobe)
+        print(f"{nprobe:>8} {recall:>10.4f} {approx_time * 1000:>10.3f} "
+              f"{exact_time * 1000:>10.3f} {exact_time / approx_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,475 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import gensim.downloader as api
-import numpy as np
+import os
+import signal
+import threading
+import time
+from functools import wraps
+from similarity import ANALOGY_METHODS, cancels_out
+from ann_index import IVFIndex
+from model_registry import ModelRegistry, read_registry_file
+from neighbor_table import NeighborTable
+from search_cache import SearchCache
+from batching import MicroBatcher
+from word_index import WordIndex
+from metrics import (Counter, HistogramFamily, PrometheusText, StageTimer, LATENCY_BUCKETS,
+                     PROMETHEUS_CONTENT_TYPE, resident_memory_bytes)
+
+# --- Configuration ---
+MODEL_NAME = os.environ.get('MODEL_NAME', 'glove-twitter-25')
+# Directory written by vector_store.py; when set the model is memory-mapped from it
+# instead of loaded through gensim.downloader
+VECTOR_STORE = os.environ.get('VECTOR_STORE')
+# JSON file naming more models that requests can select with "model" (see model_registry.py),
+# and the memory budget in MB above which least recently used models are evicted (0 = no limit)
+MODEL_REGISTRY = os.environ.get('MODEL_REGISTRY')
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get('MODEL_MEMORY_BUDGET_MB', 0))
+# Load the default model when the app is created with create_app() (python api.py, gunicorn.conf.py).
+# With WARM_UP=0 it is loaded by the first request that needs it instead.
+WARM_UP = os.environ.get('WARM_UP', '1') == '1'
+# Neighbour table for the default model written by neighbor_table.py (.neighbors.json);
+# searches with topn up to its k become lookups with no similarity computation
+NEIGHBOR_TABLE = os.environ.get('NEIGHBOR_TABLE')
+# 'exact' scans the whole vocabulary; 'ivf' uses the approximate index in ann_index.py.
+# An exact scan of 1.2M words takes about 38 ms at p99 on one core, so use 'ivf' to keep
+# searches on large models under 10 ms (see "Approximate search" in README.md)
+SEARCH_INDEX = os.environ.get('SEARCH_INDEX', 'exact')
+# Number of IVF lists (0 = about 4 * sqrt(vocabulary size)) and lists scanned per query.
+# Higher IVF_NPROBE means better recall and slower searches; see ann_recall.py.
+IVF_NLIST = int(os.environ.get('IVF_NLIST', 0))
+IVF_NPROBE = int(os.environ.get('IVF_NPROBE', 16))
+# Storage for the vocabulary matrix: 'float32', 'float16' or 'int8' (per-row scales), and how
+# many of the best quantized candidates to re-score with float32 (0 = no re-ranking; keeps the
+# float32 matrix, so pair it with VECTOR_STORE). See quantization_report.py.
+VECTOR_DTYPE = os.environ.get('VECTOR_DTYPE', 'float32')
+RERANK_CANDIDATES = int(os.environ.get('RERANK_CANDIDATES', 0))
+# Query words per matrix-matrix product in /api/search/batch (bounds memory per block)
+BATCH_BLOCK_SIZE = int(os.environ.get('BATCH_BLOCK_SIZE', 256))
+# Largest accepted batch, topn and analogy query, so one request cannot monopolize the server
+MAX_BATCH_WORDS = int(os.environ.get('MAX_BATCH_WORDS', 10000))
+MAX_TOPN = int(os.environ.get('MAX_TOPN', 100))
+MAX_ANALOGY_WORDS = int(os.environ.get('MAX_ANALOGY_WORDS', 20))
+# LRU cache of search results (0 entries disables it) and entry lifetime in seconds (0 = forever)
+SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', 4096))
+SEARCH_CACHE_TTL = float(os.environ.get('SEARCH_CACHE_TTL', 0))
+# Micro-batching of concurrent /api/search calls: queries arriving within the window
+# (milliseconds, 0 disables batching) are answered with one matrix-matrix product
+SEARCH_BATCH_WINDOW_MS = float(os.environ.get('SEARCH_BATCH_WINDOW_MS', 0))
+SEARCH_MAX_BATCH = int(os.environ.get('SEARCH_MAX_BATCH', 64))
+# Searches running at once in this process (0 = unlimited), and how long a request
+# waits for a free slot before it is turned away with 429 Too Many Requests. Waiting
+# requests hold a gunicorn thread, so the limit must be below the worker's SEARCH_THREADS
+# (see gunicorn.conf.py) for any request to reach the 429; by default one thread is left over.
+SEARCH_THREADS = int(os.environ.get('SEARCH_THREADS', 4))
+MAX_CONCURRENT_SEARCHES = int(os.environ.get('MAX_CONCURRENT_SEARCHES', max(1, SEARCH_THREADS - 1)))
+QUEUE_TIMEOUT = float(os.environ.get('QUEUE_TIMEOUT', 1.0))
+# When set, POST /api/reload requires this value in the X-Reload-Token header
+RELOAD_TOKEN = os.environ.get('RELOAD_TOKEN')
+# Requests sent with X-Profile: 1 get a Server-Timing header breaking down where their time
+# went (parse, lookup, similarity, topk, serialize); set PROFILE_HEADER=0 to ignore it
+PROFILE_HEADER = os.environ.get('PROFILE_HEADER', '1') == '1'
+# Word index behind /api/suggest and the "did you mean" suggestions on unknown words: the
+# most frequent SUGGEST_FUZZY_WORDS words (0 = prefix completion only) are indexed for
+# typo correction within SUGGEST_MAX_DISTANCE edits. Larger distances grow the index quickly.
+SUGGEST_FUZZY_WORDS = int(os.environ.get('SUGGEST_FUZZY_WORDS', 100000))
+SUGGEST_MAX_DISTANCE = int(os.environ.get('SUGGEST_MAX_DISTANCE', 1))
+MAX_SUGGESTIONS = int(os.environ.get('MAX_SUGGESTIONS', 50))
 
 app = Flask(__name__)
 CORS(app)
 
-# Load the word2vec model (load once at startup)
-print("Loading word2vec model...")
-model = api.load("glove-twitter-25")
-print(f"Model loaded! Vocabulary size: {len(model.key_to_index)}")
+if SEARCH_INDEX not in ('exact', 'ivf'):
+    raise ValueError(f"Unknown SEARCH_INDEX: {SEARCH_INDEX} (expected 'exact' or 'ivf')")
+
+def prepare_model(entry):
+    """Apply the configured search index, storage and batching to a newly loaded model."""
+    engine = entry.engine
+    if entry.source.get('neighbors'):
+        table = NeighborTable(entry.source['neighbors'])
+        if table.words != engine.words:
+            raise ValueError(f"Neighbour table {entry.source['neighbors']} does not match the vocabulary of {entry.name}")
+        entry.neighbors = table
+        print(f"Neighbour table loaded: top {table.k} for {len(table)} words")
+
+    if SEARCH_INDEX == 'ivf':
+        # The index is saved next to the model and rebuilt only when stale
+        print(f"Loading IVF index: {entry.index_path}")
+        index = IVFIndex.load_or_build(entry.index_path, engine.vectors, n_lists=IVF_NLIST or None)
+        engine.use_index(index, IVF_NPROBE)
+        print(f"IVF index ready: {index.n_lists} lists, nprobe={IVF_NPROBE}")
+
+    if VECTOR_DTYPE != 'float32':
+        # After the IVF index, which is built from the float32 matrix
+        engine.quantize(VECTOR_DTYPE, rerank=RERANK_CANDIDATES)
+        print(f"Vectors stored as {VECTOR_DTYPE}: {engine.vectors.nbytes / (1024*1024):.1f} MB"
+              + (f", re-ranking the top {RERANK_CANDIDATES} in float32" if RERANK_CANDIDATES else ""))
+
+    # The IVF index scans a few lists per query, so there is no shared product to batch
+    if SEARCH_BATCH_WINDOW_MS > 0 and engine.index is None:
+        entry.batcher = MicroBatcher(engine, window_ms=SEARCH_BATCH_WINDOW_MS, max_batch=SEARCH_MAX_BATCH,
+                                     block_size=BATCH_BLOCK_SIZE)
+
+    start = time.perf_counter()
+    entry.word_index = WordIndex(engine.words, max_distance=SUGGEST_MAX_DISTANCE, fuzzy_words=SUGGEST_FUZZY_WORDS)
+    print(f"Word index ready in {time.perf_counter() - start:.2f}s "
+          f"({entry.word_index.fuzzy_words} words indexed for corrections)")
+
+# The default model is served when a request does not name one. With VECTOR_STORE it is
+# memory-mapped (no gensim import, and forked workers share the page cache).
+sources = read_registry_file(MODEL_REGISTRY) if MODEL_REGISTRY else {}
+sources.setdefault(MODEL_NAME, {'path': VECTOR_STORE, 'type': 'store'} if VECTOR_STORE else {'path': MODEL_NAME})
+if NEIGHBOR_TABLE:
+    sources[MODEL_NAME] = dict(sources[MODEL_NAME], neighbors=NEIGHBOR_TABLE)
+registry = ModelRegistry(sources, memory_budget_mb=MODEL_MEMORY_BUDGET_MB, pinned=[MODEL_NAME],
+                         prepare=prepare_model)
+
+# Importing this module loads no model: the default one is loaded by create_app() (before
+# gunicorn forks) or on first use, like the others
+
+def warm_up():
+    """Load the default model now rather than on the first request that needs it."""
+    print(f"Model loaded! Vocabulary size: {len(registry.get(MODEL_NAME).engine)}")
+
+# Cache keys include the model version, so results from a previous model are never served
+search_cache = SearchCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+def invalidate_search_cache(entry=None):
+    """Drop cached results; called whenever a model is reloaded."""
+    search_cache.clear()
+
+# Request counts by (route, method, status), and latency histograms per route and per stage
+# of a route, exposed on /metrics. Each process (gunicorn worker) keeps its own.
+request_counts = Counter()
+request_latency = HistogramFamily(LATENCY_BUCKETS)
+stage_latency = HistogramFamily(LATENCY_BUCKETS)
+
+@app.before_request
+def start_request_timer():
+    g.timer = StageTimer()
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request, record its latency and stages, and add Server-Timing if asked."""
+    if 'request_start' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    # The route pattern rather than the path, so unknown URLs do not create new series
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    request_counts.inc((route, request.method, str(response.status_code)))
+    request_latency.labels(route).observe(elapsed)
+    for stage, seconds in g.timer.stages.items():
+        stage_latency.labels(route, stage).observe(seconds)
+    if PROFILE_HEADER and request.headers.get('X-Profile') == '1':
+        timings = [f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in g.timer.stages.items()]
+        response.headers['Server-Timing'] = ', '.join(timings + [f'total;dur={elapsed * 1000:.3f}'])
+    return response
+
+def reload_loaded_models(signum=None, frame=None):
+    """Reload every loaded model in the background (the SIGHUP handler)."""
+    for entry in registry.loaded():
+        registry.reload_in_background(entry.name, on_reloaded=invalidate_search_cache)
 
-def cosine_similarity(vec1, vec2):
-    """Calculate cosine similarity between two vectors."""
-    dot_product = np.dot(vec1, vec2)
-    magnitude1 = np.linalg.norm(vec1)
-    magnitude2 = np.linalg.norm(vec2)
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0
-    return dot_product / (magnitude1 * magnitude2)
+def install_reload_signal():
+    """Reload models on SIGHUP; gunicorn.conf.py calls this in each worker."""
+    if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGHUP, reload_loaded_models)
+
+install_reload_signal()
+
+def resolve_model(data):
+    """Return (entry, None) for the model named in the request, or (None, error response)."""
+    name = data.get('model') or MODEL_NAME
+    if not isinstance(name, str) or name not in registry:
+        return None, (jsonify({'error': f'Unknown model "{name}"', 'models': registry.names}), 404)
+    return registry.get(name), None
+
+search_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SEARCHES) if MAX_CONCURRENT_SEARCHES > 0 else None
+rejected_requests = Counter()
+
+def limit_concurrency(view):
+    """Run the view in a search slot, or return 429 when none frees up in time."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if search_slots is None:
+            return view(*args, **kwargs)
+        if not search_slots.acquire(timeout=QUEUE_TIMEOUT):
+            rejected_requests.inc()
+            response = jsonify({'error': 'Server is busy, try again shortly'})
+            response.headers['Retry-After'] = str(max(1, round(QUEUE_TIMEOUT)))
+            return response, 429
+        try:
+            return view(*args, **kwargs)
+        finally:
+            search_slots.release()
+    return wrapper
 
 @app.route('/api/search', methods=['POST'])
+@limit_concurrency
 def search_similar_words():
     """Find the top 10 most similar words to the input word."""
-    data = request.json
-    word = data.get('word', '').lower().strip()
+    timer = g.timer
+    with timer.stage('parse'):
+        data = request.json
+        word = data.get('word', '').lower().strip()
     
     if not word:
         return jsonify({'error': 'Word is required'}), 400
     
-    if word not in model.key_to_index:
-        return jsonify({'error': f'Word "{word}" not found in vocabulary'}), 404
+    with timer.stage('lookup'):
+        entry, error = resolve_model(data)
+        if error:
+            return error
+        found = word in entry.engine
     
-    # Get the input word's vector
-    input_vector = model[word]
+    if not found:
+        with timer.stage('lookup'):
+            suggestions = entry.word_index.suggest(word)
+        return jsonify({'error': f'Word "{word}" not found in vocabulary', 'suggestions': suggestions}), 404
     
-    # Calculate similarity with all words
-    similarities = []
-    for vocab_word in model.key_to_index.keys():
-        if vocab_word != word:  # Exclude the input word itself
-            vocab_vector = model[vocab_word]
-            similarity = cosine_similarity(input_vector, vocab_vector)
-            similarities.append({
-                'word': vocab_word,
-                'similarity': float(similarity)
-            })
+    if entry.neighbors is not None and entry.neighbors.k >= 10:
+        # Precomputed: a row lookup, no similarity computation
+        with timer.stage('lookup'):
+            top_10 = entry.neighbors.neighbors(word, topn=10)
+    else:
+        # Similarity with every word at once, excluding the input word itself
+        cache_key = (word, 10, entry.version)
+        with timer.stage('lookup'):
+            top_10 = search_cache.get(cache_key)
+        if top_10 is None:
+            if entry.batcher is not None:
+                # Includes the wait for the batch and its top-k selection
+                with timer.stage('similarity'):
+                    top_10 = entry.batcher.most_similar(word, topn=10)
+            else:
+                top_10 = entry.engine.most_similar(word, topn=10, timer=timer)
+            search_cache.put(cache_key, top_10)
     
-    # Sort by similarity (descending) and get top 10
-    similarities.sort(key=lambda x: x['similarity'], reverse=True)
-    top_10 = similarities[:10]
+    with timer.stage('serialize'):
+        return jsonify({
+            'input_word': word,
+            'results': top_10
+        })
+
+@app.route('/api/search/batch', methods=['POST'])
+@limit_concurrency
+def search_similar_words_batch():
+    """Find the top N most similar words for each word in a list."""
+    timer = g.timer
+    with timer.stage('parse'):
+        data = request.json
+        if not isinstance(data, dict):
+            data = {}
+        words = data.get('words')
+        topn = data.get('topn', 10)
     
-    return jsonify({
-        'input_word': word,
-        'results': top_10
-    })
+    if not isinstance(words, list) or not words:
+        return jsonify({'error': 'Words must be a non-empty list'}), 400
+    
+    if len(words) > MAX_BATCH_WORDS:
+        return jsonify({'error': f'At most {MAX_BATCH_WORDS} words per batch'}), 400
+    
+    if not isinstance(topn, int) or isinstance(topn, bool) or not 1 <= topn <= MAX_TOPN:
+        return jsonify({'error': f'topn must be an integer between 1 and {MAX_TOPN}'}), 400
+    
+    entry, error = resolve_model(data)
+    if error:
+        return error
+    
+    words = [str(word).lower().strip() for word in words]
+    if entry.neighbors is not None and topn <= entry.neighbors.k:
+        with timer.stage('lookup'):
+            similar = [entry.neighbors.neighbors(word, topn) if word in entry.neighbors else None for word in words]
+    else:
+        # Similarity and top-k selection together, block by block
+        with timer.stage('similarity'):
+            similar = entry.engine.most_similar_batch(words, topn=topn, block_size=BATCH_BLOCK_SIZE)
+    
+    # Missing words get their own error entry instead of failing the whole batch
+    results = []
+    for word, top_n in zip(words, similar):
+        if top_n is None:
+            results.append({'input_word': word, 'error': f'Word "{word}" not found in vocabulary',
+                            'suggestions': entry.word_index.suggest(word)})
+        else:
+            results.append({'input_word': word, 'results': top_n})
+    
+    with timer.stage('serialize'):
+        return jsonify({'results': results})
+
+@app.route('/api/suggest', methods=['POST'])
+def suggest_words():
+    """Complete a prefix and correct a possibly misspelled word, for autocomplete."""
+    timer = g.timer
+    with timer.stage('parse'):
+        data = request.json or {}
+        prefix = data.get('prefix', '')
+        limit = data.get('limit', 10)
+    
+    if not isinstance(prefix, str) or not prefix.strip():
+        return jsonify({'error': 'Prefix is required'}), 400
+    
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= MAX_SUGGESTIONS:
+        return jsonify({'error': f'limit must be an integer between 1 and {MAX_SUGGESTIONS}'}), 400
+    
+    entry, error = resolve_model(data)
+    if error:
+        return error
+    
+    prefix = prefix.lower().strip()
+    with timer.stage('lookup'):
+        completions = entry.word_index.complete(prefix, limit)
+        corrections = entry.word_index.correct(prefix, limit)
+    
+    with timer.stage('serialize'):
+        return jsonify({
+            'prefix': prefix,
+            'completions': completions,
+            'corrections': corrections
+        })
+
+@app.route('/api/analogy', methods=['POST'])
+@limit_concurrency
+def analogy():
+    """Answer a vector arithmetic query such as king - man + woman."""
+    timer = g.timer
+    with timer.stage('parse'):
+        data = request.json or {}
+        positive = data.get('positive')
+        negative = data.get('negative', [])
+        topn = data.get('topn', 10)
+        method = data.get('method', '3cosadd')
+    
+    if not isinstance(positive, list) or not positive or not isinstance(negative, list):
+        return jsonify({'error': 'positive must be a non-empty list of words and negative a list of words'}), 400
+    
+    if len(positive) + len(negative) > MAX_ANALOGY_WORDS:
+        return jsonify({'error': f'At most {MAX_ANALOGY_WORDS} words per query'}), 400
+    
+    if not isinstance(topn, int) or isinstance(topn, bool) or not 1 <= topn <= MAX_TOPN:
+        return jsonify({'error': f'topn must be an integer between 1 and {MAX_TOPN}'}), 400
+    
+    if method not in ANALOGY_METHODS:
+        return jsonify({'error': f'method must be one of {", ".join(ANALOGY_METHODS)}'}), 400
+    
+    entry, error = resolve_model(data)
+    if error:
+        return error
+    
+    positive = [str(word).lower().strip() for word in positive]
+    negative = [str(word).lower().strip() for word in negative]
+    missing = [word for word in positive + negative if word not in entry.engine]
+    if missing:
+        return jsonify({'error': f'Words not found in vocabulary: {", ".join(missing)}', 'missing': missing}), 404
+    
+    if cancels_out(positive, negative):
+        # king - king has no direction, so every candidate would score the same
+        return jsonify({'error': 'The negative words cancel out the positive ones'}), 400
+    
+    with timer.stage('similarity'):
+        results = entry.engine.analogy(positive, negative, topn=topn, method=method)
+    
+    with timer.stage('serialize'):
+        return jsonify({
+            'positive': positive,
+            'negative': negative,
+            'method': method,
+            'results': results
+        })
+
+@app.route('/api/reload', methods=['POST'])
+def reload_model():
+    """Rebuild a model from its source in the background and swap it in when ready."""
+    if RELOAD_TOKEN and request.headers.get('X-Reload-Token') != RELOAD_TOKEN:
+        return jsonify({'error': 'Invalid reload token'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    name = data.get('model') or MODEL_NAME
+    if not isinstance(name, str) or name not in registry:
+        return jsonify({'error': f'Unknown model "{name}"', 'models': registry.names}), 404
+    
+    if not registry.reload_in_background(name, on_reloaded=invalidate_search_cache):
+        return jsonify({'error': f'Model "{name}" is already reloading'}), 409
+    
+    # In-flight and new requests keep using the current copy until the swap
+    return jsonify({'model': name, 'status': 'loading'}), 202
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({'status': 'ok', 'vocabulary_size': len(model.key_to_index)})
+    default_model = registry.get(MODEL_NAME)
+    return jsonify({
+        'status': 'ok',
+        'vocabulary_size': len(default_model.engine),
+        'search_index': SEARCH_INDEX,
+        'vector_dtype': VECTOR_DTYPE,
+        'model_version': default_model.version,
+        'reload': registry.reload_status.get(MODEL_NAME),
+        'models': registry.stats(),
+        'cache': search_cache.stats(),
+        'batching': default_model.batcher.stats() if default_model.batcher else None,
+        'concurrency': {
+            'max_concurrent_searches': MAX_CONCURRENT_SEARCHES,
+            'rejected_requests': rejected_requests.values().get((), 0)
+        }
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request, latency, model, cache and memory metrics in the Prometheus text format."""
+    text = PrometheusText()
+    text.add('word2vec_requests_total', 'counter', 'Requests handled, by route, method and status code.',
+             request_counts.values(), label_names=('route', 'method', 'status'))
+    text.add_histograms('word2vec_request_duration_seconds', 'Time to handle a request, by route.',
+                        request_latency.items(), label_names=('route',))
+    text.add_histograms('word2vec_request_stage_duration_seconds',
+                        'Time spent in each stage of a request (parse, lookup, similarity, topk, serialize).',
+                        stage_latency.items(), label_names=('route', 'stage'))
+    text.add('word2vec_rejected_requests_total', 'counter', 'Requests turned away with 429 because every search slot was busy.',
+             {(): rejected_requests.values().get((), 0)})
+    
+    entries = registry.loaded()
+    text.add('word2vec_model_load_seconds', 'gauge', 'Time taken to load and prepare each loaded model.',
+             {(entry.name,): entry.load_seconds for entry in entries}, label_names=('model',))
+    text.add('word2vec_model_vocabulary_size', 'gauge', 'Words in each loaded model.',
+             {(entry.name,): len(entry.engine) for entry in entries}, label_names=('model',))
+    text.add('word2vec_model_memory_bytes', 'gauge', 'Approximate memory held by each loaded model.',
+             {(entry.name,): entry.nbytes for entry in entries}, label_names=('model',))
+    text.add('word2vec_model_evictions_total', 'counter', 'Models evicted to stay within the memory budget.',
+             {(): registry.evictions})
+    
+    cache = search_cache.stats()
+    for counter in ('hits', 'misses', 'evictions', 'expirations'):
+        text.add(f'word2vec_search_cache_{counter}_total', 'counter', f'Search cache {counter}.', {(): cache[counter]})
+    text.add('word2vec_search_cache_entries', 'gauge', 'Results currently cached.', {(): cache['size']})
+    
+    batchers = [(entry.name, entry.batcher) for entry in entries if entry.batcher is not None]
+    if batchers:
+        text.add_histograms('word2vec_batch_size', 'Queries answered per micro-batch.',
+                            [((name,), batcher.batch_sizes) for name, batcher in batchers], label_names=('model',))
+        text.add_histograms('word2vec_batch_queue_wait_seconds', 'Time a query waited for its micro-batch.',
+                            [((name,), batcher.queue_waits) for name, batcher in batchers], label_names=('model',))
+    
+    text.add('process_resident_memory_bytes', 'gauge', 'Resident memory of this process.',
+             {(): resident_memory_bytes()})
+    return Response(text.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+def create_app(warm=WARM_UP):
+    """
+    Return the Flask app, ready to serve.
+
+    Args:
+        warm: Load the default model before returning (default: WARM_UP);
+            otherwise the first request that needs it loads it
+
+    gunicorn.conf.py serves 'api:create_app()', so with preload_app the model
+    is loaded once in the master and shared by the forked workers.
+    """
+    if warm:
+        warm_up()
+    return app
 
 if __name__ == '__main__':
-    app.run(port=5000, debug=True)
+    # Development server; use gunicorn.conf.py in production
+    create_app().run(port=5000, debug=True)
 
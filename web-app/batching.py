@@ -0,0 +1,133 @@
+"""
+Micro-batching scheduler for concurrent single-word searches.
+
+Each /api/search on its own does a full pass over the vocabulary matrix.
+Under load, MicroBatcher collects the queries that arrive within a short
+window (or until max_batch are waiting), answers them with one
+matrix-matrix product through SimilarityEngine.most_similar_batch, and
+hands each result back to the request waiting on it.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from metrics import Histogram
+
+# Upper bounds for the batch size and queue wait (seconds) histograms
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_WAIT_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25]
+
+
+class MicroBatcher:
+    """Batch concurrent most_similar calls into shared matrix products."""
+
+    def __init__(self, engine, window_ms=2.0, max_batch=64, block_size=256):
+        """
+        Args:
+            engine: SimilarityEngine to search with
+            window_ms: How long to wait for more queries after the first one arrives
+            max_batch: Largest number of queries answered together
+            block_size: Passed to most_similar_batch to bound memory per product
+        """
+        self.engine = engine
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.block_size = block_size
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_waits = Histogram(QUEUE_WAIT_BUCKETS)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+    def _ensure_started(self):
+        # Started on first use rather than in __init__: threads do not survive
+        # a fork, and the app may be preloaded in a gunicorn master (caller holds the lock)
+        if self._thread is None or self._pid != os.getpid():
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='search-batcher', daemon=True)
+            self._thread.start()
+
+    def submit(self, word, topn=10):
+        """Queue a search and return a Future for its result list (None if the word is missing)."""
+        future = Future()
+        with self._lock:
+            if not self._closed:
+                self._ensure_started()
+                self._queue.put((word, topn, future, time.perf_counter()))
+                return future
+        # Closed (the model was reloaded): answer directly so late callers still finish
+        future.set_result(self.engine.most_similar_batch([word], topn=topn)[0])
+        return future
+
+    def close(self):
+        """Stop the batching thread once the queries already queued are answered."""
+        with self._lock:
+            self._closed = True
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(None)
+
+    def most_similar(self, word, topn=10):
+        """Blocking equivalent of SimilarityEngine.most_similar, answered in a batch."""
+        return self.submit(word, topn).result()
+
+    def _collect(self):
+        """
+        Wait for a query, then gather more until the window closes or the batch is full.
+
+        Returns (batch, stop): stop is True once close() has been called.
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                break
+            started = time.perf_counter()
+            for _, _, _, queued_at in batch:
+                self.queue_waits.observe(started - queued_at)
+            self.batch_sizes.observe(len(batch))
+
+            # One product for the whole batch at the largest topn; top_k orders
+            # ties by index, so a shorter list is a prefix of a longer one
+            words = [word for word, _, _, _ in batch]
+            topn = max(n for _, n, _, _ in batch)
+            try:
+                results = self.engine.most_similar_batch(words, topn=topn, block_size=self.block_size)
+            except Exception as e:
+                for _, _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, n, future, _), result in zip(batch, results):
+                future.set_result(None if result is None else result[:n])
+
+    def stats(self):
+        """Return the settings plus batch size and queue wait (seconds) histograms."""
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_seconds': self.queue_waits.snapshot()
+        }
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from similarity import SimilarityEngine, normalize_rows
+
+
+@pytest.fixture
+def random_vectors():
+    """Factory for a reproducible random float32 matrix, optionally with unit-length rows."""
+    def make(n=200, dimensions=16, seed=0, unit=False):
+        vectors = np.random.default_rng(seed).standard_normal((n, dimensions)).astype(np.float32)
+        return normalize_rows(vectors) if unit else vectors
+    return make
+
+
+@pytest.fixture
+def make_engine(random_vectors):
+    """Factory for a SimilarityEngine over random vectors for words w0, w1, ...; returns (engine, vectors)."""
+    def make(n_words=200, dimensions=16, seed=0):
+        vectors = random_vectors(n_words, dimensions, seed)
+        return SimilarityEngine([f'w{i}' for i in range(n_words)], vectors), vectors
+    return make
@@ -0,0 +1,119 @@
+"""
+Evaluate word analogies (a : b :: c : ?) in batches.
+
+Reads a file in the word2vec questions-words.txt format: section headers
+starting with ":" followed by lines of four words "a b c d", where d is the
+expected answer to b - a + c. Questions are answered in blocks with
+SimilarityEngine.analogy_batch, so whole sections are scored with a few
+matrix-matrix products. Reports accuracy per section, overall accuracy and
+throughput.
+
+Usage:
+  python evaluate_analogies.py [model_name_or_path] [--questions questions-words.txt]
+                               [--method 3cosadd|3cosmul] [--restrict-vocab 300000]
+"""
+
+import argparse
+import time
+from similarity import SimilarityEngine, ANALOGY_METHODS
+from vector_store import load_keyed_vectors
+
+
+def read_questions(path, lowercase=True):
+    """Return a list of (section, [a, b, c, d]) from a questions-words file."""
+    questions = []
+    section = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(":"):
+                section = line[1:].strip()
+                continue
+            words = line.lower().split() if lowercase else line.split()
+            if len(words) != 4:
+                raise ValueError(f"Expected 4 words per question, got: {line}")
+            questions.append((section, words))
+    return questions
+
+
+def evaluate(engine, questions, method="3cosadd", restrict_vocab=300000, block_size=256):
+    """
+    Answer every question and score the top answer against the expected word.
+
+    Questions with a word outside the first restrict_vocab words are skipped,
+    as in gensim's evaluate_word_analogies.
+
+    Returns:
+        Dict of section -> {'correct', 'total', 'skipped'} plus the elapsed seconds
+    """
+    allowed = set(engine.words[:restrict_vocab] if restrict_vocab else engine.words)
+    sections = {}
+    answerable = []
+    for section, words in questions:
+        counts = sections.setdefault(section, {"correct": 0, "total": 0, "skipped": 0})
+        if all(word in allowed for word in words):
+            answerable.append((section, words))
+            counts["total"] += 1
+        else:
+            counts["skipped"] += 1
+
+    start = time.perf_counter()
+    queries = [([b, c], [a]) for _, (a, b, c, _) in answerable]
+    answers = engine.analogy_batch(queries, topn=1, method=method, restrict_vocab=restrict_vocab,
+                                   block_size=block_size)
+    elapsed = time.perf_counter() - start
+
+    for (section, words), answer in zip(answerable, answers):
+        if answer and answer[0]["word"] == words[3]:
+            sections[section]["correct"] += 1
+    return sections, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate word analogies in batches.")
+    parser.add_argument("model", nargs="?", default="glove-twitter-25",
+                        help="gensim downloader name or path to a saved Word2Vec model")
+    parser.add_argument("--questions", default=None,
+                        help="questions-words format file (default: the copy shipped with gensim)")
+    parser.add_argument("--method", choices=ANALOGY_METHODS, default="3cosadd")
+    parser.add_argument("--restrict-vocab", type=int, default=300000,
+                        help="only use the most frequent N words as questions and answers (0 for all)")
+    parser.add_argument("--block-size", type=int, default=256, help="questions per matrix-matrix product")
+    parser.add_argument("--case-sensitive", action="store_true", help="do not lowercase the questions")
+    args = parser.parse_args()
+
+    questions_path = args.questions
+    if questions_path is None:
+        from gensim.test.utils import datapath
+        questions_path = datapath("questions-words.txt")
+
+    print(f"1. Loading model: {args.model}")
+    engine = SimilarityEngine.from_keyed_vectors(load_keyed_vectors(args.model))
+    print(f"   Vocabulary size: {len(engine)}")
+
+    print(f"2. Reading questions: {questions_path}")
+    questions = read_questions(questions_path, lowercase=not args.case_sensitive)
+    print(f"   {len(questions)} questions")
+
+    print(f"3. Answering with {args.method}...\n")
+    sections, elapsed = evaluate(engine, questions, method=args.method,
+                                 restrict_vocab=args.restrict_vocab or None, block_size=args.block_size)
+
+    print(f"{'section':<32} {'correct':>8} {'total':>8} {'skipped':>8} {'accuracy':>9}")
+    correct = total = skipped = 0
+    for section, counts in sections.items():
+        accuracy = counts["correct"] / counts["total"] if counts["total"] else 0.0
+        print(f"{section:<32} {counts['correct']:>8} {counts['total']:>8} {counts['skipped']:>8} {accuracy:>9.1%}")
+        correct += counts["correct"]
+        total += counts["total"]
+        skipped += counts["skipped"]
+
+    print(f"\n   Overall accuracy: {correct / total if total else 0.0:.1%} ({correct}/{total}, {skipped} skipped)")
+    if total:
+        print(f"   Answered {total} questions in {elapsed:.2f}s ({total / elapsed:.0f} questions/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Gunicorn settings for serving api.py in production.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is created with api.create_app(), which loads the default model, once in the master before the
+workers fork, so every worker shares the same vector pages copy-on-write.
+With VECTOR_STORE set the matrix is memory-mapped and shared through the
+page cache as well. Each worker runs a pool of threads; the similarity work
+is NumPy matrix products, which release the GIL, so threads in one worker
+search in parallel.
+"""
+
+import multiprocessing
+import os
+
+# The app factory; it loads the default model unless WARM_UP=0
+wsgi_app = 'api:create_app()'
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+# Create the app (and load the model) before forking
+preload_app = True
+# Worker processes (default: one per core) and threads per worker. api.py reads SEARCH_THREADS
+# too and by default allows one search fewer than this at once, so a request can get a 429
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('SEARCH_THREADS', 4))
+# Large batch requests can take a while on big vocabularies
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+
+
+def post_worker_init(worker):
+    # Workers reset signal handlers after forking; reinstall the SIGHUP model reload
+    # so `kill -HUP <worker pid>` reloads that worker's models without a restart
+    import api
+    api.install_reload_signal()
@@ -0,0 +1,128 @@
+"""
+Load test the similarity API and report throughput and latency percentiles.
+
+Each client thread sends POST /api/search requests back to back, cycling
+through the query words, until the duration is up.
+
+Usage:
+  python load_test.py [--url http://localhost:5000] [--concurrency 16] [--duration 10]
+                      [--words king queen ...] [--words-file words.txt]
+"""
+
+import argparse
+import json
+import math
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORDS = ["king", "queen", "man", "woman", "love", "happy", "music", "game", "food", "time"]
+
+
+def send_search(url, word, timeout):
+    """POST one search and return its HTTP status (0 for a connection error)."""
+    body = json.dumps({"word": word}).encode("utf-8")
+    req = urllib.request.Request(f"{url}/api/search", data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def client(url, words, offset, deadline, timeout):
+    """Send requests until the deadline; return a list of (status, seconds)."""
+    samples = []
+    i = offset
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        status = send_search(url, words[i % len(words)], timeout)
+        samples.append((status, time.perf_counter() - start))
+        i += 1
+    return samples
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    k = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def run_load_test(url, words, concurrency=16, duration=10.0, timeout=30.0):
+    """
+    Run the load test and print a summary.
+
+    Args:
+        url: Base URL of the API
+        words: Query words, cycled through by each client
+        concurrency: Number of client threads
+        duration: Seconds to send requests for
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Dict with requests, rps, status counts and latency percentiles in ms
+    """
+    print(f"Load testing {url} with {concurrency} clients for {duration:.0f}s...")
+    start = time.perf_counter()
+    deadline = start + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(client, url, words, i, deadline, timeout) for i in range(concurrency)]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in samples)
+    ok_latencies = sorted(seconds * 1000 for status, seconds in samples if status == 200)
+    summary = {
+        "requests": len(samples),
+        "rps": len(samples) / elapsed,
+        "ok_rps": len(ok_latencies) / elapsed,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+    if ok_latencies:
+        summary.update({
+            "mean_ms": statistics.fmean(ok_latencies),
+            "p50_ms": percentile(ok_latencies, 50),
+            "p90_ms": percentile(ok_latencies, 90),
+            "p99_ms": percentile(ok_latencies, 99),
+            "max_ms": ok_latencies[-1],
+        })
+
+    print(f"\n   Requests:  {summary['requests']} in {elapsed:.1f}s")
+    print(f"   Throughput: {summary['rps']:.1f} req/s ({summary['ok_rps']:.1f} req/s with status 200)")
+    print(f"   Statuses:  {', '.join(f'{status}: {count}' for status, count in summary['statuses'].items())}")
+    if ok_latencies:
+        print(f"   Latency (200s): p50 {summary['p50_ms']:.1f}ms, p90 {summary['p90_ms']:.1f}ms, "
+              f"p99 {summary['p99_ms']:.1f}ms, max {summary['max_ms']:.1f}ms")
+    if statuses.get(429):
+        print(f"   {statuses[429]} requests were turned away with 429 (server at MAX_CONCURRENT_SEARCHES)")
+    if statuses.get(0):
+        print(f"   {statuses[0]} requests failed to connect or timed out")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the similarity API.")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--words", nargs="+", default=None, help="query words")
+    parser.add_argument("--words-file", default=None, help="file with one query word per line")
+    parser.add_argument("--json", action="store_true", help="also print the summary as JSON")
+    args = parser.parse_args()
+
+    words = args.words or DEFAULT_WORDS
+    if args.words_file:
+        with open(args.words_file, encoding="utf-8") as f:
+            words = [line.strip() for line in f if line.strip()]
+
+    summary = run_load_test(args.url.rstrip("/"), words, concurrency=args.concurrency,
+                            duration=args.duration, timeout=args.timeout)
+    if args.json:
+        print(json.dumps(summary, indent=2))
@@ -0,0 +1,208 @@
+"""
+Lightweight in-process metrics for tuning the API.
+
+Counters and histograms are kept per process and rendered in the Prometheus
+text exposition format by PrometheusText for the /metrics endpoint.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Latency histogram upper bounds in seconds, from 100us to 10s
+LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Thread-safe histogram with fixed bucket upper bounds, like a Prometheus histogram."""
+
+    def __init__(self, buckets):
+        """
+        Args:
+            buckets: Increasing upper bounds; values above the last one are counted in +Inf
+        """
+        self.buckets = list(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Record one value."""
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[position] += 1
+            self._sum += value
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    def snapshot(self):
+        """Return count, sum, mean and cumulative counts per upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        count = sum(counts)
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + ['+Inf'], counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'buckets': cumulative
+        }
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter, one value per combination of labels."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        """
+        Add amount to the counter for labels.
+
+        Args:
+            labels: Tuple of label values, in the same order on every call
+            amount: Non-negative increment
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self):
+        """Return a dict of labels tuple -> value."""
+        with self._lock:
+            return dict(self._values)
+
+
+class HistogramFamily:
+    """Histograms with shared buckets, created on first use for each combination of labels."""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Return the Histogram for these label values."""
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(values, Histogram(self.buckets))
+        return histogram
+
+    def items(self):
+        """Return (labels tuple, Histogram) pairs."""
+        with self._lock:
+            return list(self._histograms.items())
+
+
+class StageTimer:
+    """Wall time spent in the named stages of one request."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block and add it to stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+
+class _NullTimer:
+    """Stand-in for StageTimer when nobody is measuring."""
+
+    def stage(self, name):
+        return nullcontext()
+
+
+NULL_TIMER = _NullTimer()
+
+
+def resident_memory_bytes():
+    """Current resident set size of this process, or None where it cannot be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS, in bytes on macOS (kilobytes elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def _format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class PrometheusText:
+    """Build a response body in the Prometheus text exposition format (version 0.0.4)."""
+
+    def __init__(self):
+        self._lines = []
+
+    def add(self, name, kind, help_text, samples, label_names=()):
+        """
+        Add a counter or gauge.
+
+        Args:
+            name: Metric name, e.g. 'word2vec_requests_total'
+            kind: 'counter' or 'gauge'
+            help_text: One-line description
+            samples: Dict (or pairs) of label values tuple -> value; None values are skipped
+            label_names: Names for the label values
+        """
+        self._lines.append(f'# HELP {name} {help_text}')
+        self._lines.append(f'# TYPE {name} {kind}')
+        items = samples.items() if isinstance(samples, dict) else samples
+        for labels, value in sorted(items, key=lambda item: tuple(map(str, item[0]))):
+            if value is not None:
+                self._lines.append(f'{name}{_format_labels(label_names, labels)} {_format_value(value)}')
+
+    def add_histograms(self, name, help_text, histograms, label_names=()):
+        """
+        Add a histogram family.
+
+        Args:
+            histograms: Pairs of (label values tuple, Histogram), e.g. HistogramFamily.items()
+        """
+        self._lines.append(f'# HELP {name} {help_text}')
+        self._lines.append(f'# TYPE {name} histogram')
+        for labels, histogram in sorted(histograms, key=lambda item: tuple(map(str, item[0]))):
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot['buckets'].items():
+                bucket_labels = _format_labels(tuple(label_names) + ('le',), tuple(labels) + (bound,))
+                self._lines.append(f'{name}_bucket{bucket_labels} {count}')
+            label_text = _format_labels(label_names, labels)
+            self._lines.append(f'{name}_sum{label_text} {_format_value(float(snapshot["sum"]))}')
+            self._lines.append(f'{name}_count{label_text} {snapshot["count"]}')
+
+    def render(self):
+        return '\n'.join(self._lines) + '\n'
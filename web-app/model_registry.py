@@ -0,0 +1,366 @@
+"""
+Registry of the models the API can serve, loaded lazily and evicted by memory.
+
+Each model is named and points at a source:
+  - a gensim downloader name ("glove-twitter-25")
+  - a saved gensim model or KeyedVectors file (word2vec_model.model)
+  - a word vector CSV (word,dim_0,dim_1,...)
+  - a vector store directory written by vector_store.py
+
+A model is loaded the first time a request asks for it. When the loaded
+models exceed the memory budget, the least recently used ones are dropped
+(pinned models, such as the default, are never dropped). Requests already
+holding an evicted engine finish normally; it is freed once they are done.
+
+reload() loads a fresh copy of a model from its source and swaps it in the
+same way. The new copy is built while the old one keeps serving, and requests
+that already hold the old entry finish on it.
+"""
+
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from similarity import SimilarityEngine
+
+SOURCE_TYPES = ('gensim', 'file', 'csv', 'store')
+# Rough per-word cost of the vocabulary list, dict and strings, for the memory estimate
+BYTES_PER_WORD = 100
+# Numbers every model load in this process, for ModelEntry.version
+_load_counter = itertools.count(1)
+
+
+def source_type(path):
+    """Guess the source type of a model path or name."""
+    if os.path.isdir(path):
+        return 'store'
+    if path.lower().endswith('.csv'):
+        return 'csv'
+    if os.path.exists(path):
+        return 'file'
+    return 'gensim'
+
+
+def read_csv_vectors(path):
+    """Read a word,dim_0,dim_1,... CSV into (words, float32 matrix)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        dim_columns = sorted((i for i, name in enumerate(header) if name.startswith('dim_')),
+                             key=lambda i: int(header[i].split('_')[1]))
+        word_column = header.index('word')
+        words = []
+        rows = []
+        for row in reader:
+            words.append(row[word_column])
+            rows.append([row[i] for i in dim_columns])
+    return words, np.array(rows, dtype=np.float32).reshape(len(words), len(dim_columns))
+
+
+def load_engine(path, kind=None):
+    """
+    Load a model source into a SimilarityEngine.
+
+    Args:
+        path: Downloader name, model file, CSV file or store directory
+        kind: One of SOURCE_TYPES, or None to guess from the path
+
+    Returns:
+        (engine, index_path) where index_path is where its IVF index is kept
+    """
+    kind = kind or source_type(path)
+    if kind == 'store':
+        from vector_store import VectorStore
+        return SimilarityEngine.from_store(VectorStore(path)), os.path.join(path, 'ivf.npz')
+    if kind == 'csv':
+        words, vectors = read_csv_vectors(path)
+        return SimilarityEngine(words, vectors), f"{path}.ivf.npz"
+    if kind == 'file':
+        from gensim.models import KeyedVectors, Word2Vec
+        try:
+            model = Word2Vec.load(path).wv
+        except AttributeError:
+            # Saved KeyedVectors rather than a full Word2Vec model
+            model = KeyedVectors.load(path)
+        return SimilarityEngine.from_keyed_vectors(model), f"{path}.ivf.npz"
+    if kind == 'gensim':
+        import gensim.downloader as api
+        model = api.load(path)
+        return SimilarityEngine.from_keyed_vectors(model), f"{api.load(path, return_path=True)}.ivf.npz"
+    raise ValueError(f"Unknown model source type: {kind} (expected one of {SOURCE_TYPES})")
+
+
+def engine_nbytes(engine):
+    """Approximate memory held by an engine: its matrices plus the vocabulary."""
+    total = engine.vectors.nbytes + len(engine.words) * BYTES_PER_WORD
+    if engine.exact_vectors is not None:
+        total += engine.exact_vectors.nbytes
+    if engine.index is not None:
+        total += engine.index.centroids.nbytes + engine.index.list_indices.nbytes
+    return total
+
+
+def entry_nbytes(entry):
+    """Approximate memory held by a loaded model, including its neighbour table and word index."""
+    total = engine_nbytes(entry.engine)
+    if entry.neighbors is not None:
+        total += entry.neighbors.indices.nbytes + entry.neighbors.scores.nbytes
+    if entry.word_index is not None:
+        total += entry.word_index.nbytes
+    return total
+
+
+def read_registry_file(path):
+    """
+    Read a JSON file mapping model names to sources.
+
+    Each value is a path/name string or {"path": ..., "type": ..., "neighbors": ...}, e.g.
+        {"glove": "glove-twitter-25",
+         "trained": {"path": "../word2vec-training/word2vec_model.model"},
+         "top1000": {"path": "../top_1000_words_vectors.csv",
+                     "neighbors": "tables/top_1000.neighbors.json"}}
+    "neighbors" is an optional table written by neighbor_table.py. Relative
+    paths are resolved against the file's directory.
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    sources = {}
+    for name, spec in entries.items():
+        if isinstance(spec, str):
+            spec = {'path': spec}
+        for key in ('path', 'neighbors'):
+            if key in spec and os.path.exists(os.path.join(base, spec[key])):
+                spec = dict(spec, **{key: os.path.join(base, spec[key])})
+        sources[name] = spec
+    return sources
+
+
+class ModelEntry:
+    """A loaded model and what it cost to load."""
+
+    def __init__(self, name, engine, index_path, load_seconds):
+        self.name = name
+        self.engine = engine
+        self.index_path = index_path
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        # Part of every cache key, so results from a previous load are never served. A counter
+        # rather than the load time, which two reloads within the clock's resolution would share.
+        self.version = f"{name}@{next(_load_counter)}"
+        # Registry spec the model was loaded from, e.g. {'path': ..., 'neighbors': ...}
+        self.source = {}
+        # Set by the API's prepare hook (see api.py)
+        self.batcher = None
+        self.neighbors = None
+        self.word_index = None
+
+    @property
+    def nbytes(self):
+        return entry_nbytes(self)
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'vocabulary_size': len(self.engine),
+            'memory_mb': round(self.nbytes / (1024 * 1024), 1),
+            'load_seconds': round(self.load_seconds, 3),
+            'loaded_at': self.loaded_at,
+            'last_used': self.last_used,
+            'version': self.version,
+            'neighbor_table_k': self.neighbors.k if self.neighbors is not None else None
+        }
+
+
+class ModelRegistry:
+    """Lazily loaded, LRU-evicted set of named models."""
+
+    def __init__(self, sources, memory_budget_mb=0, pinned=(), prepare=None):
+        """
+        Args:
+            sources: Dict of name -> {'path': ..., 'type': optional source type}
+            memory_budget_mb: Evict least recently used models above this (0 = no limit)
+            pinned: Names that are never evicted
+            prepare: Optional callback(entry) run after loading, before the model is served
+        """
+        self.sources = dict(sources)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.pinned = set(pinned)
+        self.prepare = prepare
+        self.evictions = 0
+        # name -> state of the last reload, for /api/health
+        self.reload_status = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.sources}
+
+    @property
+    def names(self):
+        return list(self.sources)
+
+    def __contains__(self, name):
+        return name in self.sources
+
+    def get(self, name):
+        """
+        Return the ModelEntry for name, loading it on first use.
+
+        Raises:
+            KeyError: If name is not a registered model
+        """
+        if name not in self.sources:
+            raise KeyError(name)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                entry.last_used = time.time()
+                return entry
+
+        # Only one thread loads a given model; others wait for it
+        with self._load_locks[name]:
+            with self._lock:
+                entry = self._entries.get(name)
+            if entry is None:
+                entry = self._load(name)
+                with self._lock:
+                    self._entries[name] = entry
+                    evicted = self._evict(keep=name)
+                self._close(evicted)
+        return entry
+
+    def reload(self, name):
+        """
+        Load a fresh copy of name from its source and atomically swap it in.
+
+        The current copy keeps serving until the swap. Its batcher is closed
+        afterwards; requests still holding it finish normally, and its memory is
+        freed once they are done.
+
+        Returns:
+            The new ModelEntry
+
+        Raises:
+            KeyError: If name is not a registered model
+        """
+        if name not in self.sources:
+            raise KeyError(name)
+        with self._load_locks[name]:
+            entry = self._load(name)
+            with self._lock:
+                old = self._entries.get(name)
+                self._entries[name] = entry
+                self._entries.move_to_end(name)
+                evicted = self._evict(keep=name)
+        self._close(evicted + ([old] if old is not None else []))
+        return entry
+
+    def reload_in_background(self, name, on_reloaded=None):
+        """
+        Start reload(name) in a background thread.
+
+        Args:
+            name: Registered model name
+            on_reloaded: Optional callback(entry) run after a successful swap
+
+        Returns:
+            False if a reload of name is already running, else True
+        """
+        if name not in self.sources:
+            raise KeyError(name)
+        with self._lock:
+            status = self.reload_status.get(name)
+            if status is not None and status['state'] == 'loading':
+                return False
+            self.reload_status[name] = {'state': 'loading', 'started_at': time.time()}
+        thread = threading.Thread(target=self._reload_worker, args=(name, on_reloaded),
+                                  name=f'reload-{name}', daemon=True)
+        thread.start()
+        return True
+
+    def _reload_worker(self, name, on_reloaded):
+        started_at = self.reload_status[name]['started_at']
+        start = time.perf_counter()
+        try:
+            entry = self.reload(name)
+        except Exception as e:
+            status = {'state': 'failed', 'error': str(e)}
+            print(f"Reloading model {name!r} failed: {e}")
+        else:
+            status = {'state': 'ready', 'version': entry.version}
+            if on_reloaded is not None:
+                on_reloaded(entry)
+        status.update(started_at=started_at, duration_seconds=round(time.perf_counter() - start, 3))
+        with self._lock:
+            self.reload_status[name] = status
+
+    def _load(self, name):
+        spec = self.sources[name]
+        print(f"Loading model {name!r} from {spec['path']}...")
+        start = time.perf_counter()
+        engine, index_path = load_engine(spec['path'], spec.get('type'))
+        entry = ModelEntry(name, engine, index_path, 0.0)
+        entry.source = spec
+        if self.prepare is not None:
+            self.prepare(entry)
+        entry.load_seconds = time.perf_counter() - start
+        print(f"Model {name!r} loaded in {entry.load_seconds:.2f}s: {len(engine)} words, "
+              f"{entry.nbytes / (1024 * 1024):.1f} MB")
+        return entry
+
+    def _evict(self, keep):
+        """
+        Drop least recently used models until the budget is met (caller holds the lock).
+
+        Returns:
+            The evicted entries, for _close() once the lock is released
+        """
+        evicted = []
+        if not self.memory_budget:
+            return evicted
+        total = sum(entry.nbytes for entry in self._entries.values())
+        for name in list(self._entries):
+            if total <= self.memory_budget:
+                break
+            if name == keep or name in self.pinned:
+                continue
+            entry = self._entries.pop(name)
+            evicted.append(entry)
+            total -= entry.nbytes
+            self.evictions += 1
+            print(f"Evicted model {name!r} ({entry.nbytes / (1024 * 1024):.1f} MB)")
+        return evicted
+
+    @staticmethod
+    def _close(entries):
+        """
+        Stop the batchers of entries that are no longer served.
+
+        A batcher's thread references its engine, so without this an evicted or
+        replaced model would never be freed. Requests still holding an entry finish normally.
+        """
+        for entry in entries:
+            if entry.batcher is not None:
+                entry.batcher.close()
+
+    def loaded(self):
+        """Return the loaded entries, least recently used first."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def stats(self):
+        """Return the available and loaded models for /api/health."""
+        entries = self.loaded()
+        return {
+            'available': self.names,
+            'loaded': [entry.stats() for entry in entries],
+            'memory_mb': round(sum(entry.nbytes for entry in entries) / (1024 * 1024), 1),
+            'memory_budget_mb': self.memory_budget / (1024 * 1024),
+            'evictions': self.evictions,
+            'reloads': dict(self.reload_status)
+        }
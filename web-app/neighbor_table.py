@@ -0,0 +1,189 @@
+"""
+Precomputed top-k neighbour table for a fixed vocabulary.
+
+For small, fixed vocabularies (the 500/1000-word CSVs) every query asks for
+the same neighbour lists. This tool computes the top k neighbours of every
+word once, in blocked matrix products on a thread pool (NumPy releases the
+GIL), and writes them in a compact format that the API and the web app look
+up by word index with no similarity computation:
+
+  <name>.neighbors.json     {"count", "k", "words", "indices", "scores", "source"}
+  <name>.words.txt          one word per line
+  <name>.indices.bin        little-endian int32, count x k, row-major
+  <name>.scores.bin         little-endian float16, count x k, row-major
+
+Each row lists the word's neighbours most similar first, excluding the word
+itself, with ties in vocabulary order like SimilarityEngine.top_k.
+
+Usage:
+  python neighbor_table.py <model_name_or_path> <output_base> [--k 10] [--block-size N] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from similarity import normalize_rows
+
+MANIFEST_SUFFIX = ".neighbors.json"
+# Target size of one block of scores, which bounds memory per thread
+BLOCK_BYTES = 1 << 27
+
+
+def default_block_size(count):
+    """Rows per block so that a block of scores stays around BLOCK_BYTES."""
+    return int(max(1, min(4096, BLOCK_BYTES // (4 * max(count, 1)))))
+
+
+def top_k_block(vectors, start, end, k):
+    """Return (indices, scores) of the top k neighbours of rows start:end."""
+    scores = vectors[start:end] @ vectors.T
+    rows = np.arange(end - start)
+    # Exclude each word itself
+    scores[rows, np.arange(start, end)] = -np.inf
+    k = min(k, len(vectors) - 1)
+    if k < scores.shape[1]:
+        candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (len(rows), 1))
+    # Vocabulary order first, then a stable sort on score, so ties keep frequency order
+    candidates.sort(axis=1)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return (np.take_along_axis(candidates, order, axis=1).astype(np.int32),
+            np.take_along_axis(candidate_scores, order, axis=1))
+
+
+def compute_neighbors(vectors, k=10, block_size=None, workers=None, normalized=False):
+    """
+    Compute the top-k neighbour table for every row of vectors.
+
+    Args:
+        vectors: Array of shape (count, dimensions)
+        k: Neighbours per word
+        block_size: Rows per matrix product (default: about 128MB of scores per block)
+        workers: Threads computing blocks in parallel (default: CPU count)
+        normalized: True if vectors are already unit-length float32 rows
+
+    Returns:
+        (indices int32 array (count, k), scores float16 array (count, k))
+    """
+    vectors = vectors if normalized else normalize_rows(vectors)
+    count = len(vectors)
+    k = min(k, count - 1)
+    block_size = block_size or default_block_size(count)
+    indices = np.empty((count, k), dtype=np.int32)
+    scores = np.empty((count, k), dtype=np.float16)
+
+    def run(start):
+        end = min(start + block_size, count)
+        indices[start:end], block_scores = top_k_block(vectors, start, end, k)
+        scores[start:end] = block_scores
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # list() re-raises any exception from a block
+        list(pool.map(run, range(0, count, block_size)))
+    return indices, scores
+
+
+def write_neighbor_table(words, indices, scores, base_path, source=None):
+    """
+    Write the table files next to base_path.
+
+    Returns:
+        Path of the .neighbors.json manifest
+    """
+    if any("\n" in word for word in words):
+        raise ValueError("Words containing newlines cannot be stored in a .words.txt file")
+    name = os.path.basename(base_path)
+    manifest = {
+        "count": len(words),
+        "k": int(indices.shape[1]),
+        "words": f"{name}.words.txt",
+        "indices": f"{name}.indices.bin",
+        "scores": f"{name}.scores.bin",
+        "source": source
+    }
+    with open(f"{base_path}.words.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(words))
+    indices.astype("<i4").tofile(f"{base_path}.indices.bin")
+    scores.astype("<f2").tofile(f"{base_path}.scores.bin")
+    manifest_path = f"{base_path}{MANIFEST_SUFFIX}"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+class NeighborTable:
+    """Read-only neighbour table, memory-mapped from the files written above."""
+
+    def __init__(self, manifest_path):
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        self.count = self.manifest["count"]
+        self.k = self.manifest["k"]
+        with open(os.path.join(base, self.manifest["words"]), encoding="utf-8") as f:
+            text = f.read()
+        self.words = text.split("\n") if text else []
+        self.key_to_index = {word: i for i, word in enumerate(self.words)}
+        shape = (self.count, self.k)
+        self.indices = np.memmap(os.path.join(base, self.manifest["indices"]), dtype="<i4", mode="r", shape=shape)
+        self.scores = np.memmap(os.path.join(base, self.manifest["scores"]), dtype="<f2", mode="r", shape=shape)
+        if len(self.words) != self.count:
+            raise ValueError(f"Expected {self.count} words in the neighbour table, got {len(self.words)}")
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, word):
+        return word in self.key_to_index
+
+    def neighbors(self, word, topn=10):
+        """
+        Look up the precomputed neighbours of word.
+
+        Returns:
+            List of {'word': ..., 'similarity': ...} dicts, most similar first
+        """
+        row = self.key_to_index[word]
+        topn = min(topn, self.k)
+        return [
+            {'word': self.words[i], 'similarity': float(score)}
+            for i, score in zip(self.indices[row, :topn].tolist(), self.scores[row, :topn].tolist())
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the top-k neighbour table for a vocabulary.")
+    parser.add_argument("model", help="gensim downloader name, model file, word vector CSV or store directory")
+    parser.add_argument("output_base", help="output path without extension, e.g. public/vectors/top_1000")
+    parser.add_argument("--k", type=int, default=10, help="neighbours per word")
+    parser.add_argument("--block-size", type=int, default=None, help="rows per matrix product")
+    parser.add_argument("--workers", type=int, default=None, help="threads (default: CPU count)")
+    args = parser.parse_args()
+
+    from model_registry import load_engine
+
+    print(f"1. Loading vectors: {args.model}")
+    engine, _ = load_engine(args.model)
+    count = len(engine)
+    block_size = args.block_size or default_block_size(count)
+    print(f"   {count} words, {engine.vectors.shape[1]} dimensions")
+
+    print(f"2. Computing top {args.k} neighbours in blocks of {block_size} rows...")
+    start = time.perf_counter()
+    indices, scores = compute_neighbors(engine.vectors, k=args.k, block_size=block_size,
+                                        workers=args.workers, normalized=True)
+    print(f"   Done in {time.perf_counter() - start:.2f}s")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output_base)), exist_ok=True)
+    manifest_path = write_neighbor_table(engine.words, indices, scores, args.output_base, source=args.model)
+    size_mb = (indices.nbytes + scores.nbytes) / (1024 * 1024)
+    print(f"\n✅ Wrote {manifest_path} ({size_mb:.2f} MB of neighbour data)")
+
+
+if __name__ == "__main__":
+    main()
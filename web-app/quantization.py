@@ -0,0 +1,136 @@
+"""
+Quantized storage for the unit-normalized vocabulary matrix.
+
+A float32 matrix is far larger than top-10 retrieval needs. QuantizedMatrix
+keeps the rows as float16, or as int8 codes with one float32 scale per row
+(about a quarter of the float32 size), and supports the operations
+SimilarityEngine and IVFIndex use on the float32 matrix:
+
+  matrix @ query      scores for every row
+  rows @ matrix.T     scores for a block of query rows
+  matrix[indices]     float32 rows
+  matrix[:n]          the first n rows, still quantized
+
+Scores are computed in blocks of rows converted to float32 in a reused
+buffer that stays in cache, so no full float32 copy is ever made and the
+products still run through BLAS. int8 scales are applied to the scores
+rather than to every element. Scanning int8 codes reads a quarter of the
+memory, so it can be faster than float32. Converting float16 is slower.
+"""
+
+import numpy as np
+
+STORAGE_DTYPES = ('float32', 'float16', 'int8')
+# Rows converted to float32 at a time while scoring (small enough to stay in cache)
+BLOCK_ROWS = 4096
+
+
+class QuantizedMatrix:
+    """A row matrix stored as float16, or as int8 codes with per-row scales."""
+
+    def __init__(self, codes, scales=None, block_rows=BLOCK_ROWS):
+        """
+        Args:
+            codes: float16 array, or int8 array of shape (rows, dimensions)
+            scales: float32 array of shape (rows,), required for int8 codes
+            block_rows: Rows converted to float32 at a time while scoring
+        """
+        if codes.dtype == np.int8 and scales is None:
+            raise ValueError("int8 codes need per-row scales")
+        self.codes = codes
+        self.scales = scales
+        self.block_rows = block_rows
+
+    @classmethod
+    def quantize(cls, vectors, dtype):
+        """
+        Quantize a float32 matrix.
+
+        Args:
+            vectors: Array of shape (rows, dimensions)
+            dtype: 'float16' or 'int8'
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if dtype == 'float16':
+            return cls(vectors.astype(np.float16))
+        if dtype == 'int8':
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+            return cls(codes, scales.astype(np.float32))
+        raise ValueError(f"Unknown quantized dtype: {dtype} (expected 'float16' or 'int8')")
+
+    @property
+    def dtype(self):
+        return self.codes.dtype.name
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _dequantize(self, codes, scales):
+        rows = codes.astype(np.float32)
+        if scales is not None:
+            rows *= scales[..., None]
+        return rows
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            scales = self.scales[key] if self.scales is not None else None
+            return QuantizedMatrix(self.codes[key], scales, self.block_rows)
+        scales = self.scales[key] if self.scales is not None else None
+        return self._dequantize(self.codes[key], scales)
+
+    def blocks(self):
+        """Yield (start, end, float32 rows without scales) using one reused buffer."""
+        buffer = np.empty((min(self.block_rows, len(self)), self.shape[1]), dtype=np.float32)
+        for start in range(0, len(self), self.block_rows):
+            codes = self.codes[start:start + self.block_rows]
+            rows = buffer[:len(codes)]
+            np.copyto(rows, codes, casting='unsafe')
+            yield start, start + len(codes), rows
+
+    def __matmul__(self, other):
+        """Scores self @ other for a vector (dimensions,) or matrix (dimensions, k)."""
+        other = np.asarray(other, dtype=np.float32)
+        out = np.empty((len(self),) + other.shape[1:], dtype=np.float32)
+        for start, end, rows in self.blocks():
+            np.matmul(rows, other, out=out[start:end])
+        if self.scales is not None:
+            out *= self.scales.reshape((-1,) + (1,) * (other.ndim - 1))
+        return out
+
+    def dequantize(self):
+        """Return all rows as a float32 array."""
+        return self._dequantize(self.codes, self.scales)
+
+    @property
+    def T(self):
+        return _Transposed(self)
+
+
+class _Transposed:
+    """Right-hand side of rows @ matrix.T, computed block by block."""
+
+    # Make NumPy defer `ndarray @ _Transposed` to __rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def __rmatmul__(self, other):
+        other = np.asarray(other, dtype=np.float32)
+        matrix = self.matrix
+        out = np.empty(other.shape[:-1] + (len(matrix),), dtype=np.float32)
+        for start, end, rows in matrix.blocks():
+            out[..., start:end] = other @ rows.T
+        if matrix.scales is not None:
+            out *= matrix.scales
+        return out
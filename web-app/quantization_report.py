@@ -0,0 +1,73 @@
+"""
+Report memory saved and search accuracy for quantized vector storage.
+
+For each storage dtype this compares SimilarityEngine search over the
+quantized matrix against the float32 baseline: matrix size, top-10 overlap
+(the fraction of the float32 top 10 that is also returned) with and without
+float32 re-ranking, and mean latency per query.
+
+Usage:
+  python quantization_report.py [model_name_or_path] [--dtypes float16 int8] [--rerank 50]
+                                [--queries 1000]
+"""
+
+import argparse
+import time
+import numpy as np
+from similarity import SimilarityEngine
+from vector_store import load_keyed_vectors
+
+
+def top10_overlap(baseline, engine, words, k=10):
+    """Return (mean overlap of the top k with the baseline, mean seconds per query)."""
+    expected = [{r['word'] for r in baseline.most_similar(word, topn=k)} for word in words]
+    hits = 0
+    start = time.perf_counter()
+    results = [engine.most_similar(word, topn=k) for word in words]
+    seconds = (time.perf_counter() - start) / len(words)
+    for want, got in zip(expected, results):
+        hits += len(want & {r['word'] for r in got})
+    return hits / (k * len(words)), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare quantized vector storage against float32.")
+    parser.add_argument("model", nargs="?", default="glove-twitter-25",
+                        help="gensim downloader name or path to a saved Word2Vec model")
+    parser.add_argument("--dtypes", nargs="+", choices=["float16", "int8"], default=["float16", "int8"])
+    parser.add_argument("--rerank", type=int, default=50, help="candidates re-scored in float32 (0 to skip)")
+    parser.add_argument("--queries", type=int, default=1000, help="number of sampled query words")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"1. Loading model: {args.model}")
+    model = load_keyed_vectors(args.model)
+    baseline = SimilarityEngine.from_keyed_vectors(model)
+    print(f"   Vocabulary size: {len(baseline)}")
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(len(baseline), min(args.queries, len(baseline)), replace=False)
+    words = [baseline.words[i] for i in sample]
+
+    float32_mb = baseline.vectors.nbytes / (1024 * 1024)
+    _, float32_seconds = top10_overlap(baseline, baseline, words)
+
+    print(f"2. Comparing against float32 over {len(words)} queries\n")
+    print(f"{'storage':<18} {'size MB':>9} {'saved':>7} {'top-10 overlap':>15} {'ms/query':>9}")
+    print(f"{'float32':<18} {float32_mb:>9.1f} {'':>7} {1.0:>15.4f} {float32_seconds * 1000:>9.3f}")
+    for dtype in args.dtypes:
+        for rerank in sorted({0, args.rerank}):
+            engine = SimilarityEngine.from_keyed_vectors(model)
+            engine.quantize(dtype, rerank=rerank)
+            size_mb = engine.vectors.nbytes / (1024 * 1024)
+            overlap, seconds = top10_overlap(baseline, engine, words)
+            label = dtype + (f" +rerank {rerank}" if rerank else "")
+            print(f"{label:<18} {size_mb:>9.1f} {1 - size_mb / float32_mb:>7.0%} "
+                  f"{overlap:>15.4f} {seconds * 1000:>9.3f}")
+    if args.rerank:
+        print(f"\n   Re-ranking keeps the float32 matrix as well; with VECTOR_STORE it stays memory-mapped")
+        print(f"   and only the {args.rerank} candidate rows per query are read.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Bounded in-process LRU cache for search results.
+
+Search traffic is heavily skewed towards a few hundred popular words, so
+caching their top-k lists avoids rescanning the vocabulary for every repeat.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SearchCache:
+    """Thread-safe LRU cache with optional time-to-live and hit/miss counters."""
+
+    def __init__(self, maxsize=4096, ttl=0):
+        """
+        Args:
+            maxsize: Maximum number of entries (0 disables the cache)
+            ttl: Seconds before an entry expires (0 means entries never expire)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the model has been reloaded."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and counters as a JSON-ready dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,302 @@
+"""
+Vectorized cosine similarity search over a word vector vocabulary.
+
+The vocabulary matrix is normalized to unit length once, so cosine similarity
+against every word reduces to a single matrix-vector product. The top matches
+are then selected with np.argpartition instead of sorting the full vocabulary.
+"""
+
+import numpy as np
+from quantization import QuantizedMatrix
+from metrics import NULL_TIMER
+
+ANALOGY_METHODS = ('3cosadd', '3cosmul')
+# Keeps 3CosMul finite when a negative word is diametrically opposed to a candidate
+COSMUL_EPSILON = 1e-6
+
+
+def normalize_rows(vectors):
+    """Return a float32 copy of vectors with every row scaled to unit length.
+
+    Rows with zero magnitude are left as zeros, so they score 0 against any
+    query (matching the behaviour of the original cosine_similarity helper).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def cancels_out(positive, negative):
+    """True if the negative words are exactly the positive ones, leaving no direction to search."""
+    return sorted(positive) == sorted(negative)
+
+
+class SimilarityEngine:
+    """Answer top-k cosine similarity queries against a fixed vocabulary."""
+
+    def __init__(self, words, vectors, normalized=False, key_to_index=None):
+        """
+        Build the engine from a vocabulary and its vectors.
+
+        Args:
+            words: List of words, in the same order as the rows of vectors
+            vectors: Array of shape (len(words), dimensions)
+            normalized: True if vectors are already unit-length float32 rows;
+                they are then used as-is (e.g. a memory-mapped store) without a copy
+            key_to_index: Optional existing word -> row mapping to share
+        """
+        self.words = words if isinstance(words, list) else list(words)
+        if key_to_index is None:
+            key_to_index = {word: i for i, word in enumerate(self.words)}
+        self.key_to_index = key_to_index
+        self.vectors = vectors if normalized else normalize_rows(vectors)
+        # Optional approximate index (see ann_index.py); None means exact search
+        self.index = None
+        self.nprobe = 1
+        # Set by quantize(): float32 rows kept for re-ranking, and how many candidates to re-rank
+        self.exact_vectors = None
+        self.rerank = 0
+
+    @classmethod
+    def from_keyed_vectors(cls, model):
+        """Build an engine from a gensim KeyedVectors model."""
+        return cls(model.index_to_key, model.vectors, key_to_index=model.key_to_index)
+
+    @classmethod
+    def from_store(cls, store):
+        """Build an engine over a memory-mapped VectorStore without copying it."""
+        return cls(store.index_to_key, store.vectors, normalized=True,
+                   key_to_index=store.key_to_index)
+
+    def use_index(self, index, nprobe):
+        """
+        Answer queries with an approximate index instead of a full scan.
+
+        Args:
+            index: An IVFIndex built from self.vectors, or None for exact search
+            nprobe: Number of inverted lists to scan per query
+        """
+        self.index = index
+        self.nprobe = nprobe
+
+    def quantize(self, dtype, rerank=0):
+        """
+        Store the matrix as float16 or int8 (with per-row scales) and search it directly.
+
+        Args:
+            dtype: 'float16' or 'int8'; 'float32' leaves the engine unchanged
+            rerank: If > 0, keep the float32 matrix and re-score this many of the
+                best quantized candidates exactly. Only the candidate rows are read,
+                so a memory-mapped store stays mostly on disk. Analogy queries
+                always use the quantized scores.
+        """
+        if dtype == 'float32':
+            return
+        self.exact_vectors = self.vectors if rerank > 0 else None
+        self.rerank = rerank
+        self.vectors = QuantizedMatrix.quantize(self.vectors, dtype)
+
+    def _rerank(self, indices, index, topn):
+        """Re-score quantized candidates for the word at index with the float32 rows."""
+        # Vocabulary order first, so ties keep frequency order like the exact scan
+        indices = np.sort(indices)
+        exact = self.exact_vectors[indices] @ self.exact_vectors[index]
+        order = np.argsort(-exact, kind='stable')[:topn]
+        return indices[order], exact[order]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.key_to_index
+
+    def top_k(self, scores, topn, exclude=None):
+        """
+        Return (indices, scores) of the topn highest scores, best first.
+
+        Args:
+            scores: 1-D array of similarity scores, one per vocabulary word.
+                Modified in place when exclude is given.
+            topn: Number of results to return
+            exclude: Optional vocabulary index, or list of indices, to leave out of the results
+        """
+        available = len(scores)
+        if exclude is not None:
+            exclude = np.unique(exclude)
+            scores[exclude] = -np.inf
+            available -= len(exclude)
+        topn = min(topn, available)
+        if topn <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if topn < len(scores):
+            candidates = np.argpartition(scores, -topn)[-topn:]
+        else:
+            candidates = np.arange(len(scores))
+        # Stable sort on the negated scores so ties keep vocabulary (frequency) order
+        candidates.sort()
+        order = np.argsort(-scores[candidates], kind='stable')
+        indices = candidates[order]
+        return indices, scores[indices]
+
+    def _format(self, indices, scores):
+        """Convert top_k output into the JSON-ready result list."""
+        return [
+            {'word': self.words[i], 'similarity': float(score)}
+            for i, score in zip(indices.tolist(), scores.tolist())
+        ]
+
+    def most_similar(self, word, topn=10, timer=NULL_TIMER):
+        """
+        Find the topn words most similar to word, excluding word itself.
+
+        Args:
+            word: Query word (must be in the vocabulary)
+            topn: Number of results
+            timer: Optional metrics.StageTimer; the scoring pass is recorded as
+                'similarity' and selecting and formatting the results as 'topk'
+                (an IVF search does both in its 'similarity' stage)
+
+        Returns:
+            List of {'word': ..., 'similarity': ...} dicts, most similar first
+        """
+        index = self.key_to_index[word]
+        query = self.vectors[index]
+        candidates = max(topn, self.rerank) if self.exact_vectors is not None else topn
+        if self.index is not None:
+            with timer.stage('similarity'):
+                indices, best = self.index.search(self.vectors, query, candidates, self.nprobe, exclude=index)
+        else:
+            with timer.stage('similarity'):
+                scores = self.vectors @ query
+            with timer.stage('topk'):
+                indices, best = self.top_k(scores, candidates, exclude=index)
+        with timer.stage('topk'):
+            if self.exact_vectors is not None:
+                indices, best = self._rerank(indices, index, topn)
+            return self._format(indices, best)
+
+    def most_similar_batch(self, words, topn=10, block_size=256):
+        """
+        Find the topn most similar words for many query words at once.
+
+        Queries are processed in blocks of block_size rows, each answered with
+        one matrix-matrix product, so memory stays bounded at
+        block_size x vocabulary scores however long the batch is.
+
+        Args:
+            words: List of query words
+            topn: Number of results per query word
+            block_size: Number of query words per matrix-matrix product
+
+        Returns:
+            List aligned with words: a result list (as from most_similar) for
+            each word in the vocabulary, or None for words that are not
+        """
+        if self.index is not None:
+            # The approximate index only scans a few lists per query, so there
+            # is no shared matrix product to batch
+            return [self.most_similar(word, topn) if word in self.key_to_index else None
+                    for word in words]
+
+        results = [None] * len(words)
+        found = [(position, self.key_to_index[word])
+                 for position, word in enumerate(words)
+                 if word in self.key_to_index]
+
+        for start in range(0, len(found), block_size):
+            block = found[start:start + block_size]
+            indices = np.array([index for _, index in block])
+            scores = self.vectors[indices] @ self.vectors.T
+            candidates = max(topn, self.rerank) if self.exact_vectors is not None else topn
+            for row, (position, index) in enumerate(block):
+                best_indices, best = self.top_k(scores[row], candidates, exclude=index)
+                if self.exact_vectors is not None:
+                    best_indices, best = self._rerank(best_indices, index, topn)
+                results[position] = self._format(best_indices, best)
+        return results
+
+    def analogy(self, positive, negative=(), topn=10, method='3cosadd'):
+        """
+        Answer a vector arithmetic query such as king - man + woman.
+
+        Args:
+            positive: Words that contribute positively (e.g. ['king', 'woman'])
+            negative: Words that contribute negatively (e.g. ['man'])
+            topn: Number of results
+            method: '3cosadd' scores candidates by cosine similarity with the
+                normalized sum of the inputs; '3cosmul' multiplies their
+                shifted similarities (Levy & Goldberg, 2014)
+
+        Returns:
+            List of {'word': ..., 'similarity': ...} dicts, best first, with
+            the input words excluded
+
+        Raises:
+            KeyError: If any word is not in the vocabulary
+            ValueError: If the negative words cancel out the positive ones
+        """
+        missing = [word for word in list(positive) + list(negative) if word not in self.key_to_index]
+        if missing:
+            raise KeyError(missing[0])
+        if cancels_out(positive, negative):
+            raise ValueError("The negative words cancel out the positive ones")
+        return self.analogy_batch([(positive, negative)], topn=topn, method=method)[0]
+
+    def analogy_batch(self, queries, topn=10, method='3cosadd', restrict_vocab=None, block_size=256):
+        """
+        Answer many analogy queries with blocked matrix-matrix products.
+
+        Args:
+            queries: List of (positive, negative) word lists
+            topn: Number of results per query
+            method: '3cosadd' or '3cosmul' (see analogy)
+            restrict_vocab: Only consider the first restrict_vocab words
+                (the most frequent ones) as answers
+            block_size: Number of queries scored per matrix-matrix product
+
+        Returns:
+            List aligned with queries: a result list for each query, or None
+            if a word is missing, there are no positive words or the words
+            cancel out
+        """
+        if method not in ANALOGY_METHODS:
+            raise ValueError(f"Unknown analogy method: {method} (expected one of {ANALOGY_METHODS})")
+        candidates = self.vectors[:restrict_vocab] if restrict_vocab else self.vectors
+
+        results = [None] * len(queries)
+        found = []
+        for position, (positive, negative) in enumerate(queries):
+            words = list(positive) + list(negative)
+            if (positive and not cancels_out(positive, negative)
+                    and all(word in self.key_to_index for word in words)):
+                found.append((position,
+                              [self.key_to_index[word] for word in positive],
+                              [self.key_to_index[word] for word in negative]))
+
+        for start in range(0, len(found), block_size):
+            block = found[start:start + block_size]
+            if method == '3cosadd':
+                # Inputs are unit vectors, so this is the sum of their directions
+                queries_matrix = np.stack([
+                    self.vectors[positive].sum(axis=0) - self.vectors[negative].sum(axis=0)
+                    for _, positive, negative in block
+                ])
+                scores = normalize_rows(queries_matrix) @ candidates.T
+            else:
+                # One product for every input word in the block, shifted to [0, 1]
+                inputs = np.unique(np.concatenate([positive + negative for _, positive, negative in block]))
+                row_of = {index: row for row, index in enumerate(inputs.tolist())}
+                similarities = (self.vectors[inputs] @ candidates.T + 1) / 2
+                scores = np.empty((len(block), len(candidates)), dtype=np.float32)
+                for row, (_, positive, negative) in enumerate(block):
+                    scores[row] = similarities[[row_of[i] for i in positive]].prod(axis=0)
+                    if negative:
+                        scores[row] /= similarities[[row_of[i] for i in negative]].prod(axis=0) + COSMUL_EPSILON
+
+            for row, (position, positive, negative) in enumerate(block):
+                exclude = [i for i in positive + negative if i < len(candidates)]
+                best_indices, best = self.top_k(scores[row], topn, exclude=exclude or None)
+                results[position] = self._format(best_indices, best)
+        return results
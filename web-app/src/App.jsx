@@ -1,5 +1,4 @@
 import { useState, useRef } from 'react'
-import wordVectors from './word_vectors.json'
 import DotProductDisplay from './components/DotProductDisplay'
 import SimilarityChart from './components/SimilarityChart'
 import About from './components/About'
@@ -7,6 +6,7 @@ import VectorTooltip from './components/tooltips/VectorTooltip'
 import WordSuggestions from './components/WordSuggestions'
 import AllWordsTable from './components/AllWordsTable'
 import { useWordSearch } from './hooks/useWordSearch'
+import { useWordData } from './hooks/useWordData'
 import './App.css'
 
 function App() {
@@ -14,7 +14,13 @@ function App() {
   const [hasSuggestions, setHasSuggestions] = useState(false)
   const inputRef = useRef(null)
 
-  const { results, error, selectedWord, setSelectedWord } = useWordSearch(word, wordVectors, hasSuggestions)
+  const { wordVectors, neighborTable, loading, loadError } = useWordData()
+  // Precomputed neighbours when the table loaded; otherwise search in a Web Worker so typing
+  // stays responsive (synchronous where workers are unavailable)
+  const { results, error, selectedWord, setSelectedWord } = useWordSearch(word, wordVectors, hasSuggestions, {
+    useWorker: true,
+    neighborTable
+  })
 
   const handleWordSelect = (word) => {
     setSelectedWord(word)
@@ -29,7 +35,14 @@ function App() {
       <div className={showRightPanel ? 'left-content' : ''}>
         <h1>Word2Vec Similarity Search</h1>
         <p>Find the 10 most similar words using cosine similarity</p>
-        <p className="info">Searching {wordVectors.words.length} words from the database</p>
+        <p className="info">
+          {loading ? 'Loading word vectors...' : `Searching ${wordVectors.words.length} words from the database`}
+        </p>
+        {loadError && (
+          <div className="error">
+            <strong>Error:</strong> {loadError}
+          </div>
+        )}
 
         <div className="form-group">
           <label htmlFor="word-input">Enter a word:</label>
@@ -53,7 +66,7 @@ function App() {
           </div>
         </div>
 
-        {error && (
+        {error && !loading && (
           <div className="error-section">
             <div className="error">
               <strong>Error:</strong> {error}
@@ -0,0 +1,66 @@
+import { useState, useEffect } from 'react'
+import { loadBinaryVectors } from '../utils/binaryVectors'
+import { loadNeighborTable } from '../utils/neighborTable'
+
+// Packed vectors written by `csv_to_json.py --format binary` into public/vectors
+export const VECTORS_URL = `${import.meta.env.BASE_URL}vectors/top_1000.meta.json`
+// Precomputed neighbours written by `neighbor_table.py` next to them
+export const NEIGHBORS_URL = `${import.meta.env.BASE_URL}vectors/top_1000.neighbors.json`
+
+const EMPTY_VECTORS = { words: [], vectors: [] }
+
+// The JSON bundle is its own chunk, fetched only when the binary files cannot be loaded
+const loadJsonVectors = () => import('../word_vectors.json').then((module) => module.default)
+
+const sameWords = (a, b) => a.length === b.length && a.every((word, i) => word === b[i])
+
+/**
+ * Load the word vector database, and its neighbour table when there is one, outside the main bundle
+ * @param {Object} [options]
+ * @param {string} [options.vectorsUrl] - URL of the binary .meta.json file
+ * @param {string|null} [options.neighborsUrl] - URL of the .neighbors.json manifest (null to skip)
+ * @param {Function} [options.loadVectors] - Loader for vectorsUrl (defaults to loadBinaryVectors)
+ * @param {Function} [options.loadFallback] - Loader used when loadVectors fails
+ * @param {Function} [options.loadNeighbors] - Loader for neighborsUrl (defaults to loadNeighborTable)
+ * @returns {{wordVectors: Object, neighborTable: Object|null, loading: boolean, loadError: string}}
+ */
+export function useWordData({
+  vectorsUrl = VECTORS_URL,
+  neighborsUrl = NEIGHBORS_URL,
+  loadVectors = loadBinaryVectors,
+  loadFallback = loadJsonVectors,
+  loadNeighbors = loadNeighborTable
+} = {}) {
+  const [wordVectors, setWordVectors] = useState(EMPTY_VECTORS)
+  const [neighborTable, setNeighborTable] = useState(null)
+  const [loading, setLoading] = useState(true)
+  const [loadError, setLoadError] = useState('')
+
+  useEffect(() => {
+    let cancelled = false
+
+    const vectorsPromise = loadVectors(vectorsUrl).catch(() => loadFallback())
+    // The table is optional: without it, searches are computed from the vectors
+    const tablePromise = neighborsUrl ? loadNeighbors(neighborsUrl).catch(() => null) : Promise.resolve(null)
+
+    Promise.all([vectorsPromise, tablePromise])
+      .then(([vectors, table]) => {
+        if (cancelled) return
+        setWordVectors(vectors)
+        // A table built for another vocabulary would return the wrong neighbours
+        setNeighborTable(table && sameWords(table.words, vectors.words) ? table : null)
+      })
+      .catch((err) => {
+        if (!cancelled) setLoadError(`Could not load word vectors: ${err.message}`)
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false)
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [vectorsUrl, neighborsUrl, loadVectors, loadFallback, loadNeighbors])
+
+  return { wordVectors, neighborTable, loading, loadError }
+}
@@ -0,0 +1,80 @@
+import { describe, it, expect, vi } from 'vitest'
+import { renderHook, waitFor } from '@testing-library/react'
+import { useWordData } from './useWordData'
+
+describe('useWordData', () => {
+  const binaryVectors = { words: ['king', 'queen'], vectors: [new Float32Array([1, 0]), new Float32Array([0, 1])] }
+  const jsonVectors = { words: ['king'], vectors: [[1, 0]] }
+  const table = { words: ['king', 'queen'], k: 1 }
+  const noTable = () => Promise.reject(new Error('404'))
+
+  it('starts empty while loading', () => {
+    const loadVectors = () => new Promise(() => {})
+    const { result } = renderHook(() => useWordData({ loadVectors, loadNeighbors: noTable }))
+
+    expect(result.current.loading).toBe(true)
+    expect(result.current.wordVectors.words).toEqual([])
+  })
+
+  it('loads the binary vectors', async () => {
+    const loadVectors = vi.fn().mockResolvedValue(binaryVectors)
+    const loadFallback = vi.fn()
+    const { result } = renderHook(() => useWordData({ vectorsUrl: '/v/top.meta.json', loadVectors, loadFallback, loadNeighbors: noTable }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(loadVectors).toHaveBeenCalledWith('/v/top.meta.json')
+    expect(loadFallback).not.toHaveBeenCalled()
+    expect(result.current.wordVectors).toBe(binaryVectors)
+    expect(result.current.neighborTable).toBe(null)
+    expect(result.current.loadError).toBe('')
+  })
+
+  it('loads the neighbour table alongside the vectors', async () => {
+    const loadVectors = vi.fn().mockResolvedValue(binaryVectors)
+    const loadNeighbors = vi.fn().mockResolvedValue(table)
+    const { result } = renderHook(() => useWordData({ neighborsUrl: '/v/top.neighbors.json', loadVectors, loadNeighbors }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(loadNeighbors).toHaveBeenCalledWith('/v/top.neighbors.json')
+    expect(result.current.neighborTable).toBe(table)
+  })
+
+  it('ignores a neighbour table built for other words', async () => {
+    const loadVectors = vi.fn().mockResolvedValue(binaryVectors)
+    const loadNeighbors = vi.fn().mockResolvedValue({ words: ['king', 'prince'], k: 1 })
+    const { result } = renderHook(() => useWordData({ loadVectors, loadNeighbors }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(result.current.neighborTable).toBe(null)
+    expect(result.current.wordVectors).toBe(binaryVectors)
+  })
+
+  it('skips the neighbour table when neighborsUrl is null', async () => {
+    const loadVectors = vi.fn().mockResolvedValue(binaryVectors)
+    const loadNeighbors = vi.fn()
+    const { result } = renderHook(() => useWordData({ neighborsUrl: null, loadVectors, loadNeighbors }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(loadNeighbors).not.toHaveBeenCalled()
+    expect(result.current.neighborTable).toBe(null)
+  })
+
+  it('falls back to the JSON vectors when the binary files fail to load', async () => {
+    const loadVectors = vi.fn().mockRejectedValue(new Error('404'))
+    const loadFallback = vi.fn().mockResolvedValue(jsonVectors)
+    const { result } = renderHook(() => useWordData({ loadVectors, loadFallback, loadNeighbors: noTable }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(result.current.wordVectors).toBe(jsonVectors)
+  })
+
+  it('reports an error when nothing can be loaded', async () => {
+    const loadVectors = vi.fn().mockRejectedValue(new Error('404'))
+    const loadFallback = vi.fn().mockRejectedValue(new Error('offline'))
+    const { result } = renderHook(() => useWordData({ loadVectors, loadFallback, loadNeighbors: noTable }))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+    expect(result.current.loadError).toBe('Could not load word vectors: offline')
+    expect(result.current.wordVectors.words).toEqual([])
+  })
+})
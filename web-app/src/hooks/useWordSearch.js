@@ -1,25 +1,40 @@
-import { useState, useEffect } from 'react'
-import { cosineSimilarity } from '../utils/cosineSimilarity'
+import { useState, useEffect, useMemo, useRef } from 'react'
+import { buildSearchIndex, searchWord } from '../utils/vectorSearch'
+import { canUseWorker, createSearchWorker } from '../utils/searchWorkerClient'
+import { lookupNeighbors } from '../utils/neighborTable'
 
-export function useWordSearch(word, wordVectors, hasSuggestions) {
+export function useWordSearch(word, wordVectors, hasSuggestions, { useWorker = false, neighborTable = null } = {}) {
   const [results, setResults] = useState([])
   const [error, setError] = useState('')
   const [selectedWord, setSelectedWord] = useState(null)
+  // A neighbour table with at least 10 neighbours answers every search itself,
+  // so the vectors are then neither packed nor sent to a worker
+  const tableServes = Boolean(neighborTable && neighborTable.k >= 10)
+  const workerEnabled = useWorker && !tableServes && canUseWorker()
 
-  // Search as you type with debounce
+  // Pack the vectors once per database; the worker builds its own copy
+  const searchIndex = useMemo(
+    () => (workerEnabled || tableServes ? null : buildSearchIndex(wordVectors)),
+    [workerEnabled, tableServes, wordVectors]
+  )
+
+  const workerRef = useRef(null)
   useEffect(() => {
-    const timeoutId = setTimeout(() => {
-      if (!word.trim()) {
-        setError('')
-        setResults([])
-        setSelectedWord(null)
-        return
-      }
+    if (!workerEnabled) return
+    const client = createSearchWorker(wordVectors)
+    workerRef.current = client
+    return () => {
+      client.terminate()
+      workerRef.current = null
+    }
+  }, [workerEnabled, wordVectors])
 
-      const trimmedWord = word.trim().toLowerCase()
-      const wordIndex = wordVectors.words.findIndex(w => w.toLowerCase() === trimmedWord)
+  // Search as you type with debounce
+  useEffect(() => {
+    let cancelled = false
 
-      if (wordIndex === -1) {
+    const showResults = (trimmedWord, { found, results: matches }) => {
+      if (!found) {
         // Only show error if there are no suggestions available
         if (!hasSuggestions) {
           setError(`Word "${trimmedWord}" not found in database`)
@@ -31,32 +46,38 @@ export function useWordSearch(word, wordVectors, hasSuggestions) {
       }
 
       setError('')
-      
-      // Get the input word's vector
-      const inputVector = wordVectors.vectors[wordIndex]
+      setResults(matches)
+      setSelectedWord(null) // Reset selection when search changes
+    }
 
-      // Calculate similarity with all words
-      const similarities = []
-      for (let i = 0; i < wordVectors.words.length; i++) {
-        if (i !== wordIndex) { // Exclude the input word itself
-          const similarity = cosineSimilarity(inputVector, wordVectors.vectors[i])
-          similarities.push({
-            word: wordVectors.words[i],
-            similarity: similarity
-          })
-        }
+    const timeoutId = setTimeout(() => {
+      if (!word.trim()) {
+        setError('')
+        setResults([])
+        setSelectedWord(null)
+        return
       }
 
-      // Sort by similarity (descending) and get top 10
-      similarities.sort((a, b) => b.similarity - a.similarity)
-      const top10 = similarities.slice(0, 10)
+      const trimmedWord = word.trim().toLowerCase()
 
-      setResults(top10)
-      setSelectedWord(null) // Reset selection when search changes
+      if (tableServes) {
+        // Precomputed neighbours pick the words; their similarities are recomputed
+        // from the vectors so they match the exact values shown elsewhere
+        showResults(trimmedWord, lookupNeighbors(neighborTable, trimmedWord, 10, wordVectors.vectors))
+      } else if (workerRef.current) {
+        workerRef.current.search(trimmedWord, 10).then((response) => {
+          if (!cancelled) showResults(trimmedWord, response)
+        })
+      } else {
+        showResults(trimmedWord, searchWord(searchIndex || buildSearchIndex(wordVectors), trimmedWord, 10))
+      }
     }, 300) // Wait 300ms after user stops typing
 
-    return () => clearTimeout(timeoutId)
-  }, [word, wordVectors, hasSuggestions])
+    return () => {
+      cancelled = true
+      clearTimeout(timeoutId)
+    }
+  }, [word, wordVectors, hasSuggestions, searchIndex, neighborTable, tableServes])
 
   return {
     results,
@@ -65,4 +86,3 @@ export function useWordSearch(word, wordVectors, hasSuggestions) {
     setSelectedWord
   }
 }
-
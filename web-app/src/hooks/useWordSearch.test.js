@@ -1,6 +1,18 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest'
 import { renderHook, act } from '@testing-library/react'
 import { useWordSearch } from './useWordSearch'
+import { createNeighborTable } from '../utils/neighborTable'
+import { cosineSimilarity } from '../utils/cosineSimilarity'
+import { createSearchWorker } from '../utils/searchWorkerClient'
+
+// Pretend Web Workers are available; the worker itself is never started
+vi.mock('../utils/searchWorkerClient', () => ({
+  canUseWorker: () => true,
+  createSearchWorker: vi.fn(() => ({
+    search: vi.fn(() => Promise.resolve({ found: false, results: [] })),
+    terminate: vi.fn()
+  }))
+}))
 
 describe('useWordSearch', () => {
   const mockWordVectors = {
@@ -67,4 +79,42 @@ describe('useWordSearch', () => {
     })
     expect(result.current.selectedWord).toBe(null)
   })
+
+  it('serves results from a neighbour table when given one', () => {
+    const words = Array.from({ length: 11 }, (_, i) => `w${i}`)
+    // Every word lists the other ten, in order
+    const indices = new Int32Array(words.flatMap((_, i) => words.map((_, j) => j).filter(j => j !== i)))
+    const scores = new Float32Array(indices.length).fill(0.5)
+    const neighborTable = createNeighborTable(words, indices, scores, 10)
+    const wordVectors = { words, vectors: words.map((_, i) => [1, i]) }
+
+    const { result } = renderHook(() => useWordSearch('w3', wordVectors, false, { neighborTable }))
+
+    act(() => {
+      vi.advanceTimersByTime(300)
+    })
+
+    expect(result.current.error).toBe('')
+    expect(result.current.results).toHaveLength(10)
+    // The table picks the neighbours; the similarities come from the vectors
+    expect(result.current.results[0]).toEqual({
+      word: 'w0',
+      similarity: cosineSimilarity(wordVectors.vectors[3], wordVectors.vectors[0])
+    })
+  })
+
+  it('starts a search worker only when there is no usable neighbour table', () => {
+    const words = Array.from({ length: 11 }, (_, i) => `w${i}`)
+    const indices = new Int32Array(words.flatMap((_, i) => words.map((_, j) => j).filter(j => j !== i)))
+    const neighborTable = createNeighborTable(words, indices, new Float32Array(indices.length), 10)
+    const wordVectors = { words, vectors: words.map((_, i) => [1, i]) }
+    createSearchWorker.mockClear()
+
+    renderHook(() => useWordSearch('w3', wordVectors, false, { useWorker: true, neighborTable }))
+    expect(createSearchWorker).not.toHaveBeenCalled()
+
+    renderHook(() => useWordSearch('w3', wordVectors, false, { useWorker: true }))
+    expect(createSearchWorker).toHaveBeenCalledTimes(1)
+    expect(createSearchWorker).toHaveBeenCalledWith(wordVectors)
+  })
 })
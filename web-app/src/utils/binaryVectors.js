@@ -0,0 +1,133 @@
+/**
+ * Load word vectors from the packed binary format written by
+ * `csv_to_json.py --format binary` (optionally with `--quantize int8`).
+ *
+ * The vectors arrive as one ArrayBuffer and are viewed as a Float32Array,
+ * so no JSON number parsing is needed however large the vocabulary is.
+ */
+
+/** True when typed arrays use little-endian byte order, so the files can be viewed without copying */
+export const isLittleEndian = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1
+
+/**
+ * Split the newline-separated word list
+ * @param {string} text - Contents of the .words.txt file
+ * @returns {string[]} Words in vector order
+ */
+export const parseWordList = (text) => {
+  return text.length === 0 ? [] : text.split('\n')
+}
+
+/**
+ * Read little-endian float32 values from a buffer
+ * @param {ArrayBuffer} buffer - Packed float32 data
+ * @returns {Float32Array} The values
+ */
+const readFloat32 = (buffer) => {
+  if (isLittleEndian) {
+    return new Float32Array(buffer)
+  }
+  const view = new DataView(buffer)
+  const values = new Float32Array(buffer.byteLength / 4)
+  for (let i = 0; i < values.length; i++) {
+    values[i] = view.getFloat32(i * 4, true)
+  }
+  return values
+}
+
+/**
+ * Decode the packed vector data into one contiguous Float32Array
+ * @param {ArrayBuffer} vectorBuffer - Contents of the .vectors.bin file
+ * @param {Object} meta - Parsed .meta.json ({ count, dimensions, dtype })
+ * @param {ArrayBuffer} [scaleBuffer] - Contents of the .scales.bin file (int8 only)
+ * @returns {Float32Array} count * dimensions values, row-major
+ */
+export const decodeVectors = (vectorBuffer, meta, scaleBuffer) => {
+  const { count, dimensions, dtype } = meta
+  if (dtype === 'float32') {
+    const data = readFloat32(vectorBuffer)
+    if (data.length !== count * dimensions) {
+      throw new Error(`Expected ${count * dimensions} float32 values, got ${data.length}`)
+    }
+    return data
+  }
+
+  if (dtype === 'int8') {
+    const codes = new Int8Array(vectorBuffer)
+    const scales = readFloat32(scaleBuffer)
+    if (codes.length !== count * dimensions || scales.length !== count) {
+      throw new Error('Quantized vector data does not match the metadata')
+    }
+    const data = new Float32Array(codes.length)
+    for (let row = 0; row < count; row++) {
+      const scale = scales[row]
+      const offset = row * dimensions
+      for (let d = 0; d < dimensions; d++) {
+        data[offset + d] = codes[offset + d] * scale
+      }
+    }
+    return data
+  }
+
+  throw new Error(`Unsupported vector dtype: ${dtype}`)
+}
+
+/**
+ * Build the { words, vectors } shape the app uses, with each vector a
+ * Float32Array view into the shared data (no copies)
+ * @param {string[]} words - Words in vector order
+ * @param {Float32Array} data - count * dimensions values, row-major
+ * @param {number} dimensions - Values per vector
+ * @param {Float32Array} [invNorms] - Precomputed 1/|vector| per word
+ * @returns {Object} { words, vectors, data, dimensions, invNorms }
+ */
+export const toWordVectors = (words, data, dimensions, invNorms) => {
+  const vectors = new Array(words.length)
+  for (let i = 0; i < words.length; i++) {
+    vectors[i] = data.subarray(i * dimensions, (i + 1) * dimensions)
+  }
+  return invNorms ? { words, vectors, data, dimensions, invNorms } : { words, vectors, data, dimensions }
+}
+
+/**
+ * Fetch a URL and fail on an HTTP error status
+ * @param {string} url - The URL to fetch
+ * @param {Function} fetchFn - fetch implementation
+ * @returns {Promise<Response>} The successful response
+ */
+export const fetchOk = async (url, fetchFn) => {
+  const response = await fetchFn(url)
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`)
+  }
+  return response
+}
+
+/**
+ * Fetch and decode a packed binary word vector set
+ * @param {string} metaUrl - URL of the .meta.json file; the other files are resolved next to it
+ * @param {Function} [fetchFn] - fetch implementation (defaults to the global fetch)
+ * @returns {Promise<Object>} { words, vectors, data, dimensions, invNorms }
+ */
+export const loadBinaryVectors = async (metaUrl, fetchFn = fetch) => {
+  const baseUrl = metaUrl.slice(0, metaUrl.lastIndexOf('/') + 1)
+  const meta = await (await fetchOk(metaUrl, fetchFn)).json()
+
+  const [wordsText, vectorBuffer, scaleBuffer, normBuffer] = await Promise.all([
+    fetchOk(baseUrl + meta.words, fetchFn).then(r => r.text()),
+    fetchOk(baseUrl + meta.vectors, fetchFn).then(r => r.arrayBuffer()),
+    meta.scales ? fetchOk(baseUrl + meta.scales, fetchFn).then(r => r.arrayBuffer()) : undefined,
+    meta.inv_norms ? fetchOk(baseUrl + meta.inv_norms, fetchFn).then(r => r.arrayBuffer()) : undefined
+  ])
+
+  const words = parseWordList(wordsText)
+  if (words.length !== meta.count) {
+    throw new Error(`Expected ${meta.count} words, got ${words.length}`)
+  }
+  const data = decodeVectors(vectorBuffer, meta, scaleBuffer)
+  const invNorms = normBuffer ? readFloat32(normBuffer) : undefined
+  if (invNorms && invNorms.length !== meta.count) {
+    throw new Error(`Expected ${meta.count} inverse norms, got ${invNorms.length}`)
+  }
+  return toWordVectors(words, data, meta.dimensions, invNorms)
+}
@@ -0,0 +1,106 @@
+import { describe, it, expect, vi } from 'vitest'
+import { parseWordList, decodeVectors, toWordVectors, loadBinaryVectors, fetchOk } from './binaryVectors'
+
+const float32Buffer = (values) => new Float32Array(values).buffer
+
+const mockResponse = (body) => ({
+  ok: true,
+  status: 200,
+  json: async () => body,
+  text: async () => body,
+  arrayBuffer: async () => body
+})
+
+describe('parseWordList', () => {
+  it('splits words on newlines', () => {
+    expect(parseWordList('king\nqueen\nprince')).toEqual(['king', 'queen', 'prince'])
+  })
+
+  it('returns an empty list for an empty file', () => {
+    expect(parseWordList('')).toEqual([])
+  })
+})
+
+describe('decodeVectors', () => {
+  it('reads float32 data as-is', () => {
+    const meta = { count: 2, dimensions: 2, dtype: 'float32' }
+    const data = decodeVectors(float32Buffer([1, 2, 3, 4]), meta)
+    expect(Array.from(data)).toEqual([1, 2, 3, 4])
+  })
+
+  it('dequantizes int8 codes with per-vector scales', () => {
+    const meta = { count: 2, dimensions: 2, dtype: 'int8' }
+    const codes = new Int8Array([127, -127, 10, 0]).buffer
+    const data = decodeVectors(codes, meta, float32Buffer([0.5, 2]))
+    expect(data[0]).toBeCloseTo(63.5)
+    expect(data[1]).toBeCloseTo(-63.5)
+    expect(data[2]).toBeCloseTo(20)
+    expect(data[3]).toBe(0)
+  })
+
+  it('throws when the data does not match the metadata', () => {
+    const meta = { count: 3, dimensions: 2, dtype: 'float32' }
+    expect(() => decodeVectors(float32Buffer([1, 2]), meta)).toThrow()
+  })
+
+  it('throws on an unknown dtype', () => {
+    const meta = { count: 1, dimensions: 1, dtype: 'float64' }
+    expect(() => decodeVectors(float32Buffer([1]), meta)).toThrow('Unsupported vector dtype')
+  })
+})
+
+describe('toWordVectors', () => {
+  it('exposes each vector as a view into the shared data', () => {
+    const data = new Float32Array([1, 2, 3, 4, 5, 6])
+    const result = toWordVectors(['a', 'b'], data, 3)
+    expect(Array.from(result.vectors[1])).toEqual([4, 5, 6])
+    data[3] = 9
+    expect(result.vectors[1][0]).toBe(9)
+  })
+})
+
+describe('loadBinaryVectors', () => {
+  it('fetches the metadata, words and vectors relative to the metadata URL', async () => {
+    const files = {
+      '/data/top.meta.json': { count: 2, dimensions: 2, dtype: 'float32', words: 'top.words.txt', vectors: 'top.vectors.bin' },
+      '/data/top.words.txt': 'king\nqueen',
+      '/data/top.vectors.bin': float32Buffer([1, 0, 0, 1])
+    }
+    const fetchFn = vi.fn(async (url) => mockResponse(files[url]))
+
+    const result = await loadBinaryVectors('/data/top.meta.json', fetchFn)
+
+    expect(fetchFn).toHaveBeenCalledTimes(3)
+    expect(result.words).toEqual(['king', 'queen'])
+    expect(result.dimensions).toBe(2)
+    expect(Array.from(result.vectors[1])).toEqual([0, 1])
+  })
+
+  it('loads the inverse norm table when the metadata lists one', async () => {
+    const files = {
+      '/data/top.meta.json': { count: 2, dimensions: 2, dtype: 'float32', words: 'top.words.txt', vectors: 'top.vectors.bin', inv_norms: 'top.inv_norms.bin' },
+      '/data/top.words.txt': 'king\nqueen',
+      '/data/top.vectors.bin': float32Buffer([2, 0, 0, 4]),
+      '/data/top.inv_norms.bin': float32Buffer([0.5, 0.25])
+    }
+    const fetchFn = vi.fn(async (url) => mockResponse(files[url]))
+
+    const result = await loadBinaryVectors('/data/top.meta.json', fetchFn)
+
+    expect(fetchFn).toHaveBeenCalledTimes(4)
+    expect(Array.from(result.invNorms)).toEqual([0.5, 0.25])
+  })
+
+  it('rejects when a file fails to load', async () => {
+    const fetchFn = vi.fn(async () => ({ ok: false, status: 404 }))
+    await expect(loadBinaryVectors('/data/top.meta.json', fetchFn)).rejects.toThrow('404')
+  })
+})
+
+describe('fetchOk', () => {
+  it('returns successful responses and rejects HTTP errors', async () => {
+    const ok = { ok: true, status: 200 }
+    await expect(fetchOk('/a', async () => ok)).resolves.toBe(ok)
+    await expect(fetchOk('/b', async () => ({ ok: false, status: 500 }))).rejects.toThrow('Failed to load /b: 500')
+  })
+})
@@ -0,0 +1,146 @@
+/**
+ * Load and query a precomputed neighbour table written by `neighbor_table.py`.
+ *
+ * The table stores the top k neighbours of every word as int32 word indices
+ * and float16 similarities, so a search is a row lookup with no similarity
+ * search. Pass the vectors to the lookup to recompute the k similarities
+ * exactly; the float16 scores are only accurate to about 3e-4.
+ */
+
+import { fetchOk, isLittleEndian, parseWordList } from './binaryVectors'
+import { cosineSimilarity } from './cosineSimilarity'
+
+/**
+ * Convert one IEEE 754 half-precision value to a number
+ * @param {number} bits - The 16-bit pattern
+ * @returns {number} The value
+ */
+export const float16ToNumber = (bits) => {
+  const sign = bits & 0x8000 ? -1 : 1
+  const exponent = (bits >> 10) & 0x1f
+  const fraction = bits & 0x03ff
+  if (exponent === 0) {
+    return sign * fraction * 2 ** -24 // Subnormal (or zero)
+  }
+  if (exponent === 0x1f) {
+    return fraction ? NaN : sign * Infinity
+  }
+  return sign * (1 + fraction / 1024) * 2 ** (exponent - 15)
+}
+
+/**
+ * Decode little-endian float16 data
+ * @param {ArrayBuffer} buffer - Packed float16 values
+ * @returns {Float32Array} The values
+ */
+export const decodeFloat16 = (buffer) => {
+  const view = new DataView(buffer)
+  const values = new Float32Array(buffer.byteLength / 2)
+  for (let i = 0; i < values.length; i++) {
+    values[i] = float16ToNumber(view.getUint16(i * 2, true))
+  }
+  return values
+}
+
+/**
+ * Read little-endian int32 data
+ * @param {ArrayBuffer} buffer - Packed int32 values
+ * @returns {Int32Array} The values
+ */
+const readInt32 = (buffer) => {
+  if (isLittleEndian) {
+    return new Int32Array(buffer)
+  }
+  const view = new DataView(buffer)
+  const values = new Int32Array(buffer.byteLength / 4)
+  for (let i = 0; i < values.length; i++) {
+    values[i] = view.getInt32(i * 4, true)
+  }
+  return values
+}
+
+/**
+ * Build a neighbour table from its decoded parts
+ * @param {string[]} words - Words in table order
+ * @param {Int32Array} indices - count * k neighbour indices, row-major
+ * @param {Float32Array} scores - count * k similarities, row-major
+ * @param {number} k - Neighbours per word
+ * @returns {Object} { words, indices, scores, k, lookup }
+ */
+export const createNeighborTable = (words, indices, scores, k) => {
+  if (indices.length !== words.length * k || scores.length !== words.length * k) {
+    throw new Error('Neighbour data does not match the word count')
+  }
+  const lookup = new Map()
+  for (let i = 0; i < words.length; i++) {
+    const key = words[i].toLowerCase()
+    if (!lookup.has(key)) {
+      lookup.set(key, i)
+    }
+  }
+  return { words, indices, scores, k, lookup }
+}
+
+/**
+ * Get the precomputed neighbours of the word at wordIndex
+ * @param {Object} table - Table from createNeighborTable or loadNeighborTable
+ * @param {number} wordIndex - Row in the table
+ * @param {number} topN - Number of neighbours (at most k)
+ * @param {Array} [vectors] - Vectors in table order; when given, each similarity is
+ *   recomputed exactly from them instead of read from the float16 scores
+ * @returns {Array<{word: string, similarity: number}>} Most similar first
+ */
+export const getNeighbors = (table, wordIndex, topN = 10, vectors = null) => {
+  const count = Math.min(topN, table.k)
+  const offset = wordIndex * table.k
+  const results = []
+  for (let j = 0; j < count; j++) {
+    const neighborIndex = table.indices[offset + j]
+    results.push({
+      word: table.words[neighborIndex],
+      similarity: vectors
+        ? cosineSimilarity(vectors[wordIndex], vectors[neighborIndex])
+        : table.scores[offset + j]
+    })
+  }
+  return results
+}
+
+/**
+ * Look up a word (case-insensitively) and return its neighbours
+ * @param {Object} table - Neighbour table
+ * @param {string} word - The query word
+ * @param {number} topN - Number of neighbours (at most k)
+ * @param {Array} [vectors] - Vectors in table order, to recompute the similarities exactly
+ * @returns {{found: boolean, results: Array<{word: string, similarity: number}>}}
+ */
+export const lookupNeighbors = (table, word, topN = 10, vectors = null) => {
+  const wordIndex = table.lookup.get(word.trim().toLowerCase())
+  if (wordIndex === undefined) {
+    return { found: false, results: [] }
+  }
+  return { found: true, results: getNeighbors(table, wordIndex, topN, vectors) }
+}
+
+/**
+ * Fetch and decode a neighbour table
+ * @param {string} manifestUrl - URL of the .neighbors.json file; the other files are resolved next to it
+ * @param {Function} [fetchFn] - fetch implementation (defaults to the global fetch)
+ * @returns {Promise<Object>} { words, indices, scores, k, lookup }
+ */
+export const loadNeighborTable = async (manifestUrl, fetchFn = fetch) => {
+  const baseUrl = manifestUrl.slice(0, manifestUrl.lastIndexOf('/') + 1)
+  const manifest = await (await fetchOk(manifestUrl, fetchFn)).json()
+
+  const [wordsText, indexBuffer, scoreBuffer] = await Promise.all([
+    fetchOk(baseUrl + manifest.words, fetchFn).then(r => r.text()),
+    fetchOk(baseUrl + manifest.indices, fetchFn).then(r => r.arrayBuffer()),
+    fetchOk(baseUrl + manifest.scores, fetchFn).then(r => r.arrayBuffer())
+  ])
+
+  const words = parseWordList(wordsText)
+  if (words.length !== manifest.count) {
+    throw new Error(`Expected ${manifest.count} words, got ${words.length}`)
+  }
+  return createNeighborTable(words, readInt32(indexBuffer), decodeFloat16(scoreBuffer), manifest.k)
+}
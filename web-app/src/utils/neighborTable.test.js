@@ -0,0 +1,99 @@
+import { describe, it, expect, vi } from 'vitest'
+import {
+  float16ToNumber,
+  decodeFloat16,
+  createNeighborTable,
+  getNeighbors,
+  lookupNeighbors,
+  loadNeighborTable
+} from './neighborTable'
+
+const float16Buffer = (bitPatterns) => new Uint16Array(bitPatterns).buffer
+
+const mockResponse = (body) => ({
+  ok: true,
+  status: 200,
+  json: async () => body,
+  text: async () => body,
+  arrayBuffer: async () => body
+})
+
+describe('float16ToNumber', () => {
+  it('decodes normal values', () => {
+    expect(float16ToNumber(0x3c00)).toBe(1)
+    expect(float16ToNumber(0xc000)).toBe(-2)
+    expect(float16ToNumber(0x3b4d)).toBeCloseTo(0.9126, 3)
+  })
+
+  it('decodes zero, subnormals and infinity', () => {
+    expect(float16ToNumber(0x0000)).toBe(0)
+    expect(float16ToNumber(0x0001)).toBe(2 ** -24)
+    expect(float16ToNumber(0x7c00)).toBe(Infinity)
+    expect(float16ToNumber(0x7e00)).toBeNaN()
+  })
+})
+
+describe('decodeFloat16', () => {
+  it('reads little-endian values', () => {
+    expect(Array.from(decodeFloat16(float16Buffer([0x3c00, 0x3800])))).toEqual([1, 0.5])
+  })
+})
+
+describe('neighbour lookups', () => {
+  // king -> queen, man; queen -> king, man; man -> king, queen
+  const table = createNeighborTable(
+    ['King', 'queen', 'man'],
+    new Int32Array([1, 2, 0, 2, 0, 1]),
+    new Float32Array([0.9, 0.5, 0.9, 0.4, 0.5, 0.4]),
+    2
+  )
+
+  it('returns a row of neighbours, most similar first', () => {
+    expect(getNeighbors(table, 0)).toEqual([
+      { word: 'queen', similarity: expect.closeTo(0.9) },
+      { word: 'man', similarity: expect.closeTo(0.5) }
+    ])
+  })
+
+  it('recomputes similarities from the vectors when given them', () => {
+    const vectors = [[1, 0], [0.6, 0.8], [0, 1]]
+    expect(getNeighbors(table, 0, 2, vectors)).toEqual([
+      { word: 'queen', similarity: expect.closeTo(0.6, 12) },
+      { word: 'man', similarity: 0 }
+    ])
+    expect(lookupNeighbors(table, 'man', 1, vectors).results).toEqual([
+      { word: 'King', similarity: 0 }
+    ])
+  })
+
+  it('limits results to k', () => {
+    expect(getNeighbors(table, 2, 10)).toHaveLength(2)
+    expect(getNeighbors(table, 2, 1).map(r => r.word)).toEqual(['King'])
+  })
+
+  it('looks words up case-insensitively', () => {
+    expect(lookupNeighbors(table, ' KING ').found).toBe(true)
+    expect(lookupNeighbors(table, 'prince')).toEqual({ found: false, results: [] })
+  })
+
+  it('rejects data that does not match the word count', () => {
+    expect(() => createNeighborTable(['a'], new Int32Array([0, 0]), new Float32Array([1]), 1)).toThrow()
+  })
+})
+
+describe('loadNeighborTable', () => {
+  it('fetches the manifest, words, indices and scores', async () => {
+    const files = {
+      '/data/top.neighbors.json': { count: 2, k: 1, words: 'top.words.txt', indices: 'top.indices.bin', scores: 'top.scores.bin' },
+      '/data/top.words.txt': 'king\nqueen',
+      '/data/top.indices.bin': new Int32Array([1, 0]).buffer,
+      '/data/top.scores.bin': float16Buffer([0x3800, 0x3800])
+    }
+    const fetchFn = vi.fn(async (url) => mockResponse(files[url]))
+
+    const table = await loadNeighborTable('/data/top.neighbors.json', fetchFn)
+
+    expect(fetchFn).toHaveBeenCalledTimes(4)
+    expect(lookupNeighbors(table, 'queen').results).toEqual([{ word: 'king', similarity: 0.5 }])
+  })
+})
@@ -0,0 +1,47 @@
+/**
+ * Promise-based client for the search Web Worker
+ */
+
+/**
+ * Whether this environment can run Web Workers
+ * @returns {boolean}
+ */
+export const canUseWorker = () => typeof Worker !== 'undefined'
+
+/**
+ * Start a search worker for a word vectors database
+ * @param {Object} wordVectors - { words, vectors } (plus optional inverse norms)
+ * @param {Function} [createWorker] - Factory returning a Worker (for testing)
+ * @returns {Object} { search(word, topN) => Promise<{found, results}>, terminate() }
+ */
+export const createSearchWorker = (
+  wordVectors,
+  createWorker = () => new Worker(new URL('../workers/searchWorker.js', import.meta.url), { type: 'module' })
+) => {
+  const worker = createWorker()
+  const pending = new Map()
+  let nextId = 0
+
+  worker.onmessage = (event) => {
+    const { id, found, results } = event.data
+    const resolve = pending.get(id)
+    if (resolve) {
+      pending.delete(id)
+      resolve({ found, results })
+    }
+  }
+
+  worker.postMessage({ type: 'init', wordVectors })
+
+  return {
+    search: (word, topN = 10) => new Promise((resolve) => {
+      const id = nextId++
+      pending.set(id, resolve)
+      worker.postMessage({ type: 'search', id, word, topN })
+    }),
+    terminate: () => {
+      pending.clear()
+      worker.terminate()
+    }
+  }
+}
@@ -0,0 +1,46 @@
+import { describe, it, expect } from 'vitest'
+import { createSearchWorker } from './searchWorkerClient'
+
+// Stands in for a Worker: records posted messages and answers searches
+class FakeWorker {
+  constructor() {
+    this.messages = []
+    this.terminated = false
+  }
+
+  postMessage(message) {
+    this.messages.push(message)
+    if (message.type === 'search') {
+      const found = message.word === 'king'
+      Promise.resolve().then(() => this.onmessage({
+        data: { type: 'results', id: message.id, found, results: found ? [{ word: 'queen', similarity: 0.9 }] : [] }
+      }))
+    }
+  }
+
+  terminate() {
+    this.terminated = true
+  }
+}
+
+describe('createSearchWorker', () => {
+  const wordVectors = { words: ['king', 'queen'], vectors: [[1, 0], [0.9, 0.1]] }
+
+  it('sends the word vectors to the worker on start', () => {
+    const worker = new FakeWorker()
+    createSearchWorker(wordVectors, () => worker)
+    expect(worker.messages[0]).toEqual({ type: 'init', wordVectors })
+  })
+
+  it('resolves searches with the worker response', async () => {
+    const client = createSearchWorker(wordVectors, () => new FakeWorker())
+    await expect(client.search('king')).resolves.toEqual({ found: true, results: [{ word: 'queen', similarity: 0.9 }] })
+    await expect(client.search('prince')).resolves.toEqual({ found: false, results: [] })
+  })
+
+  it('terminates the worker', () => {
+    const worker = new FakeWorker()
+    createSearchWorker(wordVectors, () => worker).terminate()
+    expect(worker.terminated).toBe(true)
+  })
+})
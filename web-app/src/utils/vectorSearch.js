@@ -0,0 +1,170 @@
+/**
+ * Fast cosine similarity search over the whole word list.
+ *
+ * All vectors are packed into one contiguous Float32Array with a table of
+ * precomputed inverse magnitudes, so each search is a single tight loop of
+ * dot products. The top matches are kept in a small bounded heap instead of
+ * sorting every similarity.
+ */
+
+/**
+ * Build the search index for a word vectors database
+ * @param {Object} wordVectors - { words, vectors } plus optional inverse norms
+ *   (`inv_norms` from csv_to_json.py or `invNorms` from loadBinaryVectors)
+ * @returns {Object} { words, dimensions, data, invNorms, lookup }
+ */
+export const buildSearchIndex = (wordVectors) => {
+  const { words, vectors } = wordVectors
+  const count = words.length
+  const dimensions = count > 0 ? vectors[0].length : 0
+
+  // Reuse the packed buffer from loadBinaryVectors when there is one
+  let data = wordVectors.data
+  if (!(data instanceof Float32Array) || data.length !== count * dimensions) {
+    data = new Float32Array(count * dimensions)
+    for (let i = 0; i < count; i++) {
+      data.set(vectors[i], i * dimensions)
+    }
+  }
+
+  const precomputed = wordVectors.invNorms || wordVectors.inv_norms
+  let invNorms
+  if (precomputed && precomputed.length === count) {
+    invNorms = Float32Array.from(precomputed)
+  } else {
+    invNorms = new Float32Array(count)
+    for (let i = 0; i < count; i++) {
+      let sumSquares = 0
+      const offset = i * dimensions
+      for (let d = 0; d < dimensions; d++) {
+        sumSquares += data[offset + d] * data[offset + d]
+      }
+      invNorms[i] = sumSquares > 0 ? 1 / Math.sqrt(sumSquares) : 0
+    }
+  }
+
+  // Case-insensitive lookup; the first occurrence wins, like findIndex
+  const lookup = new Map()
+  for (let i = 0; i < count; i++) {
+    const key = words[i].toLowerCase()
+    if (!lookup.has(key)) {
+      lookup.set(key, i)
+    }
+  }
+
+  return { words, dimensions, data, invNorms, lookup }
+}
+
+/**
+ * Find a word's position in the index
+ * @param {Object} index - Index from buildSearchIndex
+ * @param {string} word - The word to find (trimmed and lowercased before lookup)
+ * @returns {number} The word's index, or -1 if not found
+ */
+export const findWordIndex = (index, word) => {
+  const position = index.lookup.get(word.trim().toLowerCase())
+  return position === undefined ? -1 : position
+}
+
+// a ranks below b: lower similarity, or equal similarity and later in the list
+const ranksBelow = (scoreA, indexA, scoreB, indexB) =>
+  scoreA < scoreB || (scoreA === scoreB && indexA > indexB)
+
+/**
+ * Find the most similar words to the word at wordIndex, excluding the word itself
+ * @param {Object} index - Index from buildSearchIndex
+ * @param {number} wordIndex - Position of the query word
+ * @param {number} topN - Number of results to return
+ * @returns {Array<{word: string, similarity: number}>} Most similar first
+ */
+export const searchSimilar = (index, wordIndex, topN = 10) => {
+  const { words, dimensions, data, invNorms } = index
+  const count = words.length
+  const queryOffset = wordIndex * dimensions
+  const queryInvNorm = invNorms[wordIndex]
+
+  // Min-heap of the best matches so far; the root is the weakest one
+  const heapScores = new Float64Array(topN)
+  const heapIndices = new Int32Array(topN)
+  let size = 0
+
+  const siftDown = (position) => {
+    for (;;) {
+      const left = 2 * position + 1
+      const right = left + 1
+      let weakest = position
+      if (left < size && ranksBelow(heapScores[left], heapIndices[left], heapScores[weakest], heapIndices[weakest])) {
+        weakest = left
+      }
+      if (right < size && ranksBelow(heapScores[right], heapIndices[right], heapScores[weakest], heapIndices[weakest])) {
+        weakest = right
+      }
+      if (weakest === position) return
+      const score = heapScores[position]
+      const idx = heapIndices[position]
+      heapScores[position] = heapScores[weakest]
+      heapIndices[position] = heapIndices[weakest]
+      heapScores[weakest] = score
+      heapIndices[weakest] = idx
+      position = weakest
+    }
+  }
+
+  const siftUp = (position) => {
+    while (position > 0) {
+      const parent = (position - 1) >> 1
+      if (!ranksBelow(heapScores[position], heapIndices[position], heapScores[parent], heapIndices[parent])) return
+      const score = heapScores[position]
+      const idx = heapIndices[position]
+      heapScores[position] = heapScores[parent]
+      heapIndices[position] = heapIndices[parent]
+      heapScores[parent] = score
+      heapIndices[parent] = idx
+      position = parent
+    }
+  }
+
+  for (let i = 0; i < count; i++) {
+    if (i === wordIndex) continue // Exclude the input word itself
+
+    const offset = i * dimensions
+    let dotProduct = 0
+    for (let d = 0; d < dimensions; d++) {
+      dotProduct += data[queryOffset + d] * data[offset + d]
+    }
+    const similarity = dotProduct * queryInvNorm * invNorms[i]
+
+    if (size < topN) {
+      heapScores[size] = similarity
+      heapIndices[size] = i
+      siftUp(size)
+      size++
+    } else if (topN > 0 && ranksBelow(heapScores[0], heapIndices[0], similarity, i)) {
+      heapScores[0] = similarity
+      heapIndices[0] = i
+      siftDown(0)
+    }
+  }
+
+  const results = []
+  for (let k = 0; k < size; k++) {
+    results.push({ index: heapIndices[k], similarity: heapScores[k] })
+  }
+  results.sort((a, b) => b.similarity - a.similarity || a.index - b.index)
+  return results.map(({ index: i, similarity }) => ({ word: words[i], similarity }))
+}
+
+/**
+ * Look up a word and return its most similar words
+ * @param {Object} index - Index from buildSearchIndex
+ * @param {string} word - The query word
+ * @param {number} topN - Number of results to return
+ * @returns {{found: boolean, results: Array<{word: string, similarity: number}>}}
+ */
+export const searchWord = (index, word, topN = 10) => {
+  const wordIndex = findWordIndex(index, word)
+  if (wordIndex === -1) {
+    return { found: false, results: [] }
+  }
+  return { found: true, results: searchSimilar(index, wordIndex, topN) }
+}
@@ -0,0 +1,107 @@
+import { describe, it, expect } from 'vitest'
+import { buildSearchIndex, findWordIndex, searchSimilar, searchWord } from './vectorSearch'
+import { cosineSimilarity } from './cosineSimilarity'
+
+const wordVectors = {
+  words: ['King', 'queen', 'man', 'woman', 'zero'],
+  vectors: [
+    [0.9, 0.8, 0.1],
+    [0.85, 0.82, 0.15],
+    [0.2, 0.1, 0.9],
+    [0.25, 0.15, 0.85],
+    [0, 0, 0]
+  ]
+}
+
+// The previous implementation: score every word, then sort them all
+const bruteForce = (vectors, wordIndex, topN) => {
+  const similarities = []
+  for (let i = 0; i < vectors.words.length; i++) {
+    if (i !== wordIndex) {
+      similarities.push({ word: vectors.words[i], similarity: cosineSimilarity(vectors.vectors[wordIndex], vectors.vectors[i]) })
+    }
+  }
+  similarities.sort((a, b) => b.similarity - a.similarity)
+  return similarities.slice(0, topN)
+}
+
+describe('buildSearchIndex', () => {
+  it('packs the vectors into one Float32Array', () => {
+    const index = buildSearchIndex(wordVectors)
+    expect(index.data).toBeInstanceOf(Float32Array)
+    expect(index.data.length).toBe(15)
+    expect(index.dimensions).toBe(3)
+    expect(Array.from(index.data.subarray(6, 9))).toEqual(Array.from(new Float32Array([0.2, 0.1, 0.9])))
+  })
+
+  it('computes inverse norms, with 0 for a zero vector', () => {
+    const index = buildSearchIndex(wordVectors)
+    expect(index.invNorms[2]).toBeCloseTo(1 / Math.sqrt(0.86))
+    expect(index.invNorms[4]).toBe(0)
+  })
+
+  it('uses precomputed inverse norms when provided', () => {
+    const index = buildSearchIndex({ ...wordVectors, inv_norms: [1, 2, 3, 4, 0] })
+    expect(Array.from(index.invNorms)).toEqual([1, 2, 3, 4, 0])
+  })
+})
+
+describe('findWordIndex', () => {
+  it('finds words case-insensitively', () => {
+    const index = buildSearchIndex(wordVectors)
+    expect(findWordIndex(index, 'king')).toBe(0)
+    expect(findWordIndex(index, ' QUEEN ')).toBe(1)
+  })
+
+  it('returns -1 for unknown words', () => {
+    expect(findWordIndex(buildSearchIndex(wordVectors), 'prince')).toBe(-1)
+  })
+})
+
+describe('searchSimilar', () => {
+  it('matches a full sort of cosine similarities', () => {
+    const index = buildSearchIndex(wordVectors)
+    for (let i = 0; i < wordVectors.words.length; i++) {
+      const expected = bruteForce(wordVectors, i, 3)
+      const actual = searchSimilar(index, i, 3)
+      expect(actual.map(r => r.word)).toEqual(expected.map(r => r.word))
+      actual.forEach((r, k) => expect(r.similarity).toBeCloseTo(expected[k].similarity, 5))
+    }
+  })
+
+  it('excludes the query word', () => {
+    const results = searchSimilar(buildSearchIndex(wordVectors), 0, 10)
+    expect(results).toHaveLength(4)
+    expect(results.find(r => r.word === 'King')).toBeUndefined()
+  })
+
+  it('keeps list order for equal similarities', () => {
+    const tied = { words: ['a', 'b', 'c', 'd'], vectors: [[1, 0], [1, 0], [2, 0], [1, 0]] }
+    const results = searchSimilar(buildSearchIndex(tied), 0, 2)
+    expect(results.map(r => r.word)).toEqual(['b', 'c'])
+  })
+
+  it('matches a full sort on a larger random set', () => {
+    let seed = 1
+    const random = () => {
+      seed = (seed * 16807) % 2147483647
+      return seed / 2147483647 - 0.5
+    }
+    const words = Array.from({ length: 500 }, (_, i) => `w${i}`)
+    const vectors = words.map(() => Array.from({ length: 8 }, random))
+    const large = { words, vectors }
+    const expected = bruteForce(large, 42, 10)
+    const actual = searchSimilar(buildSearchIndex(large), 42, 10)
+    expect(actual.map(r => r.word)).toEqual(expected.map(r => r.word))
+  })
+})
+
+describe('searchWord', () => {
+  it('reports whether the word was found', () => {
+    const index = buildSearchIndex(wordVectors)
+    expect(searchWord(index, 'missing')).toEqual({ found: false, results: [] })
+    const { found, results } = searchWord(index, 'queen', 1)
+    expect(found).toBe(true)
+    expect(results[0].word).toBe('King')
+  })
+})
@@ -7,6 +7,11 @@
 export const getWordVector = (wordToFind, wordVectors) => {
   const trimmedWord = wordToFind.trim().toLowerCase()
   const wordIndex = wordVectors.words.findIndex(w => w.toLowerCase() === trimmedWord)
-  return wordIndex !== -1 ? wordVectors.vectors[wordIndex] : null
+  if (wordIndex === -1) {
+    return null
+  }
+  // Binary vectors are Float32Array views; copy them so .map can return elements or objects
+  const vector = wordVectors.vectors[wordIndex]
+  return ArrayBuffer.isView(vector) ? Array.from(vector) : vector
 }
 
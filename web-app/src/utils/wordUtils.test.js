@@ -79,6 +79,18 @@ describe('getWordVector', () => {
     expect(result3).toEqual([7, 8, 9])
   })
 
+  it('should return a plain array for Float32Array vectors', () => {
+    const binaryWordVectors = {
+      words: ['half', 'quarter'],
+      vectors: [new Float32Array([0.5, 1]), new Float32Array([0.25, 2])]
+    }
+
+    const result = getWordVector('quarter', binaryWordVectors)
+
+    expect(Array.isArray(result)).toBe(true)
+    expect(result).toEqual([0.25, 2])
+  })
+
   it('should return correct vector for all words in mock data', () => {
     mockWordVectors.words.forEach((word, index) => {
       const result = getWordVector(word, mockWordVectors)
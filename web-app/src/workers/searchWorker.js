@@ -0,0 +1,22 @@
+/**
+ * Web Worker that runs similarity searches off the main thread.
+ *
+ * Messages in:
+ *   { type: 'init', wordVectors }            build the search index
+ *   { type: 'search', id, word, topN }       search for a word
+ * Messages out:
+ *   { type: 'results', id, found, results }
+ */
+import { buildSearchIndex, searchWord } from '../utils/vectorSearch'
+
+let index = null
+
+self.onmessage = (event) => {
+  const message = event.data
+  if (message.type === 'init') {
+    index = buildSearchIndex(message.wordVectors)
+  } else if (message.type === 'search') {
+    const { found, results } = searchWord(index, message.word, message.topN)
+    self.postMessage({ type: 'results', id: message.id, found, results })
+  }
+}
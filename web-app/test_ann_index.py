@@ -0,0 +1,29 @@
+import numpy as np
+from ann_index import IVFIndex
+
+
+def test_load_or_build_reuses_index_for_same_vectors(tmp_path, random_vectors):
+    path = str(tmp_path / 'model.ivf.npz')
+    vectors = random_vectors(500, 8, seed=0, unit=True)
+    built = IVFIndex.load_or_build(path, vectors, n_lists=10)
+    loaded = IVFIndex.load_or_build(path, vectors, n_lists=10)
+    assert loaded.fingerprint == built.fingerprint
+    np.testing.assert_array_equal(loaded.list_indices, built.list_indices)
+
+
+def test_load_or_build_rebuilds_for_retrained_vectors_of_same_size(tmp_path, random_vectors):
+    path = str(tmp_path / 'model.ivf.npz')
+    old = IVFIndex.load_or_build(path, random_vectors(500, 8, seed=0, unit=True), n_lists=10)
+    retrained = random_vectors(500, 8, seed=1, unit=True)
+    new = IVFIndex.load_or_build(path, retrained, n_lists=10)
+    assert new.fingerprint != old.fingerprint
+    assert IVFIndex.load(path).fingerprint == new.fingerprint
+
+
+def test_index_saved_without_fingerprint_is_rebuilt(tmp_path, random_vectors):
+    path = str(tmp_path / 'model.ivf.npz')
+    vectors = random_vectors(500, 8, seed=0, unit=True)
+    index = IVFIndex.build(vectors, n_lists=10)
+    np.savez(path, centroids=index.centroids, list_offsets=index.list_offsets, list_indices=index.list_indices)
+    assert IVFIndex.load(path).fingerprint is None
+    assert IVFIndex.load_or_build(path, vectors, n_lists=10).fingerprint == index.fingerprint
@@ -0,0 +1,201 @@
+import importlib
+import threading
+import time
+import numpy as np
+import pytest
+from batching import MicroBatcher
+
+WORDS = ['king', 'queen', 'man', 'woman', 'prince', 'princess', 'sign', 'word', 'world', 'kingdom']
+
+
+def write_model_csv(path, n_filler=40, dimensions=8, seed=0):
+    """A small CSV model: the words above plus filler words w0, w1, ..."""
+    rng = np.random.default_rng(seed)
+    words = WORDS + [f'w{i}' for i in range(n_filler)]
+    vectors = rng.standard_normal((len(words), dimensions))
+    # king - man + woman = queen exactly
+    vectors[1] = vectors[0] - vectors[2] + vectors[3]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('word,' + ','.join(f'dim_{d}' for d in range(dimensions)) + '\n')
+        for word, row in zip(words, vectors):
+            f.write(f'{word},' + ','.join(f'{value:.6f}' for value in row) + '\n')
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def api(tmp_path_factory):
+    """The api module serving a small CSV model (configuration is read at import)."""
+    path = write_model_csv(tmp_path_factory.mktemp('model') / 'vectors.csv')
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('MODEL_NAME', path)
+        env.setenv('SEARCH_CACHE_SIZE', '0')
+        module = importlib.import_module('api')
+    module.create_app(warm=True)
+    return module
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+def words_of(results):
+    return [result['word'] for result in results]
+
+
+def test_batch_mixes_found_and_missing_words(client):
+    response = client.post('/api/search/batch', json={'words': ['King', 'kign', 'queen'], 'topn': 3})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['input_word'] for result in results] == ['king', 'kign', 'queen']
+    assert len(results[0]['results']) == 3
+    assert results[1]['error'] == 'Word "kign" not found in vocabulary'
+    assert 'king' in results[1]['suggestions']
+    assert 'results' not in results[1]
+
+
+def test_batch_matches_single_searches(client):
+    words = ['king', 'woman', 'w5', 'sign']
+    batch = client.post('/api/search/batch', json={'words': words}).get_json()['results']
+    for word, result in zip(words, batch):
+        single = client.post('/api/search', json={'word': word}).get_json()['results']
+        assert words_of(result['results']) == words_of(single)
+        np.testing.assert_allclose([r['similarity'] for r in result['results']],
+                                   [r['similarity'] for r in single], rtol=1e-5)
+
+
+@pytest.mark.parametrize('body', [{'words': 'king'}, {'words': []}, {}, ['king'], {'words': ['king'], 'topn': 0}])
+def test_batch_rejects_bad_requests(client, body):
+    assert client.post('/api/search/batch', json=body).status_code == 400
+
+
+def test_batch_size_is_capped(client, api, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_BATCH_WORDS', 3)
+    response = client.post('/api/search/batch', json={'words': ['king'] * 4})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'At most 3 words per batch'
+    assert client.post('/api/search/batch', json={'words': ['king'] * 3}).status_code == 200
+
+
+@pytest.mark.parametrize('method', ['3cosadd', '3cosmul'])
+def test_analogy(client, method):
+    response = client.post('/api/analogy', json={'positive': ['King', 'woman'], 'negative': ['man'],
+                                                 'method': method, 'topn': 3})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['positive'], body['negative'], body['method']) == (['king', 'woman'], ['man'], method)
+    assert len(body['results']) == 3
+    assert body['results'][0]['word'] == 'queen'
+
+
+def test_analogy_rejects_bad_queries(client):
+    response = client.post('/api/analogy', json={'positive': ['king'], 'method': '3cosfoo'})
+    assert response.status_code == 400
+    response = client.post('/api/analogy', json={'positive': ['king', 'woman'], 'negative': ['mna']})
+    assert response.status_code == 404
+    assert response.get_json()['missing'] == ['mna']
+    # king - king scores every candidate 0
+    response = client.post('/api/analogy', json={'positive': ['king'], 'negative': ['king']})
+    assert response.status_code == 400
+    response = client.post('/api/analogy', json={'positive': ['king', 'woman'], 'negative': ['woman', 'king'],
+                                                 'method': '3cosmul'})
+    assert response.status_code == 400
+
+
+def test_busy_server_returns_429(client, api, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(api, 'search_slots', slots)
+    monkeypatch.setattr(api, 'QUEUE_TIMEOUT', 0.01)
+    rejected = api.rejected_requests.values().get((), 0)
+    slots.acquire()  # Every slot is taken by another search
+    response = client.post('/api/search', json={'word': 'king'})
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/api/health').get_json()['concurrency']['rejected_requests'] == rejected + 1
+    slots.release()
+    assert client.post('/api/search', json={'word': 'king'}).status_code == 200
+
+
+def test_reload_swaps_in_a_new_version(client, api, monkeypatch):
+    before = client.get('/api/health').get_json()
+    assert before['status'] == 'ok'
+    assert before['vocabulary_size'] == 50
+
+    response = client.post('/api/reload', json={})
+    assert response.status_code == 202
+    assert response.get_json() == {'model': api.MODEL_NAME, 'status': 'loading'}
+    deadline = time.monotonic() + 10
+    while client.get('/api/health').get_json()['reload']['state'] == 'loading' and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    after = client.get('/api/health').get_json()
+    assert after['reload']['state'] == 'ready'
+    assert after['model_version'] == after['reload']['version'] != before['model_version']
+    assert client.post('/api/search', json={'word': 'king'}).status_code == 200
+
+    monkeypatch.setattr(api, 'RELOAD_TOKEN', 'secret')
+    assert client.post('/api/reload').status_code == 403
+    assert client.post('/api/reload', json={'model': 'nope'}, headers={'X-Reload-Token': 'secret'}).status_code == 404
+
+
+def test_reload_while_reloading_returns_409(client, api, monkeypatch):
+    monkeypatch.setitem(api.registry.reload_status, api.MODEL_NAME, {'state': 'loading', 'started_at': time.time()})
+    assert client.post('/api/reload').status_code == 409
+
+
+def test_profile_header_adds_server_timing(client):
+    response = client.post('/api/search', json={'word': 'queen'}, headers={'X-Profile': '1'})
+    stages = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+    assert stages[0] == 'parse'
+    assert {'lookup', 'similarity', 'topk', 'serialize'} <= set(stages)
+    assert stages[-1] == 'total'
+    assert 'Server-Timing' not in client.post('/api/search', json={'word': 'queen'}).headers
+
+
+def test_metrics(client):
+    client.post('/api/search', json={'word': 'king'})
+    client.post('/api/search', json={'word': 'kign'})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    text = response.get_data(as_text=True)
+    assert 'word2vec_requests_total{route="/api/search",method="POST",status="404"}' in text
+    assert 'word2vec_request_duration_seconds_bucket{route="/api/search",le="+Inf"}' in text
+    assert 'word2vec_request_stage_duration_seconds_count{route="/api/search",stage="similarity"}' in text
+    assert 'word2vec_model_vocabulary_size{model="' in text
+    assert '# TYPE word2vec_search_cache_hits_total counter' in text
+
+
+def test_suggest(client):
+    response = client.post('/api/suggest', json={'prefix': ' King', 'limit': 5})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['prefix'] == 'king'
+    assert body['completions'] == ['king', 'kingdom']
+    assert body['corrections'][0] == {'word': 'king', 'distance': 0}
+    assert client.post('/api/suggest', json={'prefix': 'wrod'}).get_json()['corrections'] == [
+        {'word': 'word', 'distance': 1}]
+
+
+@pytest.mark.parametrize('body, status', [({}, 400), ({'prefix': ' '}, 400), ({'prefix': 'k', 'limit': 0}, 400),
+                                          ({'prefix': 'k', 'model': 'nope'}, 404)])
+def test_suggest_rejects_bad_requests(client, body, status):
+    assert client.post('/api/suggest', json=body).status_code == status
+
+
+def test_unknown_word_gets_did_you_mean_suggestions(client):
+    response = client.post('/api/search', json={'word': 'kign'})
+    assert response.status_code == 404
+    assert response.get_json()['suggestions'] == ['king', 'sign']
+
+
+def test_metrics_include_micro_batching(client, api, monkeypatch):
+    entry = api.registry.get(api.MODEL_NAME)
+    batcher = MicroBatcher(entry.engine, window_ms=0.1)
+    monkeypatch.setattr(entry, 'batcher', batcher)
+    client.post('/api/search', json={'word': 'prince'})
+    batcher.close()
+    text = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE word2vec_batch_queue_wait_seconds histogram' in text
+    assert f'word2vec_batch_queue_wait_seconds_count{{model="{api.MODEL_NAME}"}} 1' in text
+    assert client.get('/api/health').get_json()['batching']['queue_wait_seconds']['count'] == 1
@@ -0,0 +1,52 @@
+import threading
+from batching import MicroBatcher
+
+
+def words_of(results):
+    return [result['word'] for result in results]
+
+
+def test_concurrent_queries_share_a_batch_and_match_direct_search(make_engine):
+    engine, _ = make_engine(300)
+    batcher = MicroBatcher(engine, window_ms=50, max_batch=8)
+    queries = [(f'w{i}', 3 + i % 4) for i in range(8)]
+    results = [None] * len(queries)
+    start = threading.Barrier(len(queries))
+
+    def search(position, word, topn):
+        start.wait()
+        results[position] = batcher.most_similar(word, topn)
+
+    threads = [threading.Thread(target=search, args=(i, word, topn)) for i, (word, topn) in enumerate(queries)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for (word, topn), result in zip(queries, results):
+        assert words_of(result) == words_of(engine.most_similar(word, topn))
+    stats = batcher.batch_sizes.snapshot()
+    assert stats['count'] < len(queries)
+    assert stats['sum'] == len(queries)
+    # Waits are recorded in seconds, each at most about one 50 ms window
+    waits = batcher.stats()['queue_wait_seconds']
+    assert waits['count'] == len(queries)
+    assert 0 < waits['sum'] < len(queries) * 0.5
+
+
+def test_missing_word_returns_none(make_engine):
+    batcher = MicroBatcher(make_engine(300)[0], window_ms=0.1)
+    assert batcher.most_similar('missing') is None
+    batcher.close()
+
+
+def test_queries_after_close_are_answered_directly(make_engine):
+    engine, _ = make_engine(300)
+    batcher = MicroBatcher(engine, window_ms=0.1)
+    batcher.most_similar('w1')
+    thread = batcher._thread
+    batcher.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert words_of(batcher.most_similar('w2', 5)) == words_of(engine.most_similar('w2', 5))
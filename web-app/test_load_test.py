@@ -0,0 +1,14 @@
+import pytest
+from load_test import percentile
+
+
+@pytest.mark.parametrize('p, expected', [(50, 5), (90, 9), (99, 10), (100, 10), (1, 1), (0, 1)])
+def test_percentile_uses_the_nearest_rank(p, expected):
+    assert percentile(list(range(1, 11)), p) == expected
+
+
+def test_p99_of_a_small_sample_is_its_maximum():
+    # round() picked the second largest of 60 here, underestimating p99
+    values = list(range(1, 61))
+    assert percentile(values, 99) == 60
+    assert percentile(values, 50) == 30
@@ -0,0 +1,86 @@
+import gc
+import threading
+import weakref
+import numpy as np
+from batching import MicroBatcher
+from model_registry import ModelRegistry
+
+
+def write_csv(path, n_words=50, dimensions=8, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((n_words, dimensions))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('word,' + ','.join(f'dim_{d}' for d in range(dimensions)) + '\n')
+        for i, row in enumerate(vectors):
+            f.write(f'w{i},' + ','.join(f'{value:.6f}' for value in row) + '\n')
+    return str(path)
+
+
+def batched(entry):
+    """Prepare hook like api.prepare_model with micro-batching on; runs one search to start the thread."""
+    entry.batcher = MicroBatcher(entry.engine, window_ms=0.1)
+    entry.batcher.most_similar('w0', topn=3)
+
+
+def batcher_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'search-batcher']
+
+
+def make_registry(tmp_path, n_models, **kwargs):
+    sources = {f'm{i}': {'path': write_csv(tmp_path / f'm{i}.csv', seed=i)} for i in range(n_models)}
+    return ModelRegistry(sources, prepare=batched, **kwargs)
+
+
+def test_eviction_stops_batchers_and_frees_engines(tmp_path):
+    threads_before = len(batcher_threads())
+    # Room for about one 50 x 8 model at a time
+    registry = make_registry(tmp_path, 10, memory_budget_mb=0.003)
+    engines = []
+    threads = []
+    for i in range(10):
+        entry = registry.get(f'm{i}')
+        engines.append(weakref.ref(entry.engine))
+        threads.append(entry.batcher._thread)
+    del entry
+
+    assert registry.evictions == 9
+    assert [entry.name for entry in registry.loaded()] == ['m9']
+    for thread in threads[:-1]:
+        thread.join(timeout=5)
+    assert [thread.is_alive() for thread in threads] == [False] * 9 + [True]
+    gc.collect()
+    assert [ref() is not None for ref in engines] == [False] * 9 + [True]
+    assert len(batcher_threads()) == threads_before + 1
+
+
+def test_evicted_batcher_still_answers_late_requests(tmp_path):
+    registry = make_registry(tmp_path, 2, memory_budget_mb=0.003)
+    first = registry.get('m0')
+    registry.get('m1')
+    assert 'm0' not in [entry.name for entry in registry.loaded()]
+    assert [match['word'] for match in first.batcher.most_similar('w0', topn=3)] == \
+        [match['word'] for match in first.engine.most_similar('w0', topn=3)]
+
+
+def test_reload_stops_the_old_batcher(tmp_path):
+    registry = make_registry(tmp_path, 1)
+    old = registry.get('m0')
+    thread = old.batcher._thread
+    new = registry.reload('m0')
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert registry.get('m0') is new
+
+
+def test_pinned_model_is_never_evicted(tmp_path):
+    registry = make_registry(tmp_path, 3, memory_budget_mb=0.003, pinned=['m0'])
+    for name in ('m0', 'm1', 'm2'):
+        registry.get(name)
+    assert [entry.name for entry in registry.loaded()] == ['m0', 'm2']
+
+
+def test_reloads_in_the_same_second_get_new_versions(tmp_path):
+    registry = make_registry(tmp_path, 1)
+    versions = {registry.get('m0').version}
+    for _ in range(3):
+        versions.add(registry.reload('m0').version)
+    assert len(versions) == 4
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from quantization import QuantizedMatrix
+from similarity import SimilarityEngine
+
+
+@pytest.mark.parametrize('dtype', ['float16', 'int8'])
+def test_products_match_the_dequantized_matrix(dtype, random_vectors):
+    vectors = random_vectors(500, 25, unit=True)
+    matrix = QuantizedMatrix.quantize(vectors, dtype)
+    matrix.block_rows = 64  # Several blocks, the last one partial
+    exact = matrix.dequantize()
+    query = vectors[3]
+    np.testing.assert_allclose(matrix @ query, exact @ query, atol=1e-5)
+    np.testing.assert_allclose(vectors[:7] @ matrix.T, vectors[:7] @ exact.T, atol=1e-5)
+    np.testing.assert_allclose(matrix[10], exact[10])
+    np.testing.assert_allclose(matrix[5:9].dequantize(), exact[5:9])
+
+
+def test_int8_error_and_size(random_vectors):
+    vectors = random_vectors(500, 25, unit=True)
+    matrix = QuantizedMatrix.quantize(vectors, 'int8')
+    assert matrix.dtype == 'int8'
+    # At most half a quantization step per value
+    assert np.abs(matrix.dequantize() - vectors).max() <= matrix.scales.max() / 2 + 1e-7
+    assert matrix.nbytes < vectors.nbytes / 3
+
+
+def test_zero_rows_and_unknown_dtype():
+    matrix = QuantizedMatrix.quantize(np.zeros((2, 4)), 'int8')
+    assert not matrix.dequantize().any()
+    with pytest.raises(ValueError):
+        QuantizedMatrix.quantize(np.zeros((2, 4)), 'int4')
+    with pytest.raises(ValueError):
+        QuantizedMatrix(np.zeros((2, 4), dtype=np.int8))
+
+
+def test_rerank_restores_exact_order(random_vectors):
+    vectors = random_vectors(2000, 25, unit=True)
+    words = [f'w{i}' for i in range(len(vectors))]
+    exact = SimilarityEngine(words, vectors, normalized=True)
+    quantized = SimilarityEngine(words, vectors, normalized=True)
+    quantized.quantize('int8', rerank=50)
+    for word in ('w0', 'w999'):
+        expected = exact.most_similar(word, 10)
+        results = quantized.most_similar(word, 10)
+        assert [result['word'] for result in results] == [result['word'] for result in expected]
+        np.testing.assert_allclose([result['similarity'] for result in results],
+                                   [result['similarity'] for result in expected], rtol=1e-5)
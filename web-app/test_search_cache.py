@@ -0,0 +1,47 @@
+from search_cache import SearchCache
+
+
+def test_hit_and_miss_counters():
+    cache = SearchCache(maxsize=4)
+    assert cache.get('king') is None
+    cache.put('king', ['queen'])
+    assert cache.get('king') == ['queen']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+def test_evicts_least_recently_used():
+    cache = SearchCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('search_cache.time.monotonic', lambda: now[0])
+    cache = SearchCache(maxsize=4, ttl=10)
+    cache.put('a', 1)
+    now[0] += 5
+    assert cache.get('a') == 1
+    now[0] += 6
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_zero_size_disables_the_cache():
+    cache = SearchCache(maxsize=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_clear_drops_every_entry():
+    cache = SearchCache(maxsize=4)
+    cache.put('a', 1)
+    cache.clear()
+    assert cache.get('a') is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from similarity import SimilarityEngine, normalize_rows
+
+
+def reference_most_similar(vectors, index, topn):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ unit[index]
+    scores[index] = -np.inf
+    return np.argsort(-scores, kind='stable')[:topn].tolist()
+
+
+def test_normalize_rows_leaves_zero_rows_zero():
+    unit = normalize_rows(np.array([[3, 4], [0, 0]]))
+    assert unit.dtype == np.float32
+    np.testing.assert_allclose(unit, [[0.6, 0.8], [0, 0]])
+
+
+def test_most_similar_matches_a_full_sort(make_engine):
+    engine, vectors = make_engine()
+    for index in (0, 57, 199):
+        results = engine.most_similar(f'w{index}', topn=10)
+        assert [result['word'] for result in results] == \
+            [f'w{i}' for i in reference_most_similar(vectors, index, 10)]
+        assert f'w{index}' not in [result['word'] for result in results]
+        similarities = [result['similarity'] for result in results]
+        assert similarities == sorted(similarities, reverse=True)
+
+
+def test_ties_keep_vocabulary_order():
+    vectors = np.array([[1, 0], [0, 1], [0, 2], [0, 3]], dtype=np.float32)
+    engine = SimilarityEngine(['a', 'b', 'c', 'd'], vectors)
+    assert [result['word'] for result in engine.most_similar('b', topn=3)] == ['c', 'd', 'a']
+
+
+def test_topn_larger_than_vocabulary(make_engine):
+    engine, _ = make_engine(n_words=5)
+    assert len(engine.most_similar('w0', topn=50)) == 4
+
+
+def test_batch_matches_single_queries(make_engine):
+    engine, _ = make_engine()
+    words = ['w3', 'missing', 'w150', 'w3']
+    batch = engine.most_similar_batch(words, topn=5, block_size=2)
+    assert batch[1] is None
+    for word, results in zip(words, batch):
+        if word != 'missing':
+            single = engine.most_similar(word, topn=5)
+            assert [result['word'] for result in results] == [result['word'] for result in single]
+            # Matrix-matrix and matrix-vector products round differently in float32
+            np.testing.assert_allclose([result['similarity'] for result in results],
+                                       [result['similarity'] for result in single], rtol=1e-5)
+
+
+def test_analogy_excludes_inputs_and_rejects_unknown_words(make_engine):
+    engine, _ = make_engine()
+    results = engine.analogy(['w1', 'w2'], ['w3'], topn=10)
+    assert len(results) == 10
+    assert not {'w1', 'w2', 'w3'} & {result['word'] for result in results}
+    with pytest.raises(KeyError):
+        engine.analogy(['w1', 'nope'])
+    with pytest.raises(ValueError):
+        engine.analogy(['w1'], method='bogus')
+
+
+def test_analogy_rejects_words_that_cancel_out(make_engine):
+    engine, _ = make_engine()
+    with pytest.raises(ValueError):
+        engine.analogy(['w1', 'w2'], ['w2', 'w1'])
+    assert engine.analogy_batch([(['w1'], ['w1']), (['w1'], ['w2'])])[0] is None
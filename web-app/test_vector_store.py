@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from similarity import SimilarityEngine
+from vector_store import VOCAB_FILE, VectorStore, write_store
+
+WORDS = ['king', 'queen', 'café', 'zero']
+
+
+def make_vectors():
+    vectors = np.random.default_rng(0).standard_normal((len(WORDS), 6)).astype(np.float32)
+    vectors[3] = 0
+    return vectors
+
+
+def test_round_trip(tmp_path):
+    vectors = make_vectors()
+    write_store(WORDS, vectors, tmp_path / 'store')
+    store = VectorStore(str(tmp_path / 'store'))
+    assert store.index_to_key == WORDS
+    assert (len(store), store.vector_size) == (4, 6)
+    assert 'café' in store and 'prince' not in store
+    for word, vector in zip(WORDS, vectors):
+        np.testing.assert_allclose(store[word], vector, rtol=1e-6, atol=1e-7)
+    # Rows are stored at unit length, zero rows stay zero
+    np.testing.assert_allclose(np.linalg.norm(store.vectors[:3], axis=1), 1, rtol=1e-6)
+    assert not store.vectors[3].any()
+
+
+def test_vectors_are_memory_mapped(tmp_path):
+    write_store(WORDS, make_vectors(), tmp_path)
+    store = VectorStore(str(tmp_path))
+    assert not store.vectors.flags.owndata
+    assert not store.vectors.flags.writeable
+
+
+def test_engine_from_store_matches_engine_from_vectors(tmp_path):
+    vectors = make_vectors()
+    write_store(WORDS, vectors, tmp_path)
+    from_store = SimilarityEngine.from_store(VectorStore(str(tmp_path)))
+    direct = SimilarityEngine(WORDS, vectors)
+    for word in WORDS[:3]:
+        results, expected = from_store.most_similar(word, 3), direct.most_similar(word, 3)
+        assert [result['word'] for result in results] == [result['word'] for result in expected]
+        np.testing.assert_allclose([result['similarity'] for result in results],
+                                   [result['similarity'] for result in expected], rtol=1e-5)
+
+
+def test_rejects_bad_vocabularies(tmp_path):
+    with pytest.raises(ValueError):
+        write_store(['two\nlines'], np.zeros((1, 2)), tmp_path)
+    write_store(WORDS, make_vectors(), tmp_path)
+    (tmp_path / VOCAB_FILE).write_text('\n'.join(WORDS[:3]), encoding='utf-8')
+    with pytest.raises(ValueError):
+        VectorStore(str(tmp_path))
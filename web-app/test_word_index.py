@@ -0,0 +1,66 @@
+import random
+import pytest
+from word_index import WordIndex, deletes, edit_distance
+
+# Frequency order, most frequent first
+WORDS = ['the', 'king', 'queen', 'sign', 'kingdom', 'question', 'quite', 'quick', 'world', 'word', 'kings']
+
+
+def reference_distance(a, b):
+    """Unbounded optimal string alignment distance."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_edit_distance_matches_reference_up_to_the_bound():
+    rng = random.Random(0)
+    for _ in range(5000):
+        a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 6)))
+        b = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 6)))
+        bound = rng.randint(0, 3)
+        expected = reference_distance(a, b)
+        assert edit_distance(a, b, bound) == (expected if expected <= bound else bound + 1)
+
+
+def test_deletes():
+    assert deletes('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+    assert 'c' in deletes('abc', 2)
+
+
+def test_complete_returns_most_frequent_first():
+    index = WordIndex(WORDS)
+    assert index.complete('qu') == ['queen', 'question', 'quite', 'quick']
+    assert index.complete('qu', limit=2) == ['queen', 'question']
+    assert index.complete('king') == ['king', 'kingdom', 'kings']
+    assert index.complete('zz') == []
+    assert index.complete('') == []
+
+
+def test_correct_finds_typos_closest_then_most_frequent():
+    index = WordIndex(WORDS)
+    assert [match['word'] for match in index.correct('kign')] == ['king', 'sign']
+    assert index.correct('wrold') == [{'word': 'world', 'distance': 1}]
+    assert index.correct('king')[0] == {'word': 'king', 'distance': 0}
+    assert index.correct('xyzzy') == []
+
+
+def test_only_the_most_frequent_words_are_corrected():
+    index = WordIndex(WORDS, fuzzy_words=2)
+    assert index.correct('kign') == [{'word': 'king', 'distance': 1}]
+    assert index.correct('quen') == []
+    assert WordIndex(WORDS, fuzzy_words=0).correct('kign') == []
+
+
+@pytest.mark.parametrize('word, expected', [('kign', ['king', 'sign']), ('quest', ['question']), ('wrod', ['word'])])
+def test_suggest_puts_corrections_before_completions(word, expected):
+    assert WordIndex(WORDS).suggest(word) == expected
+
+
+def test_larger_max_distance():
+    index = WordIndex(WORDS, max_distance=2)
+    assert 'queen' in [match['word'] for match in index.correct('qeeen')]
@@ -0,0 +1,115 @@
+"""
+Flat binary vector store that the API can memory-map at startup.
+
+A store is a directory with three files:
+  vectors.npy  unit-normalized float32 matrix, one row per word
+  norms.npy    float32 original length of every row
+  vocab.txt    UTF-8 words, one per line, in row order
+
+Loading opens vectors.npy with mmap_mode='r', so startup does not parse the
+model and every worker process shares one page-cache copy of the matrix.
+Only the converter needs gensim.
+
+Usage:
+  python vector_store.py <model_name_or_path> <store_dir>
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+VECTORS_FILE = "vectors.npy"
+NORMS_FILE = "norms.npy"
+VOCAB_FILE = "vocab.txt"
+
+
+def load_keyed_vectors(name_or_path):
+    """Load KeyedVectors from a gensim downloader name or a saved Word2Vec model."""
+    if os.path.exists(name_or_path):
+        from gensim.models import Word2Vec
+        return Word2Vec.load(name_or_path).wv
+    import gensim.downloader as api
+    return api.load(name_or_path)
+
+
+def write_store(words, vectors, store_dir):
+    """
+    Write words and their vectors as a store directory.
+
+    Args:
+        words: List of words, in the same order as the rows of vectors
+        vectors: Array of shape (len(words), dimensions)
+        store_dir: Output directory (created if needed)
+    """
+    if any("\n" in word for word in words):
+        raise ValueError("Words containing newlines cannot be stored in vocab.txt")
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1)
+    safe_norms = np.where(norms == 0, 1.0, norms).astype(np.float32)
+
+    os.makedirs(store_dir, exist_ok=True)
+    np.save(os.path.join(store_dir, VECTORS_FILE), vectors / safe_norms[:, None])
+    np.save(os.path.join(store_dir, NORMS_FILE), norms.astype(np.float32))
+    with open(os.path.join(store_dir, VOCAB_FILE), "w", encoding="utf-8") as f:
+        f.write("\n".join(words))
+
+
+class VectorStore:
+    """
+    Read-only word vectors backed by a memory-mapped store directory.
+
+    Offers the parts of the gensim KeyedVectors interface the API uses:
+    key_to_index, index_to_key, vector_size and model[word].
+    """
+
+    def __init__(self, store_dir):
+        self.path = store_dir
+        # Already unit-normalized; SimilarityEngine uses this matrix without copying
+        self.vectors = np.asarray(np.load(os.path.join(store_dir, VECTORS_FILE), mmap_mode="r"))
+        self.norms = np.load(os.path.join(store_dir, NORMS_FILE))
+        with open(os.path.join(store_dir, VOCAB_FILE), encoding="utf-8") as f:
+            self.index_to_key = f.read().split("\n")
+        if len(self.index_to_key) != len(self.vectors):
+            raise ValueError(f"{store_dir}: {len(self.index_to_key)} words but {len(self.vectors)} vectors")
+        self.key_to_index = {word: i for i, word in enumerate(self.index_to_key)}
+
+    @property
+    def vector_size(self):
+        return self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.index_to_key)
+
+    def __contains__(self, word):
+        return word in self.key_to_index
+
+    def __getitem__(self, word):
+        """Return the original (un-normalized) vector for word."""
+        index = self.key_to_index[word]
+        return self.vectors[index] * self.norms[index]
+
+
+def convert(name_or_path, store_dir):
+    """Convert a gensim model (downloader name or saved Word2Vec model) to a store."""
+    print(f"1. Loading model: {name_or_path}")
+    model = load_keyed_vectors(name_or_path)
+    print(f"   Vocabulary size: {len(model.index_to_key)}")
+    print(f"   Vector dimensions: {model.vector_size}")
+
+    print(f"2. Writing store: {store_dir}")
+    write_store(model.index_to_key, model.vectors, store_dir)
+
+    print("3. Checking store loads...")
+    start = time.perf_counter()
+    store = VectorStore(store_dir)
+    print(f"   Loaded {len(store)} words in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"\n✅ Store written to {store_dir}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python vector_store.py <model_name_or_path> <store_dir>")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,211 @@
+"""
+Prefix and typo-tolerant word lookup for autocomplete and "did you mean".
+
+WordIndex is built once per model (see prepare_model in api.py):
+
+  - Prefix completion: the vocabulary sorted alphabetically, with each
+    word's frequency rank alongside. bisect finds the block of words that
+    start with the prefix, and np.partition picks the most frequent of
+    them, so a lookup never walks the whole block in Python.
+  - Corrections: a symmetric-delete index (as in SymSpell). Every word is
+    stored under itself and each string made by deleting up to max_distance
+    of its characters. A query generates its own deletes; any word sharing
+    one is a candidate within max_distance edits, and the candidates are
+    then checked with the optimal string alignment distance (Levenshtein
+    plus adjacent transpositions). Only the fuzzy_words most frequent words
+    are indexed, which bounds memory on million-word vocabularies and keeps
+    suggestions to words people are likely to have meant.
+
+Usage:
+  python word_index.py <model_name_or_path> [--fuzzy-words 100000] [--queries 1000]
+"""
+
+import argparse
+import bisect
+import sys
+import time
+import numpy as np
+
+# Largest code point, so prefix + MAX_CHAR sorts after every word starting with prefix
+MAX_CHAR = '\U0010ffff'
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance between a and b, or max_distance + 1 if it is larger.
+
+    Counts insertions, deletions, substitutions and swaps of adjacent characters.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # Only the part between a common prefix and suffix needs the full table
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(max(len(a), len(b)), max_distance + 1)
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def deletes(word, max_distance):
+    """The word plus every string made by deleting up to max_distance of its characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+class WordIndex:
+    """Prefix completion and bounded edit-distance correction over a vocabulary."""
+
+    def __init__(self, words, max_distance=1, fuzzy_words=100000):
+        """
+        Args:
+            words: Vocabulary in frequency order (most frequent first)
+            max_distance: Largest edit distance returned by corrections
+            fuzzy_words: Index this many of the most frequent words for
+                corrections (0 disables corrections)
+        """
+        self.words = words
+        self.max_distance = max_distance
+        self.fuzzy_words = min(fuzzy_words, len(words))
+
+        order = sorted(range(len(words)), key=words.__getitem__)
+        self.sorted_words = [words[i] for i in order]
+        self.sorted_ranks = np.array(order, dtype=np.int32)
+
+        # variant -> rank, or list of ranks when several words share the variant
+        self._deletes = {}
+        for rank in range(self.fuzzy_words):
+            for variant in deletes(words[rank], max_distance):
+                existing = self._deletes.get(variant)
+                if existing is None:
+                    self._deletes[variant] = rank
+                elif isinstance(existing, list):
+                    existing.append(rank)
+                else:
+                    self._deletes[variant] = [existing, rank]
+        # Estimated once: the sorted list and ranks, plus the delete dict and its keys
+        self.nbytes = (sys.getsizeof(self.sorted_words) + self.sorted_ranks.nbytes
+                       + sys.getsizeof(self._deletes) + sum(sys.getsizeof(key) for key in self._deletes))
+
+    def __len__(self):
+        return len(self.words)
+
+    def complete(self, prefix, limit=10):
+        """
+        Return the most frequent words starting with prefix, most frequent first.
+
+        Args:
+            prefix: Non-empty prefix to complete
+            limit: Largest number of words returned
+        """
+        if not prefix or limit <= 0:
+            return []
+        start = bisect.bisect_left(self.sorted_words, prefix)
+        end = bisect.bisect_left(self.sorted_words, prefix + MAX_CHAR, lo=start)
+        ranks = self.sorted_ranks[start:end]
+        if len(ranks) > limit:
+            ranks = np.partition(ranks, limit - 1)[:limit]
+        return [self.words[rank] for rank in np.sort(ranks).tolist()]
+
+    def correct(self, word, limit=10):
+        """
+        Return indexed words within max_distance edits of word.
+
+        Returns:
+            List of {'word': ..., 'distance': ...} dicts, closest first and then
+            most frequent first; an exact match is included with distance 0
+        """
+        if not word or limit <= 0 or not self._deletes:
+            return []
+        candidates = set()
+        for variant in deletes(word, self.max_distance):
+            found = self._deletes.get(variant)
+            if found is None:
+                continue
+            if isinstance(found, list):
+                candidates.update(found)
+            else:
+                candidates.add(found)
+
+        matches = []
+        for rank in candidates:
+            distance = edit_distance(word, self.words[rank], self.max_distance)
+            if distance <= self.max_distance:
+                matches.append((distance, rank))
+        matches.sort()
+        return [{'word': self.words[rank], 'distance': distance} for distance, rank in matches[:limit]]
+
+    def suggest(self, word, limit=5):
+        """
+        "Did you mean" candidates for a word missing from the vocabulary.
+
+        Corrections come first (closest, then most frequent), followed by
+        completions of word as a prefix.
+        """
+        suggestions = [match['word'] for match in self.correct(word, limit)]
+        for completion in self.complete(word, limit):
+            if len(suggestions) >= limit:
+                break
+            if completion not in suggestions:
+                suggestions.append(completion)
+        return suggestions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a word index for a model and time its lookups.")
+    parser.add_argument("model", help="gensim downloader name, model file, word vector CSV or store directory")
+    parser.add_argument("--fuzzy-words", type=int, default=100000, help="most frequent words indexed for corrections")
+    parser.add_argument("--max-distance", type=int, default=1, help="largest edit distance for corrections")
+    parser.add_argument("--queries", type=int, default=1000, help="lookups timed per kind")
+    args = parser.parse_args()
+
+    from model_registry import load_engine
+
+    print(f"1. Loading vocabulary: {args.model}")
+    engine, _ = load_engine(args.model)
+    words = engine.words
+    print(f"   {len(words)} words")
+
+    print(f"2. Building the index ({args.fuzzy_words} words for corrections, distance {args.max_distance})...")
+    start = time.perf_counter()
+    index = WordIndex(words, max_distance=args.max_distance, fuzzy_words=args.fuzzy_words)
+    print(f"   Done in {time.perf_counter() - start:.2f}s, about {index.nbytes / (1024 * 1024):.0f} MB")
+
+    # Queries: prefixes and one-character typos of frequent words
+    rng = np.random.default_rng(0)
+    sample = [words[i] for i in rng.integers(0, min(len(words), args.fuzzy_words), size=args.queries).tolist()]
+    prefixes = [word[:max(1, len(word) // 2)] for word in sample]
+    typos = [word[:-1] + ('x' if word[-1] != 'x' else 'y') for word in sample]
+
+    print("3. Timing lookups...")
+    for label, lookup, queries in [("complete", index.complete, prefixes), ("correct", index.correct, typos),
+                                   ("suggest", index.suggest, typos)]:
+        start = time.perf_counter()
+        for query in queries:
+            lookup(query)
+        per_query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"   {label:<10} {per_query_ms:.3f} ms per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Streaming corpus reader for Word2Vec training.
+
+Reads a whitespace-tokenized text file (optionally gzip-compressed, like
+text8) in fixed-size byte buffers and yields fixed-length sentences lazily,
+so memory use does not grow with the size of the corpus.
+"""
+
+import gzip
+
+WHITESPACE = (b" ", b"\n", b"\t", b"\r")
+
+
+class StreamingCorpus:
+    """
+    Restartable iterable of sentences (lists of words) read from a text file.
+
+    gensim iterates over the corpus several times (once to build the
+    vocabulary, then once per training epoch); every iteration re-opens the
+    file and streams it from the start.
+    """
+
+    def __init__(self, path, sentence_length=1000, buffer_size=1 << 20):
+        """
+        Args:
+            path: Path to the corpus (.gz files are decompressed on the fly)
+            sentence_length: Number of words per yielded sentence
+            buffer_size: Number of bytes read from the file at a time
+        """
+        self.path = path
+        self.sentence_length = sentence_length
+        self.buffer_size = buffer_size
+
+    def _open(self):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, "rb")
+        return open(self.path, "rb")
+
+    def chunks(self):
+        """Yield decoded text, one piece per buffer, always cut at whitespace."""
+        leftover = b""
+        previous = None
+        with self._open() as f:
+            while True:
+                chunk = f.read(self.buffer_size)
+                if not chunk:
+                    break
+                chunk = leftover + chunk
+
+                # The last token may continue in the next buffer (and may end
+                # in a partial UTF-8 character), so hold it back until then
+                cut = max(chunk.rfind(space) for space in WHITESPACE) + 1
+                leftover = chunk[cut:]
+                if cut:
+                    # One piece behind, so the file's final token (with no
+                    # whitespace after it) joins the last piece rather than
+                    # becoming a one-word piece of its own
+                    if previous is not None:
+                        yield previous.decode("utf-8")
+                    previous = chunk[:cut]
+
+        if previous is not None or leftover:
+            yield ((previous or b"") + leftover).decode("utf-8")
+
+    def words(self):
+        """Yield lists of words, one list per buffer read from the file."""
+        for text in self.chunks():
+            yield text.split()
+
+    def __iter__(self):
+        length = self.sentence_length
+        pending = []
+        for words in self.words():
+            pending.extend(words)
+            start = 0
+            while len(pending) - start >= length:
+                yield pending[start:start + length]
+                start += length
+            pending = pending[start:]
+        if pending:
+            yield pending
@@ -7,86 +7,278 @@ Converts CSV file with format:
 To JSON format:
   {
     "words": ["word1", "word2", ...],
-    "vectors": [[dim0, dim1, ...], [dim0, dim1, ...], ...]
+    "vectors": [[dim0, dim1, ...], [dim0, dim1, ...], ...],
+    "inv_norms": [1/|vector1|, 1/|vector2|, ...]
   }
+
+The inverse norm table (0 for an all-zero vector) lets the web app score
+cosine similarity with one dot product per word instead of recomputing both
+magnitudes on every search.
+
+With --stream, the CSV is read in chunks and the JSON document is written
+incrementally, so memory use stays flat however large the CSV is.
+
+Or, with --format binary, to a packed binary format the web app can load
+into a Float32Array without parsing JSON (see web-app/src/utils/binaryVectors.js):
+  <name>.meta.json     {"count", "dimensions", "dtype", "words", "vectors", "scales", "inv_norms"}
+  <name>.words.txt     one word per line
+  <name>.vectors.bin   little-endian float32 (or int8 with --quantize int8), row-major
+  <name>.scales.bin    little-endian float32 scale per vector (int8 only)
+  <name>.inv_norms.bin little-endian float32 inverse norm per vector
 """
 
-import pandas as pd
+import numpy as np
+import argparse
 import json
-import sys
 import os
+import shutil
+import tempfile
+
+
+def read_vectors(csv_path):
+    """Read a word vector CSV and return (words, vectors)."""
+    # pandas takes about half a second to import, so it is only loaded when a CSV is read
+    import pandas as pd
+    # Keep words like "nan" or "null" as strings instead of parsing them as missing values
+    df = pd.read_csv(csv_path, dtype={'word': str}, keep_default_na=False)
+    words = df['word'].tolist()
+
+    # Get all dimension columns
+    dim_columns = [col for col in df.columns if col.startswith('dim_')]
+    # Sort by dimension number to ensure correct order
+    dim_columns.sort(key=lambda x: int(x.split('_')[1]))
+
+    return words, df[dim_columns].to_numpy(dtype=np.float64)
+
+
+def dim_columns_of(csv_path):
+    """Return the CSV's dim_N column names, sorted by dimension number."""
+    import pandas as pd
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    dim_columns = [col for col in columns if col.startswith('dim_')]
+    dim_columns.sort(key=lambda x: int(x.split('_')[1]))
+    return dim_columns
+
+
+def format_rows(vectors, decimals=6):
+    """
+    Format a block of vectors as JSON arrays, rounding every value at once.
+
+    "%.6f" rounds each float correctly, like round(val, 6), and trailing zeros
+    are then removed ("0.5", "-1.2207", "0"), so the output parses to the same
+    numbers as the non-streaming conversion.
+    """
+    text = np.char.mod(f"%.{decimals}f", vectors)
+    text = np.char.rstrip(np.char.rstrip(text, "0"), ".")
+    # Tiny negative values round to "-0"
+    text[text == "-0"] = "0"
+    return ["[" + ",".join(row) + "]" for row in text.tolist()]
+
+
+def inverse_norms(vectors):
+    """Return 1/|v| for each row of vectors, with 0 for all-zero rows."""
+    norms = np.linalg.norm(vectors, axis=1)
+    inv = np.zeros_like(norms)
+    np.divide(1.0, norms, out=inv, where=norms > 0)
+    return inv
+
+
+def format_inverse_norms(vectors):
+    """Format the inverse norm of each vector to float32 precision."""
+    return np.char.mod("%.8g", inverse_norms(vectors)).tolist()
+
+
+def stream_csv_to_json(csv_path, json_path, chunk_size=10000):
+    """
+    Write the {"words": [...], "vectors": [...], "inv_norms": [...]} document chunk by chunk.
+
+    The CSV is read twice, once for the words and once for the vectors, so
+    only one chunk is in memory at a time. The inverse norms are computed
+    alongside the vectors and spooled to a temporary file until the vectors
+    are written.
+
+    Returns:
+        Number of words written
+    """
+    import pandas as pd
+    dim_columns = dim_columns_of(csv_path)
+    count = 0
+    with open(json_path, "w") as f:
+        f.write('{"words":[')
+        for chunk in pd.read_csv(csv_path, usecols=['word'], dtype={'word': str},
+                                 keep_default_na=False, chunksize=chunk_size):
+            if count:
+                f.write(",")
+            f.write(",".join(json.dumps(word) for word in chunk['word']))
+            count += len(chunk)
+
+        f.write('],"vectors":[')
+        first = True
+        with tempfile.TemporaryFile("w+") as norms_file:
+            for chunk in pd.read_csv(csv_path, usecols=dim_columns, chunksize=chunk_size):
+                vectors = chunk[dim_columns].to_numpy(dtype=np.float64)
+                if not first:
+                    f.write(",")
+                    norms_file.write(",")
+                f.write(",".join(format_rows(vectors)))
+                norms_file.write(",".join(format_inverse_norms(vectors)))
+                first = False
+            f.write('],"inv_norms":[')
+            norms_file.seek(0)
+            shutil.copyfileobj(norms_file, f)
+        f.write("]}")
+    return count
+
+
+def quantize_int8(vectors):
+    """
+    Quantize each vector to int8 with its own scale.
 
-def csv_to_json(csv_path="word_vectors_trained.csv", json_path=None):
+    Returns (codes, scales) such that vectors ~= codes * scales[:, None].
     """
-    Convert CSV to JSON format.
-    
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def write_binary(words, vectors, base_path, quantize=None):
+    """
+    Write the packed binary format.
+
+    Args:
+        words: List of words
+        vectors: Array of shape (len(words), dimensions)
+        base_path: Output path without extension
+        quantize: None for float32, or 'int8' for per-vector int8 quantization
+
+    Returns:
+        Path of the .meta.json file
+    """
+    if any("\n" in word for word in words):
+        raise ValueError("Words containing newlines cannot be stored in a .words.txt file")
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    name = os.path.basename(base_path)
+    meta = {
+        "count": len(words),
+        "dimensions": int(vectors.shape[1]),
+        "dtype": "int8" if quantize == "int8" else "float32",
+        "words": f"{name}.words.txt",
+        "vectors": f"{name}.vectors.bin",
+        "inv_norms": f"{name}.inv_norms.bin"
+    }
+
+    os.makedirs(os.path.dirname(base_path) or ".", exist_ok=True)
+    with open(f"{base_path}.words.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(words))
+
+    if quantize == "int8":
+        codes, scales = quantize_int8(vectors)
+        codes.tofile(f"{base_path}.vectors.bin")
+        scales.astype("<f4").tofile(f"{base_path}.scales.bin")
+        meta["scales"] = f"{name}.scales.bin"
+        # Norms of the dequantized vectors the web app will actually score
+        norms_of = codes.astype(np.float32) * scales[:, None]
+    else:
+        vectors.astype("<f4").tofile(f"{base_path}.vectors.bin")
+        norms_of = vectors
+    inverse_norms(norms_of).astype("<f4").tofile(f"{base_path}.inv_norms.bin")
+
+    meta_path = f"{base_path}.meta.json"
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta_path
+
+
+def csv_to_json(csv_path="word_vectors_trained.csv", json_path=None, output_format="json", quantize=None,
+                stream=False, chunk_size=10000):
+    """
+    Convert CSV to JSON (or packed binary) format.
+
     Args:
         csv_path: Path to input CSV file
-        json_path: Path to output JSON file (default: same name as CSV with .json extension)
+        json_path: Path to output JSON file (default: same name as CSV with .json extension).
+            For the binary format, the extension is dropped and used as the base name.
+        output_format: 'json' or 'binary'
+        quantize: With the binary format, 'int8' stores int8 codes plus a per-vector scale
+        stream: Write JSON chunk by chunk with flat memory use
+        chunk_size: Rows per chunk when streaming
     """
     if json_path is None:
         json_path = csv_path.replace(".csv", ".json")
-    
+
     print("=" * 60)
     print("CSV to JSON Converter")
     print("=" * 60)
-    
+
     if not os.path.exists(csv_path):
         print(f"Error: CSV file not found: {csv_path}")
         return
-    
+
+    if stream and output_format == "json":
+        print(f"\n1. Streaming CSV to JSON in chunks of {chunk_size} rows: {csv_path} -> {json_path}")
+        count = stream_csv_to_json(csv_path, json_path, chunk_size=chunk_size)
+        print(f"\n✅ Successfully converted {count} words to {json_path}")
+        print(f"   File size: {os.path.getsize(json_path) / (1024*1024):.2f} MB")
+        return
+
     print(f"\n1. Reading CSV: {csv_path}")
-    df = pd.read_csv(csv_path)
-    
-    print(f"   Found {len(df)} words")
-    print(f"   Vector dimensions: {len(df.columns) - 1}")
-    
-    # Extract words and vectors
-    print("2. Extracting words and vectors...")
-    words = df['word'].tolist()
-    
-    # Get all dimension columns
-    dim_columns = [col for col in df.columns if col.startswith('dim_')]
-    # Sort by dimension number to ensure correct order
-    dim_columns.sort(key=lambda x: int(x.split('_')[1]))
-    
-    # Convert vectors to list of lists
-    vectors = df[dim_columns].values.tolist()
-    
+    words, vectors = read_vectors(csv_path)
+
+    print(f"   Found {len(words)} words")
+    print(f"   Vector dimensions: {vectors.shape[1]}")
+
+    if output_format == "binary":
+        base_path = os.path.splitext(json_path)[0]
+        print(f"2. Writing packed {quantize or 'float32'} vectors: {base_path}.*")
+        meta_path = write_binary(words, vectors, base_path, quantize=quantize)
+        total_size = sum(os.path.getsize(f"{base_path}.{suffix}")
+                         for suffix in ["meta.json", "words.txt", "vectors.bin", "scales.bin", "inv_norms.bin"]
+                         if os.path.exists(f"{base_path}.{suffix}"))
+        print(f"\n✅ Successfully converted {len(words)} words to {meta_path}")
+        print(f"   Total size: {total_size / (1024*1024):.2f} MB")
+        return
+
     # Convert numpy float types to Python floats for JSON serialization
     # Round to 6 decimal places to reduce file size while maintaining precision
-    print("3. Converting and optimizing vectors...")
-    vectors = [[round(float(val), 6) for val in vec] for vec in vectors]
-    
+    print("2. Converting and optimizing vectors...")
+    inv_norms = [float(norm) for norm in format_inverse_norms(vectors)]
+    vectors = [[round(float(val), 6) for val in vec] for vec in vectors.tolist()]
+
     # Create JSON structure
-    print("4. Creating JSON structure...")
+    print("3. Creating JSON structure...")
     json_data = {
         "words": words,
-        "vectors": vectors
+        "vectors": vectors,
+        "inv_norms": inv_norms
     }
-    
+
     # Save to JSON (compact format, no indentation to reduce file size)
-    print(f"5. Saving JSON (compact format): {json_path}")
+    print(f"4. Saving JSON (compact format): {json_path}")
     with open(json_path, 'w') as f:
         json.dump(json_data, f, separators=(',', ':'))  # Compact: no spaces
-    
+
     print(f"\n✅ Successfully converted {len(words)} words to {json_path}")
     print(f"   File size: {os.path.getsize(json_path) / (1024*1024):.2f} MB")
-    
+
     # Show sample
     print(f"\nSample data:")
     print(f"   First word: {words[0]}")
     print(f"   First vector (first 5 dims): {vectors[0][:5]}")
 
 if __name__ == "__main__":
-    csv_path = "word_vectors_trained.csv"
-    json_path = None
-    
-    if len(sys.argv) > 1:
-        csv_path = sys.argv[1]
-    
-    if len(sys.argv) > 2:
-        json_path = sys.argv[2]
-    
-    csv_to_json(csv_path, json_path)
+    parser = argparse.ArgumentParser(description="Convert a word vector CSV for the web app.")
+    parser.add_argument("csv_path", nargs="?", default="word_vectors_trained.csv")
+    parser.add_argument("json_path", nargs="?", default=None,
+                        help="output path (default: CSV name with .json; binary drops the extension)")
+    parser.add_argument("--format", choices=["json", "binary"], default="json", dest="output_format")
+    parser.add_argument("--quantize", choices=["int8"], default=None,
+                        help="with --format binary, store int8 codes and a per-vector scale")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the CSV in chunks and write JSON incrementally (flat memory use)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per chunk with --stream")
+    args = parser.parse_args()
 
+    csv_to_json(args.csv_path, args.json_path, output_format=args.output_format, quantize=args.quantize,
+                stream=args.stream, chunk_size=args.chunk_size)
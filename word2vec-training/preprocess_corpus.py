@@ -0,0 +1,155 @@
+"""
+Tokenize a corpus once and cache the result for repeated training runs.
+
+The input (plain text or .gz) is streamed in shards that are tokenized and
+normalized in a process pool. The output is a single line-per-sentence file
+that gensim can train from with corpus_file=..., which lets every training
+worker read its own part of the file instead of sharing one Python iterator.
+
+The cache entry lives in <cache_dir>/<key>/, where key is a hash of the
+input file contents and the preprocessing settings, so a repeat run with the
+same input skips straight to training.
+
+Usage:
+  python preprocess_corpus.py <corpus_path> [--cache-dir .corpus_cache] [--workers N]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from corpus import StreamingCorpus
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+# Bump when tokenization changes so old cache entries are not reused
+TOKENIZER_VERSION = 2
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+CACHE_DIR = ".corpus_cache"
+CORPUS_FILE = "corpus.txt"
+MANIFEST_FILE = "manifest.json"
+
+
+def file_hash(path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(corpus_path, sentence_length, lowercase):
+    """Key identifying a preprocessed corpus: input contents plus settings."""
+    settings = f"{TOKENIZER_VERSION}:{sentence_length}:{int(lowercase)}"
+    return hashlib.sha256(f"{file_hash(corpus_path)}:{settings}".encode()).hexdigest()[:16]
+
+
+def tokenize_shard(text, shard_path, sentence_length, lowercase):
+    """
+    Tokenize one shard of text and write it as line-per-sentence text.
+
+    Runs in a worker process. Returns (sentences, tokens) written.
+    """
+    if lowercase:
+        text = text.lower()
+    tokens = TOKEN_PATTERN.findall(text)
+    with open(shard_path, "w", encoding="utf-8") as f:
+        for start in range(0, len(tokens), sentence_length):
+            f.write(" ".join(tokens[start:start + sentence_length]))
+            f.write("\n")
+    return (len(tokens) + sentence_length - 1) // sentence_length, len(tokens)
+
+
+def preprocess_corpus(corpus_path, cache_dir=CACHE_DIR, sentence_length=1000, lowercase=True,
+                      workers=None, shard_size=16 << 20):
+    """
+    Return the path of a cached, tokenized copy of corpus_path, creating it if needed.
+
+    Args:
+        corpus_path: Input text file (.gz allowed)
+        cache_dir: Root directory for cache entries
+        sentence_length: Maximum tokens per output line
+        lowercase: Lowercase text before tokenizing
+        workers: Tokenizer processes (default: all available cores)
+        shard_size: Bytes of input text per shard
+
+    Returns:
+        Path to the line-per-sentence corpus file
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    key = cache_key(corpus_path, sentence_length, lowercase)
+    entry_dir = os.path.join(cache_dir, key)
+    output_path = os.path.join(entry_dir, CORPUS_FILE)
+    if os.path.exists(os.path.join(entry_dir, MANIFEST_FILE)):
+        print(f"   Using cached tokenized corpus: {output_path}")
+        return output_path
+
+    print(f"   Tokenizing {corpus_path} with {workers} worker(s)...")
+    start = time.perf_counter()
+    # Build in a temporary directory and rename it into place at the end, so an
+    # interrupted run never leaves a half-written entry that looks complete
+    work_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    os.makedirs(work_dir, exist_ok=True)
+
+    shard_paths = []
+    shard_stats = []
+    reader = StreamingCorpus(corpus_path, buffer_size=shard_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for text in reader.chunks():
+            shard_path = os.path.join(work_dir, f"shard_{len(shard_paths):05d}.txt")
+            shard_paths.append(shard_path)
+            pending.append(pool.submit(tokenize_shard, text, shard_path, sentence_length, lowercase))
+            # Bound the number of shards held in memory at once
+            while len(pending) >= 2 * workers:
+                shard_stats.append(pending.pop(0).result())
+        shard_stats.extend(future.result() for future in pending)
+
+    # gensim's corpus_file mode reads a single file, so join the shards in order
+    with open(os.path.join(work_dir, CORPUS_FILE), "wb") as out:
+        for shard_path in shard_paths:
+            with open(shard_path, "rb") as shard:
+                shutil.copyfileobj(shard, out)
+            os.remove(shard_path)
+
+    manifest = {
+        "source": os.path.abspath(corpus_path),
+        "key": key,
+        "tokenizer_version": TOKENIZER_VERSION,
+        "sentence_length": sentence_length,
+        "lowercase": lowercase,
+        "shards": len(shard_paths),
+        "sentences": sum(sentences for sentences, _ in shard_stats),
+        "tokens": sum(tokens for _, tokens in shard_stats),
+        "seconds": time.perf_counter() - start
+    }
+    with open(os.path.join(work_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    if os.path.exists(entry_dir):
+        shutil.rmtree(entry_dir)
+    os.rename(work_dir, entry_dir)
+    print(f"   Wrote {manifest['tokens']} tokens in {manifest['sentences']} sentences "
+          f"from {manifest['shards']} shard(s) in {manifest['seconds']:.2f}s")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokenize and cache a corpus for training.")
+    parser.add_argument("corpus", help="input text file (.gz allowed)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--sentence-length", type=int, default=1000)
+    parser.add_argument("--no-lowercase", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="tokenizer processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=16 << 20, help="bytes of text per shard")
+    args = parser.parse_args()
+
+    path = preprocess_corpus(args.corpus, cache_dir=args.cache_dir, sentence_length=args.sentence_length,
+                             lowercase=not args.no_lowercase, workers=args.workers,
+                             shard_size=args.shard_size)
+    print(f"\n✅ Tokenized corpus: {path}")
@@ -0,0 +1,40 @@
+import gzip
+from corpus import StreamingCorpus
+
+TEXT = "the quick brown fox jumps over the lazy dog\nnaïve café words"
+
+
+def write(path, text):
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def test_tokens_straddling_buffers_are_kept_whole(tmp_path):
+    # 4-byte buffers split most words, and "naïve" / "café" inside a UTF-8 character
+    corpus = StreamingCorpus(write(tmp_path / "corpus.txt", TEXT), sentence_length=4, buffer_size=4)
+    chunks = list(corpus.chunks())
+    assert "".join(chunks) == TEXT
+    assert [word for chunk in chunks for word in chunk.split()] == TEXT.split()
+
+
+def test_final_token_joins_the_last_chunk(tmp_path):
+    # No whitespace after "words", so it is still held back when the file ends
+    corpus = StreamingCorpus(write(tmp_path / "corpus.txt", TEXT), buffer_size=16)
+    chunks = list(corpus.chunks())
+    assert len(chunks[-1].split()) > 1
+    assert chunks[-1].endswith("café words")
+
+
+def test_every_pass_yields_the_same_sentences(tmp_path):
+    corpus = StreamingCorpus(write(tmp_path / "corpus.txt", TEXT), sentence_length=4, buffer_size=7)
+    first = list(corpus)
+    assert first == list(corpus)
+    words = TEXT.split()
+    assert first == [words[i:i + 4] for i in range(0, len(words), 4)]
+
+
+def test_reads_gzip(tmp_path):
+    path = tmp_path / "corpus.txt.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(TEXT)
+    assert [word for sentence in StreamingCorpus(str(path), buffer_size=5) for word in sentence] == TEXT.split()
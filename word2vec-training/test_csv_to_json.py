@@ -0,0 +1,87 @@
+import json
+import numpy as np
+import pytest
+from csv_to_json import csv_to_json, write_binary
+
+WORDS = ['king', 'queen', 'nan', 'a,b', 'zero']
+
+
+def write_csv(path, n_filler=0, dimensions=6, seed=0):
+    """A word vector CSV with an all-zero last vector; returns (path, words, vectors)."""
+    words = WORDS[:-1] + [f'w{i}' for i in range(n_filler)] + WORDS[-1:]
+    vectors = np.random.default_rng(seed).standard_normal((len(words), dimensions))
+    vectors[-1] = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('word,' + ','.join(f'dim_{d}' for d in range(dimensions)) + '\n')
+        for word, row in zip(words, vectors):
+            field = f'"{word}"' if ',' in word else word
+            f.write(field + ',' + ','.join(repr(float(value)) for value in row) + '\n')
+    return str(path), words, vectors
+
+
+def read_binary(base_path):
+    with open(f'{base_path}.meta.json') as f:
+        meta = json.load(f)
+    with open(f'{base_path}.words.txt', encoding='utf-8') as f:
+        words = f.read().split('\n')
+    dtype = '<f4' if meta['dtype'] == 'float32' else np.int8
+    data = np.fromfile(f'{base_path}.vectors.bin', dtype=dtype).reshape(meta['count'], meta['dimensions'])
+    if meta['dtype'] == 'int8':
+        data = data * np.fromfile(f'{base_path}.scales.bin', dtype='<f4')[:, None]
+    inv_norms = np.fromfile(f'{base_path}.inv_norms.bin', dtype='<f4')
+    return meta, words, data, inv_norms
+
+
+def test_binary_float32_round_trip(tmp_path):
+    csv_path, words, vectors = write_csv(tmp_path / 'vectors.csv')
+    csv_to_json(csv_path, str(tmp_path / 'out' / 'top.json'), output_format='binary')
+    meta, read_words, data, inv_norms = read_binary(tmp_path / 'out' / 'top')
+    assert (meta['count'], meta['dimensions'], meta['dtype']) == (len(words), 6, 'float32')
+    assert 'scales' not in meta
+    assert read_words == words
+    np.testing.assert_array_equal(data, vectors.astype(np.float32))
+    np.testing.assert_allclose(inv_norms[:-1], 1 / np.linalg.norm(vectors[:-1], axis=1), rtol=1e-6)
+    assert inv_norms[-1] == 0
+
+
+def test_binary_int8_round_trip(tmp_path):
+    csv_path, words, vectors = write_csv(tmp_path / 'vectors.csv')
+    csv_to_json(csv_path, str(tmp_path / 'top.json'), output_format='binary', quantize='int8')
+    meta, read_words, data, inv_norms = read_binary(tmp_path / 'top')
+    assert meta['dtype'] == 'int8'
+    assert read_words == words
+    # Each value is within half a quantization step of its row's scale
+    steps = np.abs(vectors).max(axis=1, keepdims=True) / 127
+    assert (np.abs(data - vectors) <= steps / 2 + 1e-6).all()
+    assert not data[-1].any()
+    # The inverse norms are those of the dequantized vectors the app scores
+    np.testing.assert_allclose(inv_norms[:-1], 1 / np.linalg.norm(data[:-1], axis=1), rtol=1e-6)
+
+
+def test_json_includes_inverse_norms(tmp_path):
+    csv_path, words, vectors = write_csv(tmp_path / 'vectors.csv')
+    csv_to_json(csv_path, str(tmp_path / 'out.json'))
+    with open(tmp_path / 'out.json') as f:
+        document = json.load(f)
+    assert document['words'] == words
+    np.testing.assert_allclose(document['vectors'], vectors, atol=5e-7)
+    np.testing.assert_allclose(document['inv_norms'][:-1], 1 / np.linalg.norm(vectors[:-1], axis=1), rtol=1e-7)
+    assert document['inv_norms'][-1] == 0
+
+
+def test_binary_rejects_words_with_newlines(tmp_path):
+    with pytest.raises(ValueError):
+        write_binary(['two\nlines'], np.zeros((1, 2)), str(tmp_path / 'top'))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_streamed_json_equals_the_in_memory_conversion(tmp_path, chunk_size):
+    csv_path, words, _ = write_csv(tmp_path / 'vectors.csv', n_filler=10)
+    csv_to_json(csv_path, str(tmp_path / 'memory.json'))
+    csv_to_json(csv_path, str(tmp_path / 'stream.json'), stream=True, chunk_size=chunk_size)
+    with open(tmp_path / 'memory.json') as f:
+        expected = json.load(f)
+    with open(tmp_path / 'stream.json') as f:
+        streamed = json.load(f)
+    assert streamed['words'] == words
+    assert streamed == expected
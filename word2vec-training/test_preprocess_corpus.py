@@ -0,0 +1,47 @@
+import json
+import os
+from preprocess_corpus import MANIFEST_FILE, preprocess_corpus
+
+TEXT = "The King's horse ran.\nA queen, a prince and a princess followed the horse home"
+
+
+def run(corpus_path, cache_dir, **kwargs):
+    return preprocess_corpus(str(corpus_path), cache_dir=str(cache_dir), sentence_length=5, workers=1, **kwargs)
+
+
+def test_tokenizes_into_sentences(tmp_path):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text(TEXT, encoding="utf-8")
+    output = run(corpus_path, tmp_path / "cache", shard_size=32)
+    lines = open(output, encoding="utf-8").read().splitlines()
+    tokens = [token for line in lines for token in line.split()]
+    assert tokens == ["the", "king's", "horse", "ran", "a", "queen", "a", "prince", "and", "a",
+                      "princess", "followed", "the", "horse", "home"]
+    assert all(len(line.split()) <= 5 for line in lines)
+    # The final "home" has no whitespace after it but stays in the last shard's sentence
+    assert lines[-1].split()[-2:] == ["horse", "home"]
+    manifest = json.load(open(os.path.join(os.path.dirname(output), MANIFEST_FILE)))
+    assert (manifest["tokens"], manifest["sentences"]) == (15, len(lines))
+
+
+def test_second_run_uses_the_cache(tmp_path, capsys):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text(TEXT, encoding="utf-8")
+    first = run(corpus_path, tmp_path / "cache")
+    modified = os.path.getmtime(first)
+    capsys.readouterr()
+    assert run(corpus_path, tmp_path / "cache") == first
+    assert "Using cached tokenized corpus" in capsys.readouterr().out
+    assert os.path.getmtime(first) == modified
+
+
+def test_changed_input_or_settings_miss_the_cache(tmp_path):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text(TEXT, encoding="utf-8")
+    first = run(corpus_path, tmp_path / "cache")
+    assert run(corpus_path, tmp_path / "cache", lowercase=False) != first
+    corpus_path.write_text(TEXT + " again", encoding="utf-8")
+    second = run(corpus_path, tmp_path / "cache")
+    assert second != first
+    assert open(second, encoding="utf-8").read().split()[-1] == "again"
+    assert len(os.listdir(tmp_path / "cache")) == 3
@@ -1,81 +1,220 @@
 """
 Train a Word2Vec model using the text8 corpus.
 
-This script downloads the text8 corpus and trains a Word2Vec model
-with the specified parameters.
+This script downloads the text8 corpus (or reads a local corpus file) and
+trains a Word2Vec model with the given parameters. Throughput is reported
+per epoch, and a JSON summary of timings and vocabulary size is written
+next to the saved model.
+
+With --preprocess the corpus is tokenized once into a cached
+line-per-sentence file (see preprocess_corpus.py) and gensim trains from it
+in corpus_file mode; repeat runs reuse the cache.
+
+Usage:
+  python train_word2vec.py [--corpus PATH] [--output word2vec_model.model]
+                           [--vector-size 50] [--window 5] [--min-count 30]
+                           [--workers N] [--max-final-vocab 5000] [--epochs 5]
+                           [--preprocess] [--cache-dir .corpus_cache]
 """
 
-from gensim.models import Word2Vec
-from gensim import downloader as api
+from corpus import StreamingCorpus
+from preprocess_corpus import preprocess_corpus, CACHE_DIR
+import argparse
+import json
 import os
-import gzip
+import time
+
+
+class EpochLogger:
+    """
+    Report words/sec for every training epoch.
+
+    Implements gensim's CallbackAny2Vec interface without subclassing it, so
+    gensim is not imported until training starts.
+    """
+
+    def __init__(self):
+        self.epochs = []
+        self._start = None
+
+    def on_train_begin(self, model):
+        pass
+
+    def on_train_end(self, model):
+        pass
+
+    def on_batch_begin(self, model):
+        pass
+
+    def on_batch_end(self, model):
+        pass
+
+    def on_epoch_begin(self, model):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, model):
+        seconds = time.perf_counter() - self._start
+        words_per_sec = model.corpus_total_words / seconds if seconds > 0 else 0.0
+        self.epochs.append({
+            'epoch': len(self.epochs) + 1,
+            'seconds': seconds,
+            'words_per_sec': words_per_sec
+        })
+        print(f"   Epoch {len(self.epochs)}/{model.epochs}: {seconds:.2f}s, {words_per_sec:,.0f} words/sec")
+
+
+def summary_path(output_file):
+    """Path of the JSON training summary written next to output_file."""
+    return os.path.splitext(output_file)[0] + ".summary.json"
+
+
+def train_word2vec(corpus_path=None, output_file="word2vec_model.model", vector_size=50,
+                   window=5, min_count=30, workers=None, max_final_vocab=5000, epochs=5,
+                   sentence_length=1000, preprocess=False, cache_dir=CACHE_DIR):
+    """
+    Train a Word2Vec model on the text8 corpus or a local corpus file.
+
+    Args:
+        corpus_path: Whitespace-tokenized text file (.gz allowed); downloads text8 if None
+        output_file: Where to save the trained model
+        vector_size: Dimensions of each word vector
+        window: Context window size on each side of a word
+        min_count: Ignore words that appear fewer times than this
+        workers: Training threads (default: all available cores)
+        max_final_vocab: Cap on the vocabulary size (None for no cap)
+        epochs: Passes over the corpus
+        sentence_length: Words per sentence when splitting the corpus
+        preprocess: Tokenize into a cached file and train with gensim's corpus_file mode
+        cache_dir: Where preprocessed corpora are cached
+    """
+    # gensim takes over a second to import, so `--help` and importing this module skip it
+    from gensim.models import Word2Vec
+
+    if workers is None:
+        workers = os.cpu_count() or 1
 
-def train_word2vec():
-    """Train a Word2Vec model on the text8 corpus."""
-    
     print("=" * 60)
     print("Word2Vec Training Script")
     print("=" * 60)
-    
-    # Download text8 corpus
-    print("\n1. Downloading text8 corpus...")
-    corpus_path = api.load("text8", return_path=True)
-    print(f"   Corpus downloaded to: {corpus_path}")
-    
-    # Read the corpus (text8 is a single line of space-separated words, compressed as .gz)
-    print("\n2. Loading corpus...")
-    with gzip.open(corpus_path, 'rt', encoding='utf-8') as f:
-        text = f.read()
-    
-    # Split into sentences (text8 is already tokenized, so we split by spaces)
-    # For Word2Vec, we need a list of sentences, where each sentence is a list of words
-    # text8 is one long line, so we'll split it into chunks of ~1000 words per sentence
-    print("3. Preparing sentences...")
-    words = text.split()
-    chunk_size = 1000
-    corpus = []
-    for i in range(0, len(words), chunk_size):
-        sentence = words[i:i + chunk_size]
-        corpus.append(sentence)
-    
-    print(f"   Created {len(corpus)} sentences from {len(words)} words")
-    
+
+    total_start = time.perf_counter()
+
+    if corpus_path is None:
+        # Download text8 corpus
+        from gensim import downloader as api
+        print("\n1. Downloading text8 corpus...")
+        corpus_path = api.load("text8", return_path=True)
+        print(f"   Corpus downloaded to: {corpus_path}")
+    else:
+        print(f"\n1. Using local corpus: {corpus_path}")
+        if not os.path.exists(corpus_path):
+            print(f"Error: Corpus file not found: {corpus_path}")
+            return None
+
+    preprocess_seconds = 0.0
+    if preprocess:
+        # Tokenized line-per-sentence file, cached by input hash; gensim splits it
+        # between its worker threads, avoiding the single Python iterator
+        print("\n2. Preprocessing corpus...")
+        start = time.perf_counter()
+        corpus_file = preprocess_corpus(corpus_path, cache_dir=cache_dir,
+                                        sentence_length=sentence_length, workers=workers)
+        preprocess_seconds = time.perf_counter() - start
+        corpus_args = {'corpus_file': corpus_file}
+    else:
+        # Stream the corpus (text8 is a single line of space-separated words, compressed as .gz)
+        # For Word2Vec, we need an iterable of sentences, where each sentence is a list of words
+        # text8 is one long line, so the reader splits it into chunks of 1000 words per sentence
+        # and re-reads the file for every pass gensim makes, instead of holding it in memory
+        print("\n2. Preparing streaming corpus reader...")
+        corpus_args = {'corpus_iterable': StreamingCorpus(corpus_path, sentence_length=sentence_length)}
+
     # Train Word2Vec model
-    print("\n4. Training Word2Vec model...")
+    print("\n3. Training Word2Vec model...")
     print("   Parameters:")
-    print("   - vector_size: 50")
-    print("   - window: 5")
-    print("   - min_count: 30")
-    print("   - workers: 4")
-    print("   - max_final_vocab: 5000")
-    print("\n   Training (this may take a few minutes)...")
-    
+    print(f"   - vector_size: {vector_size}")
+    print(f"   - window: {window}")
+    print(f"   - min_count: {min_count}")
+    print(f"   - workers: {workers}")
+    print(f"   - max_final_vocab: {max_final_vocab}")
+    print(f"   - epochs: {epochs}")
+
     model = Word2Vec(
-        corpus,              # your text8 sentences
-        vector_size=50,      # each word becomes a 50-dimension vector
-        window=5,            # context window of 5 words on each side
-        min_count=30,        # ignore words that appear <30 times
-        workers=4,           # train using 4 CPU threads
-        max_final_vocab=5000 # cap vocab around 5000 words
+        vector_size=vector_size,         # dimensions of each word vector
+        window=window,                   # context window on each side
+        min_count=min_count,             # ignore rare words
+        workers=workers,                 # CPU threads used for training
+        max_final_vocab=max_final_vocab, # cap vocabulary size
+        epochs=epochs
+    )
+
+    print("\n   Building vocabulary...")
+    start = time.perf_counter()
+    model.build_vocab(**corpus_args)
+    build_vocab_seconds = time.perf_counter() - start
+    print(f"   Read {model.corpus_count} sentences containing {model.corpus_total_words} words "
+          f"in {build_vocab_seconds:.2f}s")
+
+    print("\n   Training (this may take a few minutes)...")
+    epoch_logger = EpochLogger()
+    start = time.perf_counter()
+    trained_words, raw_words = model.train(
+        **corpus_args,
+        total_examples=model.corpus_count,
+        total_words=model.corpus_total_words,
+        epochs=model.epochs,
+        callbacks=[epoch_logger]
     )
-    
-    print("\n5. Training complete!")
+    train_seconds = time.perf_counter() - start
+
+    print("\n4. Training complete!")
     print(f"   Vocabulary size: {len(model.wv.key_to_index)}")
-    
+    print(f"   Training time: {train_seconds:.2f}s ({raw_words / train_seconds:,.0f} words/sec)")
+
     # Save the model
-    output_file = "word2vec_model.model"
-    print(f"\n6. Saving model to: {output_file}")
+    print(f"\n5. Saving model to: {output_file}")
     model.save(output_file)
     print(f"   Model saved successfully!")
-    
+
+    summary = {
+        'corpus': corpus_path,
+        'corpus_file': corpus_args.get('corpus_file'),
+        'output': output_file,
+        'parameters': {
+            'vector_size': vector_size,
+            'window': window,
+            'min_count': min_count,
+            'workers': workers,
+            'max_final_vocab': max_final_vocab,
+            'epochs': epochs,
+            'sentence_length': sentence_length,
+            'preprocess': preprocess
+        },
+        'vocabulary_size': len(model.wv.key_to_index),
+        'corpus_sentences': model.corpus_count,
+        'corpus_words': model.corpus_total_words,
+        'trained_words': trained_words,
+        'timings': {
+            'preprocess_seconds': preprocess_seconds,
+            'build_vocab_seconds': build_vocab_seconds,
+            'train_seconds': train_seconds,
+            'total_seconds': time.perf_counter() - total_start
+        },
+        'words_per_sec': raw_words / train_seconds if train_seconds > 0 else 0.0,
+        'epochs': epoch_logger.epochs
+    }
+    with open(summary_path(output_file), 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"   Training summary saved to: {summary_path(output_file)}")
+
     # Test the model
-    print("\n7. Testing the model...")
+    print("\n6. Testing the model...")
     if len(model.wv.key_to_index) > 0:
         # Get a sample word
         sample_word = list(model.wv.key_to_index.keys())[0]
         print(f"   Sample word: '{sample_word}'")
         print(f"   Vector shape: {model.wv[sample_word].shape}")
-        
+
         # Find most similar words
         if len(model.wv.key_to_index) > 1:
             try:
@@ -85,13 +224,44 @@ def train_word2vec():
                     print(f"     - {word}: {score:.4f}")
             except Exception as e:
                 print(f"   Could not find similar words: {e}")
-    
+
     print("\n" + "=" * 60)
     print("Training complete!")
     print("=" * 60)
-    
+
     return model
 
-if __name__ == "__main__":
-    model = train_word2vec()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train a Word2Vec model.")
+    parser.add_argument("--corpus", default=None,
+                        help="local whitespace-tokenized corpus (.gz allowed); downloads text8 if omitted")
+    parser.add_argument("--output", default="word2vec_model.model", help="where to save the model")
+    parser.add_argument("--vector-size", type=int, default=50)
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--min-count", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None, help="training threads (default: all cores)")
+    parser.add_argument("--max-final-vocab", type=int, default=5000, help="0 for no cap")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--sentence-length", type=int, default=1000)
+    parser.add_argument("--preprocess", action="store_true",
+                        help="tokenize into a cached file and train in gensim's corpus_file mode")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="where preprocessed corpora are cached")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    model = train_word2vec(
+        corpus_path=args.corpus,
+        output_file=args.output,
+        vector_size=args.vector_size,
+        window=args.window,
+        min_count=args.min_count,
+        workers=args.workers,
+        max_final_vocab=args.max_final_vocab or None,
+        epochs=args.epochs,
+        sentence_length=args.sentence_length,
+        preprocess=args.preprocess,
+        cache_dir=args.cache_dir
+    )
@@ -1,16 +1,20 @@
-import gensim.downloader as api
-import pandas as pd
-import numpy as np
-import nltk
-from nltk.corpus import stopwords
 import string
-from langdetect import detect, LangDetectException
-from better_profanity import profanity
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from vector_export import export_vectors
+# gensim, pandas, nltk, langdetect and better_profanity take seconds to import, so they
+# are imported in the functions that use them rather than when this module is loaded
 
 # --- Configuration ---
 NUM_WORDS = 1000
 OUTPUT_FILE = "top_1000_words_vectors.csv"
 MODEL_NAME = "glove-twitter-25" # A small, fast-loading model for demonstration
+VERDICT_CACHE_FILE = "word_filter_cache.json" # Saved language/NSFW verdicts, reused across runs
+FILTER_WORKERS = os.cpu_count() or 1 # Processes for the language/NSFW checks
+FILTER_CHUNK_SIZE = 500 # Words sent to a worker at a time
+# Bump when the filters change so cached verdicts are recomputed
+FILTER_VERSION = 1
 
 def is_ascii_only(word):
     """Check if word contains only ASCII characters."""
@@ -24,6 +28,7 @@ def is_english(word):
     # Skip if it's just punctuation or numbers
     if word.strip(string.ascii_letters) == word:
         return False
+    from langdetect import detect, LangDetectException
     try:
         return detect(word) == 'en'
     except (LangDetectException, ValueError):
@@ -32,10 +37,95 @@ def is_english(word):
 
 def is_nsfw(word):
     """Check if word contains NSFW/profane content."""
+    from better_profanity import profanity
     return profanity.contains_profanity(word)
 
+def cheap_filter(words, stop_words):
+    """Apply the inexpensive filters to all words at once and return the survivors, in order.
+
+    Drops stop words, non-ASCII words, words shorter than 2 characters and
+    words that neither start nor end with a letter (the same pre-checks
+    is_english makes before calling langdetect).
+    """
+    import pandas as pd
+    s = pd.Series(words, dtype=object)
+    keep = (
+        ~s.str.lower().isin(stop_words)
+        & s.map(is_ascii_only)
+        & (s.str.len() >= 2)
+        & (s.str.strip(string.ascii_letters) != s)
+    )
+    return s[keep].tolist()
+
+def _init_filter_worker():
+    """Prepare a worker process for the expensive checks."""
+    from better_profanity import profanity
+    from langdetect import DetectorFactory
+    profanity.load_censor_words()
+    # langdetect is randomized; seed it so cached verdicts are reproducible
+    DetectorFactory.seed = 0
+
+def expensive_filter(words):
+    """Return a keep/drop verdict for each word from language detection and the NSFW filter."""
+    return [is_english(word) and not is_nsfw(word) for word in words]
+
+def load_verdict_cache(path):
+    """Load saved {word: keep} verdicts, or an empty dict if missing or out of date."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != FILTER_VERSION:
+        return {}
+    return data['verdicts']
+
+def save_verdict_cache(path, verdicts):
+    """Save {word: keep} verdicts for the next run."""
+    with open(path, 'w') as f:
+        json.dump({'version': FILTER_VERSION, 'verdicts': verdicts}, f, separators=(',', ':'))
+
+def select_words(candidates, num_words, verdicts, workers=FILTER_WORKERS, chunk_size=FILTER_CHUNK_SIZE):
+    """
+    Pick the first num_words candidates that pass the expensive filters.
+
+    Candidates are checked in frequency order, one window of
+    workers * chunk_size words at a time. Words with a cached verdict are
+    not checked again; the others are fanned out to a process pool in
+    chunks, and their verdicts are added to verdicts. The pool is only
+    started once a word needs checking, so a fully cached run starts none.
+    """
+    selected = []
+    window_size = workers * chunk_size
+    pool = None
+    try:
+        for start in range(0, len(candidates), window_size):
+            window = candidates[start:start + window_size]
+            unknown = [word for word in window if word not in verdicts]
+            if unknown:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_filter_worker)
+                chunks = [unknown[i:i + chunk_size] for i in range(0, len(unknown), chunk_size)]
+                for chunk, results in zip(chunks, pool.map(expensive_filter, chunks)):
+                    verdicts.update(zip(chunk, results))
+
+            for word in window:
+                if verdicts[word]:
+                    selected.append(word)
+                    if len(selected) >= num_words:
+                        return selected
+            print(f"   Checked {start + len(window)} candidates "
+                  f"({len(unknown)} new), found {len(selected)} valid words so far...")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return selected
+
 def word_vec_to_csv():
     """Loads a Word2Vec model, extracts the top N words/vectors (excluding stop words), and saves to CSV."""
+    import gensim.downloader as api
+    import nltk
+    from nltk.corpus import stopwords
+    import pandas as pd
     
     print(f"1. Downloading and loading model: {MODEL_NAME}...")
     try:
@@ -55,63 +145,31 @@ def word_vec_to_csv():
     stop_words = set(stopwords.words('english'))
     print(f"   Loaded {len(stop_words)} stop words.")
     
-    # Initialize profanity filter
-    print("3. Initializing NSFW filter...")
-    profanity.load_censor_words()
-    
     # --- Data Extraction ---
     # Filter out stop words, non-ASCII, non-English, and NSFW words
-    # We need to iterate through more words to get NUM_WORDS filtered words
-    print(f"4. Extracting top {NUM_WORDS} words (filtering stop words, non-ASCII, non-English, and NSFW words)...")
-    word_list = []
+    # Cheap filters run over the whole vocabulary at once; the language and NSFW
+    # checks then run in a process pool, reusing verdicts cached by earlier runs
+    print(f"3. Extracting top {NUM_WORDS} words (filtering stop words, non-ASCII, non-English, and NSFW words)...")
     all_words = list(wv.key_to_index.keys())
-    filtered_count = 0
+    candidates = cheap_filter(all_words, stop_words)
+    print(f"   {len(candidates)} of {len(all_words)} words pass the stop word/ASCII filters.")
     
-    for word in all_words:
-        # Apply all filters
-        if (word.lower() not in stop_words and
-            is_ascii_only(word) and
-            is_english(word) and
-            not is_nsfw(word)):
-            word_list.append(word)
-            if len(word_list) >= NUM_WORDS:
-                break
-        else:
-            filtered_count += 1
-            # Print progress every 10000 filtered words
-            if filtered_count % 10000 == 0:
-                print(f"   Processed {filtered_count} words, found {len(word_list)} valid words so far...")
+    verdicts = load_verdict_cache(VERDICT_CACHE_FILE)
+    print(f"   Loaded {len(verdicts)} cached verdicts from {VERDICT_CACHE_FILE}.")
+    word_list = select_words(candidates, NUM_WORDS, verdicts)
+    save_verdict_cache(VERDICT_CACHE_FILE, verdicts)
     
-    print(f"   Filtered through {filtered_count + len(word_list)} words to find {len(word_list)} valid words.")
+    print(f"   Found {len(word_list)} valid words.")
     
-    # Initialize a list to hold the data rows
-    data_rows = []
-
-    print(f"5. Formatting data for {len(word_list)} words...")
-
-    for word in word_list:
-        # Get the vector (which is a numpy array)
-        vector = wv[word]
-        
-        # Create the row: [word, vector[0], vector[1], ..., vector[D-1]]
-        # We use np.insert to easily prepend the word string to the vector array
-        row = np.insert(vector.astype(str), 0, word)
-        data_rows.append(row)
-
     # --- CSV Creation ---
-    # Convert the list of rows into a pandas DataFrame
-    # 1. Create column names: ['word', 'dim_0', 'dim_1', ...]
-    num_dimensions = wv.vector_size
-    column_names = ['word'] + [f'dim_{i}' for i in range(num_dimensions)]
-    
-    df = pd.DataFrame(data_rows, columns=column_names)
-    
-    # Save the DataFrame to a CSV file
-    df.to_csv(OUTPUT_FILE, index=False, header=True)
+    # Take the selected rows straight from the vector matrix and write them in chunks
+    print(f"4. Writing {len(word_list)} words to {OUTPUT_FILE}...")
+    vectors = wv.vectors[[wv.key_to_index[word] for word in word_list]]
+    export_vectors(word_list, vectors, OUTPUT_FILE)
 
-    print(f"6. Successfully saved {len(df)} rows to {OUTPUT_FILE}")
+    print(f"5. Successfully saved {len(word_list)} rows to {OUTPUT_FILE}")
     print("\nFile Structure:")
-    print(df.head())
+    print(pd.read_csv(OUTPUT_FILE, nrows=5))
 
 # Run the function
 if __name__ == "__main__":